@@ -10,7 +10,9 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from src.core.config.config import Config
-from src.core.behave.scenario_data import ScenarioData
+from src.core.behave.payload_files import preload_feature_payloads
+from src.core.behave.scenario_data import DEFAULT_RESPONSE_HISTORY, ScenarioData
+from src.core.metrics.latency import LatencyRecorder
 from src.core.security.token_manager import TokenManager
 from hooks.resources.registry import ResourceRegistry
 from hooks.tag_router import handle_before_tag, handle_after_tag
@@ -21,12 +23,18 @@ def before_all(context: Any) -> None:
     context.config_obj = Config.load(getattr(context.config, "userdata", {}))
     context.token_manager = TokenManager()
     context.resources = ResourceRegistry()
+    context.latency_recorder = LatencyRecorder()
+    preload_feature_payloads(context)
 
 
 def before_scenario(context: Any, scenario: Any) -> None:
     # fresh per-scenario data (API only)
     context.shared_data = {}
-    context.http_data = ScenarioData(context)
+    context.http_data = ScenarioData(
+        context,
+        base=getattr(scenario.feature, "scenario_base", None),
+        max_responses=context.config_obj.get_int("scenario.response_history", DEFAULT_RESPONSE_HISTORY),
+    )
     context.resources.begin_scenario()
 
 
@@ -35,8 +43,8 @@ def after_scenario(context: Any, scenario: Any) -> None:
 
 
 def after_all(context: Any) -> None:
-    if getattr(context, "db_client", None):
-        context.db_client.close()
+    context.latency_recorder.publish()
+    context.resources.close_session()
 
 
 def before_tag(context: Any, tag: str) -> None:
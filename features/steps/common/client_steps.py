@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import json
-import re
-from pathlib import Path
 
 from behave import when
 
+from src.core.behave.payload_files import PAYLOAD_FILES
+from src.core.behave.templating import render_json_payload, resolve_step_reference, resolve_step_text
+
 
 def _get_data(context):
     return getattr(context, "http_data", None) or getattr(context, "data", None)
@@ -38,11 +39,7 @@ def _resolve_placeholders(data, mapping):
             except Exception:
                 resolved[key] = data.get_var("last_id")
         elif isinstance(value, str) and value.startswith("${") and value.endswith("}"):
-            inner = value[2:-1]
-            try:
-                resolved[key] = data.get_var(inner)
-            except Exception:
-                resolved[key] = data.get_entity(inner)
+            resolved[key] = resolve_step_reference(data, value[2:-1])
         else:
             resolved_text = _resolve_text_placeholders(data, str(value))
             resolved[key] = _maybe_parse_inline_json(resolved_text)
@@ -50,22 +47,7 @@ def _resolve_placeholders(data, mapping):
 
 
 def _resolve_text_placeholders(data, text: str) -> str:
-    pattern = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
-
-    def _replace(match):
-        key = match.group(1)
-        try:
-            return str(data.get_entity(key))
-        except KeyError:
-            return str(data.get_var(key))
-
-    if text.startswith("${") and text.endswith("}"):
-        key = text[2:-1]
-        try:
-            return str(data.get_var(key))
-        except Exception:
-            return str(data.get_entity(key))
-    return pattern.sub(_replace, text)
+    return resolve_step_text(data, text)
 
 
 def _maybe_parse_inline_json(value):
@@ -83,29 +65,19 @@ def _maybe_parse_inline_json(value):
 
 
 def _load_raw_json_payload(data, raw_text: str):
-    resolved = _resolve_text_placeholders(data, raw_text or "")
     try:
-        return json.loads(resolved)
-    except json.JSONDecodeError as exc:
+        return render_json_payload(data, raw_text or "")
+    except ValueError as exc:
         raise AssertionError(f"Invalid raw JSON payload: {exc}") from exc
 
 
 def _load_json_payload_from_file(data, file_path: str):
-    path = Path(file_path)
-    if not path.is_absolute():
-        project_root = Path(__file__).resolve().parents[3]
-        project_candidate = project_root / path
-        cwd_candidate = Path.cwd() / path
-        if project_candidate.exists():
-            path = project_candidate
-        elif cwd_candidate.exists():
-            path = cwd_candidate
-        else:
-            path = project_candidate
-    if not path.exists():
-        raise AssertionError(f"Payload file not found: {file_path}")
-    raw = path.read_text(encoding="utf-8")
-    return _load_raw_json_payload(data, raw)
+    try:
+        return PAYLOAD_FILES.get(file_path).render(data)
+    except FileNotFoundError:
+        raise AssertionError(f"Payload file not found: {file_path}") from None
+    except ValueError as exc:
+        raise AssertionError(f"Invalid JSON payload file {file_path}: {exc}") from exc
 
 
 def _call_client(context, client_name: str, method_name: str, *, body=None, params=None):
@@ -179,5 +151,3 @@ def step_call_client_with_body_from_file(context, method_name: str, client_name:
 def step_call_client_with_alias(context, method_name: str, client_name: str, response_alias: str) -> None:
     _call_client(context, client_name, method_name)
     _get_data(context).put_response(response_alias, context.last_response, overwrite=False)
-
-PYCODE
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from behave import given, then
+
+from src.core.db.db_client import DbClient, DbClientError
+from src.core.db.seeding import SeedLedger, load_seed_rows
+from src.core.db.snapshot import TableDiff, diff_table, snapshot_table
+from src.core.db.waits import validate_identifier
+
+
+def _get_data(context):
+    return getattr(context, "http_data", None) or getattr(context, "data", None)
+
+
+def _require_db_client(context) -> DbClient:
+    client = getattr(context, "db_client", None)
+    if client is None:
+        raise AssertionError("context.db_client is required for DB steps")
+    return client
+
+
+def _require_seed_ledger(context) -> SeedLedger:
+    ledger = getattr(context, "db_seed_ledger", None)
+    if ledger is None:
+        raise AssertionError("context.db_seed_ledger is required; enable the @db resource")
+    return ledger
+
+
+def _resolve_file(file_path: str) -> Path:
+    path = Path(file_path)
+    if path.is_absolute():
+        candidates = [path]
+    else:
+        project_root = Path(__file__).resolve().parents[3]
+        candidates = [project_root / path, Path.cwd() / path]
+    for candidate in candidates:
+        if candidate.exists():
+            return candidate
+    raise AssertionError(f"Seed file not found: {file_path}")
+
+
+def _table_to_dict(table):
+    if table is None:
+        return {}
+    data = {}
+    for row in table:
+        if row.headings:
+            key = str(row["field"]).strip()
+            value = str(row["value"]).strip()
+        else:
+            key = str(row[0]).strip()
+            value = str(row[1]).strip()
+        if key:
+            data[key] = value
+    return data
+
+
+def _wait_for_db_row(context, table: str, column: str, value: str, timeout: float, expected=None) -> None:
+    data = _get_data(context)
+    client = _require_db_client(context)
+    try:
+        query = f"SELECT * FROM {validate_identifier(table)} WHERE {validate_identifier(column)} = ?"
+    except ValueError as exc:
+        raise AssertionError(str(exc)) from exc
+    key = data.resolve_placeholders(value)
+    expected = {field: data.resolve_placeholders(val) for field, val in (expected or {}).items()}
+
+    def _matches(row) -> bool:
+        return all(field in row and str(row[field]) == val for field, val in expected.items())
+
+    try:
+        row = client.wait_for_row(query, params=[key], predicate=_matches if expected else None, timeout=timeout)
+    except DbClientError as exc:
+        raise AssertionError(f"DB row {table}.{column}={key!r} not found within {timeout}s: {exc}") from exc
+    data.common.setdefault("db", {})["row"] = row
+
+
+def _snapshot(context, table: str, key_column: str, where: str | None = None, params=()) -> None:
+    client = _require_db_client(context)
+    try:
+        snapshot = snapshot_table(client, table, key_column, where=where, params=params)
+    except (DbClientError, ValueError, KeyError) as exc:
+        raise AssertionError(f"Snapshot of {table} failed: {exc}") from exc
+    _get_data(context).common.setdefault("db", {}).setdefault("snapshots", {})[table] = snapshot
+
+
+def _diff_against_snapshot(context, table: str) -> TableDiff:
+    snapshots = _get_data(context).common.get("db", {}).get("snapshots", {})
+    if table not in snapshots:
+        raise AssertionError(f'No snapshot of DB table "{table}"; take one with "I snapshot DB table" first')
+    try:
+        diff = diff_table(_require_db_client(context), snapshots[table])
+    except DbClientError as exc:
+        raise AssertionError(f"Diff of {table} failed: {exc}") from exc
+    _get_data(context).common["db"].setdefault("diffs", {})[table] = diff
+    return diff
+
+
+def _assert_table_diff(diff: TableDiff, *, added=(), removed=(), changed=()) -> None:
+    problems = diff.unexpected(added=added, removed=removed, changed=changed)
+    if problems:
+        raise AssertionError(f"DB table {diff.table} differs unexpectedly: {'; '.join(problems)}\n{diff.summary()}")
+
+
+# registered before the plain variant, whose "{key_column}" would otherwise swallow the where clause
+@given('I snapshot DB table "{table}" keyed by "{key_column}" where "{column}" is "{value}"')
+def step_snapshot_db_table_slice(context, table: str, key_column: str, column: str, value: str) -> None:
+    try:
+        where = f"{validate_identifier(column)} = ?"
+    except ValueError as exc:
+        raise AssertionError(str(exc)) from exc
+    _snapshot(context, table, key_column, where=where, params=[_get_data(context).resolve_placeholders(value)])
+
+
+@given('I snapshot DB table "{table}" keyed by "{key_column}"')
+def step_snapshot_db_table(context, table: str, key_column: str) -> None:
+    _snapshot(context, table, key_column)
+
+
+@then('DB table "{table}" should be unchanged')
+def step_db_table_unchanged(context, table: str) -> None:
+    _assert_table_diff(_diff_against_snapshot(context, table))
+
+
+@then('DB table "{table}" should differ only by added rows "{keys}"')
+def step_db_table_differs_by_added(context, table: str, keys: str) -> None:
+    data = _get_data(context)
+    expected = [data.resolve_placeholders(key.strip()) for key in keys.split(",") if key.strip()]
+    _assert_table_diff(_diff_against_snapshot(context, table), added=expected)
+
+
+@then('table "{table}" should differ only by the created user')
+def step_table_differs_by_created_user(context, table: str) -> None:
+    data = _get_data(context)
+    try:
+        user_id = data.get_entity("user_id")
+    except KeyError:
+        raise AssertionError("Missing user_id in shared entities; create user first.") from None
+    _assert_table_diff(_diff_against_snapshot(context, table), added=[user_id])
+
+
+@then('within {timeout:g}s the DB row in "{table}" where "{column}" is "{value}" should exist')
+def step_wait_db_row(context, timeout: float, table: str, column: str, value: str) -> None:
+    _wait_for_db_row(context, table, column, value, timeout)
+
+
+@then('within {timeout:g}s the DB row in "{table}" where "{column}" is "{value}" should exist with:')
+def step_wait_db_row_with(context, timeout: float, table: str, column: str, value: str) -> None:
+    _wait_for_db_row(context, table, column, value, timeout, expected=_table_to_dict(context.table))
+
+
+@then('within {timeout:g}s the DB rows in "{table}" where "{column}" is one of "{values}" should exist')
+def step_wait_db_rows(context, timeout: float, table: str, column: str, values: str) -> None:
+    data = _get_data(context)
+    client = _require_db_client(context)
+    keys = [data.resolve_placeholders(v.strip()) for v in values.split(",") if v.strip()]
+    try:
+        rows = client.wait_for_rows(table, column, keys, timeout=timeout)
+    except (DbClientError, ValueError) as exc:
+        raise AssertionError(str(exc)) from exc
+    data.common.setdefault("db", {})["rows"] = rows
+
+
+@given('I seed DB table "{table}" from file "{file_path}" keyed by "{key_column}"')
+def step_seed_db_table_from_file(context, table: str, file_path: str, key_column: str) -> None:
+    client = _require_db_client(context)
+    ledger = _require_seed_ledger(context)
+    try:
+        count = ledger.seed(client, table, key_column, load_seed_rows(_resolve_file(file_path)))
+    except (DbClientError, ValueError) as exc:
+        raise AssertionError(f"Seeding {table} from {file_path} failed: {exc}") from exc
+    _get_data(context).common.setdefault("db", {}).setdefault("seeded", {})[table] = count
+
+
+@given('I seed DB table "{table}" keyed by "{key_column}" with rows:')
+def step_seed_db_table_with_rows(context, table: str, key_column: str) -> None:
+    data = _get_data(context)
+    client = _require_db_client(context)
+    ledger = _require_seed_ledger(context)
+    rows = (
+        {heading: data.resolve_placeholders(str(row[heading]).strip()) for heading in row.headings}
+        for row in context.table
+    )
+    try:
+        count = ledger.seed(client, table, key_column, rows)
+    except (DbClientError, ValueError) as exc:
+        raise AssertionError(f"Seeding {table} failed: {exc}") from exc
+    data.common.setdefault("db", {}).setdefault("seeded", {})[table] = count
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 import json
-import re
-from pathlib import Path
 
-from behave import given, when
+from behave import given, step, when
 
+from src.core.behave.payload_files import PAYLOAD_FILES
+from src.core.behave.templating import render_json_payload, resolve_step_reference, resolve_step_text
 from src.core.http.http_client import HttpClient
 
 
@@ -46,11 +46,7 @@ def _resolve_placeholders(data, mapping):
     resolved = {}
     for key, value in mapping.items():
         if isinstance(value, str) and value.startswith("${") and value.endswith("}"):
-            inner = value[2:-1]
-            try:
-                resolved[key] = data.get_var(inner)
-            except Exception:
-                resolved[key] = data.get_entity(inner)
+            resolved[key] = resolve_step_reference(data, value[2:-1])
         else:
             resolved_text = _resolve_text_placeholders(data, str(value))
             resolved[key] = _maybe_parse_inline_json(resolved_text)
@@ -65,26 +61,7 @@ def _render_path(data, path: str) -> str:
 
 
 def _resolve_text_placeholders(data, text: str) -> str:
-    if not isinstance(text, str):
-        return text
-
-    if text.startswith("${") and text.endswith("}"):
-        key = text[2:-1]
-        try:
-            return str(data.get_var(key))
-        except Exception:
-            return str(data.get_entity(key))
-
-    pattern = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
-
-    def _replace(match):
-        key = match.group(1)
-        try:
-            return str(data.get_entity(key))
-        except KeyError:
-            return str(data.get_var(key))
-
-    return pattern.sub(_replace, text)
+    return resolve_step_text(data, text)
 
 
 def _maybe_parse_inline_json(value):
@@ -102,29 +79,19 @@ def _maybe_parse_inline_json(value):
 
 
 def _load_raw_json_payload(data, raw_text: str):
-    resolved = _resolve_text_placeholders(data, raw_text or "")
     try:
-        return json.loads(resolved)
-    except json.JSONDecodeError as exc:
+        return render_json_payload(data, raw_text or "")
+    except ValueError as exc:
         raise AssertionError(f"Invalid raw JSON payload: {exc}") from exc
 
 
 def _load_json_payload_from_file(data, file_path: str):
-    path = Path(file_path)
-    if not path.is_absolute():
-        project_root = Path(__file__).resolve().parents[3]
-        project_candidate = project_root / path
-        cwd_candidate = Path.cwd() / path
-        if project_candidate.exists():
-            path = project_candidate
-        elif cwd_candidate.exists():
-            path = cwd_candidate
-        else:
-            path = project_candidate
-    if not path.exists():
-        raise AssertionError(f"Payload file not found: {file_path}")
-    raw = path.read_text(encoding="utf-8")
-    return _load_raw_json_payload(data, raw)
+    try:
+        return PAYLOAD_FILES.get(file_path).render(data)
+    except FileNotFoundError:
+        raise AssertionError(f"Payload file not found: {file_path}") from None
+    except ValueError as exc:
+        raise AssertionError(f"Invalid JSON payload file {file_path}: {exc}") from exc
 
 
 @given("I clear request context")
@@ -135,6 +102,12 @@ def step_clear_request_context(context) -> None:
     api_state.pop("service", None)
 
 
+@step("later scenarios of this feature start from this scenario's state")
+def step_share_scenario_state(context) -> None:
+    # read by before_scenario, which layers every later scenario of the feature over it
+    context.feature.scenario_base = _get_data(context).freeze()
+
+
 @given('I use service "{service}"')
 def step_use_service(context, service: str) -> None:
     _get_data(context).api_state["service"] = service
@@ -169,11 +142,6 @@ def step_set_json_field(context, field: str, value: str) -> None:
     req["json"][field] = data.resolve_placeholders(value)
 
 
-@when('I send "{method}" request to "{path}"')
-def step_send_request(context, method: str, path: str) -> None:
-    _send_request(context, method, path)
-
-
 @when('I send "{method}" request to "{path}" with params:')
 def step_send_request_with_params(context, method: str, path: str) -> None:
     params = _resolve_placeholders(_get_data(context), _table_to_dict(context.table))
@@ -200,6 +168,12 @@ def step_send_request_with_body_from_file(context, method: str, path: str, file_
     _send_request(context, method, path, body=body)
 
 
+# registered after the variants above, whose text it would otherwise swallow
+@when('I send "{method}" request to "{path}"')
+def step_send_request(context, method: str, path: str) -> None:
+    _send_request(context, method, path)
+
+
 @when('I send "{method}" request to "{path}" as "{response_alias}" response')
 def step_send_request_with_alias(context, method: str, path: str, response_alias: str) -> None:
     _send_request(context, method, path, alias=response_alias)
@@ -233,6 +207,8 @@ def _send_request(context, method: str, path: str, params=None, body=None, alias
     data.put_response("last", response, overwrite=True)
     if alias != "last":
         data.put_response(alias, response, overwrite=False)
+    if getattr(response, "correlation_id", None):
+        data.put_var("correlation_id", response.correlation_id, overwrite=True)
     context.last_response = response
 
 
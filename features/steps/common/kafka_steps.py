@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import json
 import re
+from collections.abc import Mapping
 
-from behave import given, when
+from behave import given, then, when
 
-from src.core.messaging.kafka_client import KafkaClient
+from src.core.messaging.kafka_client import KafkaClient, KafkaExpectation, KafkaMessage
+
+_EXPECTATION_COLUMNS = ("name", "after", "forbidden")
 
 
 def _get_data(context):
@@ -64,4 +68,64 @@ def step_read_kafka_messages_with_shift(
     data.common.setdefault("kafka", {})["messages"] = messages
     data.common.setdefault("kafka", {})["message"] = messages[0] if messages else None
 
-PYCODE
+
+@then('Kafka topic "{topic}" should receive events within {timeout:g}s:')
+def step_wait_kafka_events(context, topic: str, timeout: float) -> None:
+    data = _get_data(context)
+    client = _require_kafka_client(context)
+    expectations = [_expectation_from_row(data, topic, row) for row in context.table]
+    messages = client.wait_all(expectations, timeout=timeout)
+    kafka_state = data.common.setdefault("kafka", {})
+    kafka_state.setdefault("events", {}).update(messages)
+
+
+@then('Kafka topic "{topic}" should receive the event for the last request within {timeout:g}s')
+def step_wait_kafka_correlated_event(context, topic: str, timeout: float) -> None:
+    data = _get_data(context)
+    client = _require_kafka_client(context)
+    response = data.get_response("last")
+    correlation_id = getattr(response, "correlation_id", None)
+    if not correlation_id:
+        raise AssertionError("Last response has no correlation id; configure http.correlation_header")
+    message = client.wait_for_correlation(topic=topic, correlation_id=correlation_id, timeout=timeout)
+    data.common.setdefault("kafka", {})["message"] = message
+
+
+def _expectation_from_row(data, topic: str, row) -> KafkaExpectation:
+    name = str(row["name"]).strip()
+    if not name:
+        raise AssertionError("Kafka expectation row requires a non-empty 'name'")
+    after = tuple(dep.strip() for dep in _cell(row, "after").split(",") if dep.strip())
+    forbidden = _cell(row, "forbidden").lower() in {"1", "true", "yes", "y"}
+    fields = {
+        heading: data.resolve_placeholders(str(row[heading]).strip())
+        for heading in row.headings
+        if heading not in _EXPECTATION_COLUMNS and str(row[heading]).strip()
+    }
+    return KafkaExpectation(
+        name=name,
+        topic=topic,
+        predicate=lambda msg: _message_has_fields(msg, fields),
+        after=after,
+        forbidden=forbidden,
+    )
+
+
+def _cell(row, heading: str) -> str:
+    return str(row[heading]).strip() if heading in row.headings else ""
+
+
+def _message_has_fields(message: KafkaMessage, fields: Mapping[str, str]) -> bool:
+    try:
+        payload = json.loads(message.value) if message.value is not None else None
+    except (TypeError, ValueError):
+        return False
+    for path, expected in fields.items():
+        current = payload
+        for part in path.split("."):
+            if not isinstance(current, Mapping) or part not in current:
+                return False
+            current = current[part]
+        if str(current) != expected:
+            return False
+    return True
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import time
+
+from behave import then
+
+from src.core.db.db_client import DbClientError
+from src.core.db.waits import validate_identifier
+from src.core.metrics.latency import LatencyRecorder
+
+
+def _get_data(context):
+    return getattr(context, "http_data", None) or getattr(context, "data", None)
+
+
+def _require_recorder(context) -> LatencyRecorder:
+    recorder = getattr(context, "latency_recorder", None)
+    if recorder is None:
+        raise AssertionError("context.latency_recorder is required for latency steps")
+    return recorder
+
+
+@then(
+    'the last response should propagate to Kafka topic "{topic}" and DB table "{table}" '
+    'where "{column}" is "{value}" within {timeout:g}s'
+)
+def step_measure_propagation(context, topic: str, table: str, column: str, value: str, timeout: float) -> None:
+    data = _get_data(context)
+    kafka_client = getattr(context, "kafka_client", None)
+    db_client = getattr(context, "db_client", None)
+    if kafka_client is None or db_client is None:
+        raise AssertionError("context.kafka_client and context.db_client are required for propagation steps")
+    response = data.get_response("last")
+    correlation_id = getattr(response, "correlation_id", None)
+    if not correlation_id:
+        raise AssertionError("Last response has no correlation id; configure http.correlation_header")
+
+    trace = _require_recorder(context).start(f"{topic}->{table}")
+    trace.mark("request_sent", getattr(response, "sent_at", None))
+    trace.mark("response_received", getattr(response, "received_at", None))
+    deadline = time.time() + timeout
+
+    message = kafka_client.wait_for_correlation(topic=topic, correlation_id=correlation_id, timeout=timeout)
+    trace.mark("event_consumed")
+    if message.timestamp_ms:
+        trace.mark("event_broker", message.timestamp_ms / 1000.0)
+
+    key = data.resolve_placeholders(value)
+    query = f"SELECT * FROM {validate_identifier(table)} WHERE {validate_identifier(column)} = ?"
+    try:
+        db_client.wait_for_row(query, params=[key], timeout=max(deadline - time.time(), 0.0))
+    except DbClientError as exc:
+        raise AssertionError(f"Row {column}={key!r} not visible in {table} within {timeout}s") from exc
+    trace.mark("db_visible")
+    data.common.setdefault("latency", {})["last"] = trace.hops()
+
+
+@then('propagation latency "{stat}" of "{hop}" should be at most {limit_ms:g}ms')
+def step_propagation_latency_limit(context, stat: str, hop: str, limit_ms: float) -> None:
+    summary = _require_recorder(context).summary()
+    if hop not in summary:
+        raise AssertionError(f"No propagation samples for hop '{hop}'. Available: {sorted(summary)}")
+    attr = f"{stat}_ms"
+    if not hasattr(summary[hop], attr):
+        raise AssertionError(f"Unknown latency statistic '{stat}'; use min, mean, p50, p95, p99 or max")
+    actual = getattr(summary[hop], attr)
+    assert actual <= limit_ms, f"Expected {stat} latency of {hop} <= {limit_ms}ms, got {actual:.1f}ms"
@@ -2,10 +2,16 @@ from __future__ import annotations
 
 from collections.abc import Mapping, Sequence
 import json
+import math
 import re
+from pathlib import Path
 
 from behave import given, then
 
+from src.core.http import array_checks
+from src.core.http.json_path import JsonPathError, compile_path, resolve_many
+from src.core.http.snapshots import DEFAULT_SNAPSHOT_DIR, SnapshotStore
+
 
 def _get_data(context):
     return getattr(context, "http_data", None) or getattr(context, "data", None)
@@ -30,10 +36,18 @@ def _body_preview(response) -> str:
     return text[:1000] if text else ""
 
 
-def _get_json_body(response):
+def _get_json_body(context, response, alias: str | None = None):
+    """``response.json``, or its ``text`` parsed once per stored response and cached on the scenario data."""
     body = getattr(response, "json", None)
     if body is not None:
         return body
+    data = _get_data(context)
+    if data is None or not hasattr(data, "parsed_body"):
+        return _parse_json_text(response)
+    return data.parsed_body(alias or "last", response, _parse_json_text)
+
+
+def _parse_json_text(response):
     text = getattr(response, "text", "")
     if not text:
         return None
@@ -44,27 +58,151 @@ def _get_json_body(response):
 
 
 def _get_field(body, path: str):
-    current = body
-    for part in path.split("."):
-        tokens = list(re.finditer(r"([^\[\]]+)|(\[(\d+)\])", part))
-        if not tokens:
-            return None, False
-        for token in tokens:
-            key = token.group(1)
-            if key is not None:
-                if not isinstance(current, Mapping) or key not in current:
-                    return None, False
-                current = current[key]
-                continue
-            index = token.group(3)
-            if index is not None:
-                if not isinstance(current, Sequence) or isinstance(current, (str, bytes, Mapping)):
-                    return None, False
-                idx = int(index)
-                if idx < 0 or idx >= len(current):
-                    return None, False
-                current = current[idx]
-    return current, True
+    try:
+        return compile_path(path).resolve(body)
+    except JsonPathError as exc:
+        raise AssertionError(str(exc)) from None
+
+
+_JSON_TYPES = {
+    "object": Mapping,
+    "array": list,
+    "string": str,
+    "boolean": bool,
+    "null": type(None),
+}
+
+
+def _expected_json(expected: str):
+    try:
+        return json.loads(expected)
+    except ValueError:
+        return expected
+
+
+def _equals(actual, expected: str) -> bool:
+    if isinstance(actual, str):
+        return actual == expected
+    return actual == _expected_json(expected) or str(actual) == expected
+
+
+def _number(value):
+    if isinstance(value, bool):
+        raise TypeError("booleans are not numbers")
+    return float(value)
+
+
+def _is_type(actual, expected: str) -> bool:
+    if expected == "number":
+        return isinstance(actual, (int, float)) and not isinstance(actual, bool)
+    if expected not in _JSON_TYPES:
+        raise ValueError(f"unknown JSON type '{expected}'")
+    return isinstance(actual, _JSON_TYPES[expected])
+
+
+def _contains(actual, expected: str) -> bool:
+    if isinstance(actual, str):
+        return expected in actual
+    if isinstance(actual, Mapping):
+        return expected in actual
+    return any(_equals(item, expected) for item in actual)
+
+
+# operator -> check(actual, expected); "exists"/"not exists" are handled before a value is needed
+_FIELD_OPERATORS = {
+    "==": _equals,
+    "!=": lambda actual, expected: not _equals(actual, expected),
+    ">": lambda actual, expected: _number(actual) > float(expected),
+    ">=": lambda actual, expected: _number(actual) >= float(expected),
+    "<": lambda actual, expected: _number(actual) < float(expected),
+    "<=": lambda actual, expected: _number(actual) <= float(expected),
+    "contains": _contains,
+    "in": lambda actual, expected: any(_equals(actual, option.strip()) for option in expected.split(",")),
+    "matches": lambda actual, expected: re.search(expected, str(actual)) is not None,
+    "size": lambda actual, expected: len(actual) == int(expected),
+    "type": _is_type,
+}
+_FIELD_OPERATOR_ALIASES = {"equals": "==", "is": "==", "=": "==", "not": "!=", "length": "size"}
+
+
+def _check_field(operator: str, actual, found: bool, expected: str) -> str | None:
+    """Mismatch description, or None when the row holds."""
+    if operator == "exists":
+        return None if found else "missing"
+    if operator == "not exists":
+        return f"present with value {actual!r}" if found else None
+    if not found:
+        return "missing"
+    check = _FIELD_OPERATORS.get(_FIELD_OPERATOR_ALIASES.get(operator, operator))
+    if check is None:
+        return f"unknown operator '{operator}'"
+    try:
+        return None if check(actual, expected) else f"got {actual!r}"
+    except (TypeError, ValueError, re.error) as exc:
+        return f"cannot apply to {actual!r}: {exc}"
+
+
+def _response_array(context, path: str, *, allow_empty: bool = False) -> list:
+    """All values matched by ``path``; a definite path must point at an array.
+
+    A wildcard/filter path that matches nothing fails (a mistyped path would otherwise pass
+    every check vacuously) unless ``allow_empty`` is set.
+    """
+    response = _get_response(context)
+    body = _get_json_body(context, response)
+    if body is None:
+        raise AssertionError(f"Response is not JSON. Body={_body_preview(response)!r}")
+    value, exists = _get_field(body, path)
+    if not exists and allow_empty and not compile_path(path).definite:
+        return []
+    assert exists, f"Missing field '{path}' in response"
+    if not isinstance(value, list):
+        raise AssertionError(f"Response field '{path}' is not an array: {value!r}")
+    return value
+
+
+def _compare_number(actual: float, comparison: str, expected: float) -> bool:
+    if comparison in ("==", "!="):
+        close = math.isclose(actual, expected, rel_tol=1e-9, abs_tol=1e-9)
+        return close if comparison == "==" else not close
+    return _FIELD_OPERATORS[comparison](actual, str(expected))
+
+
+_SNAPSHOT_STORES: dict[tuple[str, bool], SnapshotStore] = {}
+
+
+def _snapshot_store(context) -> SnapshotStore:
+    config = getattr(context, "config_obj", None)
+    directory = str(config.get("snapshots.dir") or DEFAULT_SNAPSHOT_DIR) if config else str(DEFAULT_SNAPSHOT_DIR)
+    update = config.get_bool("snapshots.update", False) if config else False
+    key = (directory, update)
+    store = _SNAPSHOT_STORES.get(key)
+    if store is None:
+        store = _SNAPSHOT_STORES.setdefault(key, SnapshotStore(Path(directory), update=update))
+    return store
+
+
+def _split_paths(value) -> list[str]:
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(",") if item.strip()]
+    return [str(item).strip() for item in value or () if str(item).strip()]
+
+
+def _assert_snapshot(context, name: str, extra_volatile: list[str]) -> None:
+    response = _get_response(context)
+    body = _get_json_body(context, response)
+    if body is None:
+        body = getattr(response, "text", "")
+    config = getattr(context, "config_obj", None)
+    volatile = _split_paths(config.get("snapshots.volatile_paths") if config else None) + extra_volatile
+    try:
+        result = _snapshot_store(context).check(name, body, volatile)
+    except (JsonPathError, ValueError) as exc:
+        raise AssertionError(f"Snapshot '{name}': {exc}") from None
+    assert result.ok, (
+        f"Response does not match snapshot '{name}' ({result.path}); set snapshots.update to accept it:\n"
+        + "\n".join(f"  {difference}" for difference in result.differences)
+    )
 
 
 def _use_response_alias(context, alias: str) -> None:
@@ -114,21 +252,21 @@ def step_response_header_equals(context, name: str, value: str) -> None:
 @then("response should be a JSON object")
 def step_response_is_object(context) -> None:
     response = _get_response(context)
-    body = _get_json_body(response)
+    body = _get_json_body(context, response)
     assert isinstance(body, Mapping), "Response JSON is not an object"
 
 
 @then("response should be a JSON array")
 def step_response_is_array(context) -> None:
     response = _get_response(context)
-    body = _get_json_body(response)
+    body = _get_json_body(context, response)
     assert isinstance(body, Sequence) and not isinstance(body, (str, bytes, Mapping)), "Response JSON is not an array"
 
 
 @then('response should contain field "{field_name}"')
 def step_response_contains_field(context, field_name: str) -> None:
     response = _get_response(context)
-    body = _get_json_body(response)
+    body = _get_json_body(context, response)
     if not isinstance(body, Mapping):
         raise AssertionError("Response JSON is not an object")
     _, exists = _get_field(body, field_name)
@@ -138,7 +276,7 @@ def step_response_contains_field(context, field_name: str) -> None:
 @then('response field "{field_name}" should be "{expected_value}"')
 def step_response_field_equals(context, field_name: str, expected_value: str) -> None:
     response = _get_response(context)
-    body = _get_json_body(response)
+    body = _get_json_body(context, response)
     if not isinstance(body, Mapping):
         raise AssertionError("Response JSON is not an object")
     value, exists = _get_field(body, field_name)
@@ -160,8 +298,8 @@ def step_response_fields_equal(
 ) -> None:
     left = _get_response(context, left_response)
     right = _get_response(context, right_response)
-    left_body = _get_json_body(left)
-    right_body = _get_json_body(right)
+    left_body = _get_json_body(context, left, left_response)
+    right_body = _get_json_body(context, right, right_response)
     if not isinstance(left_body, Mapping):
         raise AssertionError(f"Response '{left_response}' JSON is not an object")
     if not isinstance(right_body, Mapping):
@@ -176,10 +314,42 @@ def step_response_fields_equal(
     )
 
 
+@then("response should have fields:")
+def step_response_has_fields(context) -> None:
+    if context.table is None:
+        raise AssertionError("Step requires a table with path/operator/expected columns")
+    headings = set(context.table.headings)
+    if "path" not in headings:
+        raise AssertionError("Fields table needs a 'path' column (optional 'operator', 'expected')")
+    response = _get_response(context)
+    body = _get_json_body(context, response)
+    if body is None:
+        raise AssertionError(f"Response is not JSON. Body={_body_preview(response)!r}")
+    data = _get_data(context)
+    rows = [
+        (
+            row["path"].strip(),
+            (row["operator"].strip() if "operator" in headings else "") or "==",
+            data.resolve_placeholders(row["expected"]) if "expected" in headings else "",
+        )
+        for row in context.table
+    ]
+    try:
+        resolved = resolve_many(body, [path for path, _, _ in rows])
+    except JsonPathError as exc:
+        raise AssertionError(str(exc)) from None
+    failures = []
+    for (path, operator, expected), (actual, found) in zip(rows, resolved):
+        problem = _check_field(operator, actual, found, expected)
+        if problem is not None:
+            failures.append(f"  {path} {operator} {expected!r}: {problem}")
+    assert not failures, f"{len(failures)} of {len(rows)} field checks failed:\n" + "\n".join(failures)
+
+
 @then('I store response field "{field_name}" as "{var_name}"')
 def step_store_response_field(context, field_name: str, var_name: str) -> None:
     response = _get_response(context)
-    body = _get_json_body(response)
+    body = _get_json_body(context, response)
     if not isinstance(body, Mapping):
         raise AssertionError("Response JSON is not an object")
     value, exists = _get_field(body, field_name)
@@ -192,7 +362,7 @@ def step_store_response_field(context, field_name: str, var_name: str) -> None:
 @then('I save response "{response_alias}" field "{field_path}" as "{entity_alias}"')
 def step_save_response_field_as_entity(context, response_alias: str, field_path: str, entity_alias: str) -> None:
     response = _get_response(context, response_alias)
-    body = _get_json_body(response)
+    body = _get_json_body(context, response, response_alias)
     if not isinstance(body, Mapping):
         raise AssertionError("Response JSON is not an object")
     value, exists = _get_field(body, field_path)
@@ -200,12 +370,92 @@ def step_save_response_field_as_entity(context, response_alias: str, field_path:
     _get_data(context).put_entity(entity_alias, value, overwrite=True)
 
 
+@then('all response values "{path}" should be in "{values}"')
+def step_response_values_in(context, path: str, values: str) -> None:
+    items = _response_array(context, path)
+    allowed = [option.strip() for option in _get_data(context).resolve_placeholders(values).split(",")]
+    bad = array_checks.outside(items, allowed)
+    assert not bad, (
+        f"{len(bad)} of {len(items)} values of '{path}' are not in {allowed}: "
+        + ", ".join(f"[{index}]={value!r}" for index, value in bad[:20])
+    )
+
+
+@then('response values "{path}" should be unique')
+def step_response_values_unique(context, path: str) -> None:
+    items = _response_array(context, path)
+    repeated = array_checks.duplicates(items)
+    assert not repeated, f"{len(repeated)} duplicated values in '{path}': {repeated[:20]!r}"
+
+
+@then('response {aggregate:w} of "{path}" should be {comparison} "{expected}"')
+def step_response_aggregate_compare(context, aggregate: str, path: str, comparison: str, expected: str) -> None:
+    if comparison not in ("==", "!=", ">", ">=", "<", "<="):
+        raise AssertionError(f"Unsupported comparison '{comparison}'")
+    # "count of <filter> should be 0" is a meaningful check, so only count accepts an empty match
+    items = _response_array(context, path, allow_empty=aggregate == "count")
+    try:
+        actual = array_checks.aggregate(items, aggregate)
+    except (TypeError, ValueError) as exc:
+        raise AssertionError(f"Cannot compute {aggregate} of '{path}': {exc}") from None
+    target = float(_get_data(context).resolve_placeholders(expected))
+    assert _compare_number(actual, comparison, target), (
+        f"Expected {aggregate} of '{path}' {comparison} {target}, got {actual}"
+    )
+
+
+@then('response {aggregate:w} of "{path}" should be "{expected}"')
+def step_response_aggregate_equals(context, aggregate: str, path: str, expected: str) -> None:
+    step_response_aggregate_compare(context, aggregate, path, "==", expected)
+
+
+def _assert_sorted(context, path: str, field: str, descending: bool) -> None:
+    items = _response_array(context, path)
+    try:
+        key = compile_path(field)
+    except JsonPathError as exc:
+        raise AssertionError(str(exc)) from None
+    values = []
+    for position, item in enumerate(items):
+        value, exists = key.resolve(item)
+        assert exists, f"Element {position} of '{path}' has no field '{field}'"
+        values.append(value)
+    try:
+        position = array_checks.first_unsorted(values, descending=descending)
+    except TypeError as exc:
+        raise AssertionError(f"Values of '{field}' in '{path}' are not comparable: {exc}") from None
+    order = "descending" if descending else "ascending"
+    assert position is None, (
+        f"'{path}' is not sorted by '{field}' ({order}): "
+        f"[{position - 1}]={values[position - 1]!r} then [{position}]={values[position]!r}"
+    )
+
+
+@then('response array "{path}" should be sorted by "{field}"')
+def step_response_array_sorted(context, path: str, field: str) -> None:
+    _assert_sorted(context, path, field, descending=False)
+
+
+@then('response array "{path}" should be sorted by "{field}" descending')
+def step_response_array_sorted_descending(context, path: str, field: str) -> None:
+    _assert_sorted(context, path, field, descending=True)
+
+
+# registered before the plain variant, whose "{name}" would otherwise swallow the ignoring clause
+@then('response should match snapshot "{name}" ignoring "{paths}"')
+def step_response_matches_snapshot_ignoring(context, name: str, paths: str) -> None:
+    _assert_snapshot(context, name, _split_paths(paths))
+
+
+@then('response should match snapshot "{name}"')
+def step_response_matches_snapshot(context, name: str) -> None:
+    _assert_snapshot(context, name, [])
+
+
 @then("response array size should be {size:d}")
 def step_response_array_size(context, size: int) -> None:
     response = _get_response(context)
-    body = _get_json_body(response)
+    body = _get_json_body(context, response)
     if not isinstance(body, Sequence) or isinstance(body, (str, bytes, Mapping)):
         raise AssertionError("Response JSON is not an array")
     assert len(body) == size, f"Expected array size {size}, got {len(body)}"
-
-PYCODE
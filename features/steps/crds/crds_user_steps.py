@@ -89,6 +89,17 @@ def step_create_crds_user_as_response(context, response_name: str) -> None:
     _cache_user_id(data, response)
 
 
+@when("I create a CRDS user and verify propagation")
+def step_create_crds_user_and_verify(context) -> None:
+    payload = CreateUserRequest.default()
+    system = context.systems["crds_user"]
+    data = _get_data(context)
+    result = system.create_user_and_verify(payload)
+    _store_response(context, result["response"])
+    _cache_user_id(data, result["response"])
+    data.common.setdefault("latency", {})["last"] = result["latency"].hops()
+
+
 @when("I query the CRDS user")
 def step_query_crds_user(context) -> None:
     data = _get_data(context)
@@ -135,5 +146,3 @@ def _require_user_id(data) -> str:
     if not user_id:
         raise AssertionError("Missing user_id in shared entities; create user first.")
     return str(user_id)
-
-PYCODE
@@ -57,17 +57,12 @@ class HttpClientFactory:
             token_manager=self._token_manager,
             timeout=self._timeout,
             validate_schema=self._validate_schema,
+            correlation_header=self._config.get(f"{key}.http.correlation_header")
+            or self._config.get("http.correlation_header"),
         )
         self._clients[key] = client
         return client
 
-def _bool_from_config(config: Config, key: str, default: bool = False) -> bool:
-    raw = config.get(key, default)
-    if isinstance(raw, str):
-        return raw.strip().lower() in {"1", "true", "yes", "y", "on"}
-    return bool(raw)
-
-
 def ensure_api(context) -> ApiRuntime:
     registry: ResourceRegistry = context.resources
     if registry.has("api"):
@@ -83,7 +78,7 @@ def ensure_api(context) -> ApiRuntime:
     ensure_auth(context)
 
     config: Config = context.config_obj
-    validate_schema = _bool_from_config(config, "validate_schema", False)
+    validate_schema = config.get_bool("validate_schema", False)
     http_factory = HttpClientFactory(config, context.token_manager, validate_schema=validate_schema, timeout=10.0)
 
     clients: dict[str, Any] = {}
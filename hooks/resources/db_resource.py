@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from hooks.resources.registry import ResourceRegistry
+from src.core.db.instrumentation import QueryStats
+from src.core.db.seeding import SeedLedger
 
 logger = logging.getLogger(__name__)
 
@@ -16,32 +18,78 @@ except Exception:  # noqa: BLE001
 @dataclass
 class DbRuntime:
     client: any
+    ledger: SeedLedger = field(default_factory=SeedLedger)
+    isolated: bool = False
+
+    def begin_isolation(self) -> None:
+        if not self.isolated:
+            self.client.begin_isolation()
+            self.isolated = True
 
     def close(self) -> None:
-        if self.client and hasattr(self.client, "close"):
-            self.client.close()
+        # the pooled client is session-scoped; ResourceRegistry.close_session() closes it in after_all
+        if self.isolated:
+            # seeded rows disappear with the rollback, no per-key deletes needed
+            self.ledger.clear()
+            self.client.end_isolation()
+            self.isolated = False
+            return
+        deleted = self.ledger.cleanup(self.client)
+        if deleted:
+            logger.info("Deleted %s seeded DB rows", deleted)
 
 
-def ensure_db(context) -> DbRuntime:
+def ensure_db(context, *, isolated: bool = False) -> DbRuntime:
     registry: ResourceRegistry = context.resources
     if registry.has("db"):
         runtime: DbRuntime = registry.get("db")
         registry.mark_enabled("db")
+        if isolated:
+            runtime.begin_isolation()
         context.db_client = runtime.client
+        context.db_seed_ledger = runtime.ledger
         return runtime
 
     if DbClient is None:
         raise RuntimeError("DbClient implementation not available; cannot enable @db")
 
-    conn_str = context.config_obj.get("db.connection_string") or context.config_obj.get("crds.db.connection_string")
-    if not conn_str:
-        raise ValueError("Missing DB connection string (db.connection_string or crds.db.connection_string)")
-
-    client = DbClient(conn_str, timeout=10)
+    client = registry.get_session("db_client")
+    if client is None:
+        client = _create_client(context.config_obj)
+        registry.set_session("db_client", client)
     runtime = DbRuntime(client=client)
+    if isolated:
+        runtime.begin_isolation()
     registry.set("db", runtime)
     registry.mark_enabled("db")
     context.db_client = client
+    context.db_seed_ledger = runtime.ledger
     return runtime
 
-__all__ = ["ensure_db", "DbRuntime"]
+def ensure_db_isolated(context) -> DbRuntime:
+    """@db_isolated: run the scenario inside a transaction that is rolled back in after_scenario."""
+    return ensure_db(context, isolated=True)
+
+def _create_client(config) -> DbClient:
+    conn_str = config.get("db.connection_string") or config.get("crds.db.connection_string")
+    if not conn_str:
+        raise ValueError("Missing DB connection string (db.connection_string or crds.db.connection_string)")
+    # an explicitly empty db.slow_query_ms disables the slow-query log
+    slow_query_disabled = config.get("db.slow_query_ms") == ""
+    query_stats = QueryStats(
+        slow_threshold_ms=None if slow_query_disabled else config.get_float("db.slow_query_ms", 500.0),
+        top_n=config.get_int("db.stats_top_n", 10),
+    )
+    return DbClient(
+        conn_str,
+        timeout=10,
+        pool_min_size=config.get_int("db.pool.min_size", 1),
+        pool_max_size=config.get_int("db.pool.max_size", 1),
+        pool_max_lifetime=config.get_duration("db.pool.max_lifetime", 1800.0),
+        pool_idle_timeout=config.get_duration("db.pool.idle_timeout", 300.0),
+        pool_checkout_timeout=config.get_duration("db.pool.checkout_timeout", 30.0),
+        query_stats=query_stats,
+        backend=config.get("db.backend") or None,
+    )
+
+__all__ = ["ensure_db", "ensure_db_isolated", "DbRuntime"]
@@ -33,7 +33,11 @@ def ensure_kafka(context) -> KafkaRuntime:
     if KafkaClient is None:
         raise RuntimeError("KafkaClient implementation not available; cannot enable @kafka")
 
-    bootstrap = context.config_obj.get("kafka.bootstrap_servers") or context.config_obj.get("crds.kafka.bootstrap_servers")
+    config = context.config_obj
+    backend = str(config.get("kafka.backend") or "confluent").strip().lower()
+    bootstrap = config.get("kafka.bootstrap_servers") or config.get("crds.kafka.bootstrap_servers")
+    if not bootstrap and backend == "memory":
+        bootstrap = "memory"
     if not bootstrap:
         raise ValueError("Missing kafka.bootstrap_servers or crds.kafka.bootstrap_servers for @kafka")
 
@@ -41,6 +45,10 @@ def ensure_kafka(context) -> KafkaRuntime:
         bootstrap_servers=bootstrap,
         scenario_id=getattr(context, "scenario_id", None) or "scenario",
         group_prefix="e2e",
+        correlation_header=config.get("kafka.correlation_header"),
+        backend=backend,
+        memory_partitions=config.get_int("kafka.memory.partitions", 1),
+        segment_path=config.get("kafka.memory.segment_path"),
     )
     runtime = KafkaRuntime(client=client)
     registry.set("kafka", runtime)
@@ -12,6 +12,7 @@ class ResourceRegistry:
     def __init__(self) -> None:
         self._resources: dict[str, Any] = {}
         self._enabled_in_scenario: set[str] = set()
+        self._session: dict[str, Any] = {}
 
     # basic ops
     def set(self, name: str, obj: Any) -> None:
@@ -27,12 +28,27 @@ class ResourceRegistry:
     def has(self, name: str) -> bool:
         return name in self._resources
 
+    # session-scoped objects (e.g. connection pools) survive scenario teardown
+    def set_session(self, name: str, obj: Any) -> None:
+        if not name:
+            raise ValueError("resource name required")
+        self._session[name] = obj
+
+    def get_session(self, name: str, default: Any = None) -> Any:
+        return self._session.get(name, default)
+
+    def close_session(self) -> None:
+        for name in list(self._session):
+            self._teardown_resource(name, self._session.pop(name))
+
     def mark_enabled(self, name: str) -> None:
         self._enabled_in_scenario.add(name)
 
     # lifecycle
     def begin_scenario(self) -> None:
-        self._enabled_in_scenario = set()
+        # behave runs before_tag hooks before before_scenario, so resources enabled by this
+        # scenario's tags are already marked; teardown_scenario() resets the set afterwards.
+        return
 
     def teardown_scenario(self) -> None:
         for name in list(self._enabled_in_scenario):
@@ -28,6 +28,7 @@ class CrdsUserClient:
         timeout: float | None = None,
         schema: Any | None = None,
         validate_schema: bool | None = None,
+        correlation_id: str | None = None,
     ) -> HttpResponse:
         if not isinstance(payload, CreateUserRequest):
             payload = CreateUserRequest.default().override(**dict(payload))
@@ -40,6 +41,7 @@ class CrdsUserClient:
             timeout=timeout,
             schema=schema,
             validate_schema=validate_schema,
+            correlation_id=correlation_id,
         )
 
     def get_user(
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+from src.core.behave.templating import JsonTemplate, PlaceholderSource, render_json_payload
+
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+# files at least this large are decoded straight from a read-only memory map
+MMAP_THRESHOLD = 4 * 1024 * 1024
+_FILE_STEP = re.compile(r'with body from file "([^"]+)"')
+
+
+@dataclass(slots=True)
+class PayloadFile:
+    path: Path
+    mtime_ns: int
+    size: int
+    text: str
+    template: JsonTemplate | None
+
+    def render(self, data: PlaceholderSource) -> Any:
+        if self.template is None:
+            return render_json_payload(data, self.text)
+        return self.template.render(data.lookup_placeholder)
+
+
+class PayloadFileCache:
+    """Resolved paths and compiled templates of payload files, invalidated by mtime and size."""
+
+    def __init__(self, roots: Iterable[Path] | None = None) -> None:
+        self._roots = tuple(roots) if roots is not None else None
+        self._lock = threading.Lock()
+        self._paths: dict[str, Path] = {}
+        self._files: dict[Path, PayloadFile] = {}
+
+    def resolve(self, file_path: str) -> Path:
+        path = self._paths.get(file_path)
+        if path is not None:
+            return path
+        candidate = Path(file_path)
+        if candidate.is_absolute():
+            candidates = [candidate]
+        else:
+            roots = self._roots if self._roots is not None else (PROJECT_ROOT, Path.cwd())
+            candidates = [root / candidate for root in roots]
+        for candidate in candidates:
+            if candidate.is_file():
+                with self._lock:
+                    self._paths[file_path] = candidate
+                return candidate
+        raise FileNotFoundError(file_path)
+
+    def get(self, file_path: str) -> PayloadFile:
+        path = self.resolve(file_path)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            with self._lock:
+                self._paths.pop(file_path, None)
+                self._files.pop(path, None)
+            raise FileNotFoundError(file_path) from None
+        entry = self._files.get(path)
+        if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+            return entry
+        entry = self._load(path, stat)
+        with self._lock:
+            self._files[path] = entry
+        return entry
+
+    def preload(self, file_paths: Iterable[str]) -> int:
+        """Resolve and compile ``file_paths`` up front; missing or invalid files are left to the step."""
+        loaded = 0
+        for file_path in dict.fromkeys(file_paths):
+            try:
+                self.get(file_path)
+            except (OSError, ValueError) as exc:
+                logger.debug("Skipping payload preload of %s: %s", file_path, exc)
+                continue
+            loaded += 1
+        return loaded
+
+    def clear(self) -> None:
+        with self._lock:
+            self._paths.clear()
+            self._files.clear()
+
+    @staticmethod
+    def _load(path: Path, stat: os.stat_result) -> PayloadFile:
+        if stat.st_size >= MMAP_THRESHOLD:
+            with path.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                text = str(mapped, "utf-8")
+        else:
+            text = path.read_text(encoding="utf-8")
+        stripped = text.strip()
+        whole_reference = stripped.startswith("${") and stripped.endswith("}")
+        return PayloadFile(
+            path=path,
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            text=text,
+            template=None if whole_reference else JsonTemplate(text),
+        )
+
+
+PAYLOAD_FILES = PayloadFileCache()
+
+
+def referenced_payload_files(features: Iterable[Any], config: Any = None) -> list[str]:
+    """Payload file paths used by ``... with body from file "<path>"`` steps of selected scenarios."""
+    found: list[str] = []
+    for feature in features:
+        for scenario in feature.walk_scenarios():
+            if config is not None and not _should_run(scenario, config):
+                continue
+            for step in getattr(scenario, "all_steps", scenario.steps):
+                match = _FILE_STEP.search(step.name)
+                if match and "{" not in match.group(1):
+                    found.append(match.group(1))
+    return list(dict.fromkeys(found))
+
+
+def preload_feature_payloads(context: Any) -> int:
+    runner = getattr(context, "_runner", None)
+    features = getattr(runner, "features", None) or []
+    count = PAYLOAD_FILES.preload(referenced_payload_files(features, getattr(context, "config", None)))
+    if count:
+        logger.info("Preloaded %s payload file(s)", count)
+    return count
+
+
+def _should_run(scenario: Any, config: Any) -> bool:
+    try:
+        return bool(scenario.should_run(config))
+    except Exception:  # noqa: BLE001
+        return True
@@ -1,93 +1,385 @@
 from __future__ import annotations
 
 import copy
-from typing import Any, Mapping
+import dataclasses
+import sys
+import threading
+from collections import ChainMap, OrderedDict
+from collections.abc import Iterator, MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Mapping, Sequence, TypeVar
+
+from src.core.behave.templating import LOOSE, render
+
+
+# ``#n`` history entries kept besides pinned aliases; 0 keeps only ``last`` and named aliases
+DEFAULT_RESPONSE_HISTORY = 0
+DEFAULT_FAN_OUT_WORKERS = 8
+_PARTITIONS = ("responses", "requests", "entities", "vars")
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+def _empty() -> Mapping[str, Any]:
+    return _EMPTY
+
+
+def _frozen(mapping: Mapping[str, Any] | None, *, deep: bool = True) -> Mapping[str, Any]:
+    if not mapping:
+        return _EMPTY
+    return MappingProxyType(copy.deepcopy(dict(mapping)) if deep else dict(mapping))
+
+
+@dataclass(frozen=True, slots=True)
+class ScenarioBase:
+    """Read-only feature/background state that scenarios layer their own writes over.
+
+    Built once (one deep copy) and shared by every ``ScenarioData`` created from it, so starting a
+    scenario costs a few empty dicts instead of a ``deepcopy``. Values are shared: treat them as read-only.
+    """
+
+    api: Mapping[str, Any] = field(default_factory=_empty)
+    responses: Mapping[str, Any] = field(default_factory=_empty)
+    requests: Mapping[str, Any] = field(default_factory=_empty)
+    entities: Mapping[str, Any] = field(default_factory=_empty)
+    vars: Mapping[str, Any] = field(default_factory=_empty)
+    common: Mapping[str, Any] = field(default_factory=_empty)
+
+    @classmethod
+    def from_data(cls, shared_data: Mapping[str, Any]) -> "ScenarioBase":
+        """Freeze a ``shared_data``-shaped dict (``{"api": {...}, "common": {...}}``)."""
+        api = dict(shared_data.get("api") or {})
+        return cls(
+            api=_frozen({key: value for key, value in api.items() if key not in _PARTITIONS}),
+            responses=_frozen(api.get("responses"), deep=False),
+            requests=_frozen(api.get("requests")),
+            entities=_frozen(api.get("entities")),
+            vars=_frozen(api.get("vars")),
+            common=_frozen(shared_data.get("common")),
+        )
+
+
+class ResponseHistory(MutableMapping):
+    """Alias -> response map that keeps at most ``max_history`` unpinned responses.
+
+    ``last`` and explicitly named aliases are pinned and never evicted; every response stored as
+    ``last`` is also recorded as ``#1``, ``#2``, ... in an LRU history (reads refresh an entry) that
+    drops its least recently used entry once full. Reads fall through to ``parent`` (feature state).
+    Every operation holds an internal lock, since even reads reorder the history.
+    """
+
+    PINNED = "last"
+
+    def __init__(self, max_history: int = DEFAULT_RESPONSE_HISTORY, parent: Mapping[str, Any] = _EMPTY) -> None:
+        if max_history < 0:
+            raise ValueError("max_history must be >= 0")
+        self.max_history = max_history
+        self.evicted = 0
+        self._pinned: dict[str, Any] = {}
+        self._history: OrderedDict[str, Any] = OrderedDict()
+        self._sequence = 0
+        self._parent = parent
+        self._lock = threading.RLock()
+
+    def __getitem__(self, alias: str) -> Any:
+        with self._lock:
+            if alias in self._pinned:
+                return self._pinned[alias]
+            if alias in self._history:
+                self._history.move_to_end(alias)
+                return self._history[alias]
+        return self._parent[alias]
+
+    def __setitem__(self, alias: str, response: Any) -> None:
+        if alias.startswith("#"):
+            raise ValueError(f"Response alias '{alias}' is reserved for the response history")
+        with self._lock:
+            self._pinned[alias] = response
+            if alias == self.PINNED and self.max_history:
+                self._sequence += 1
+                self._history[f"#{self._sequence}"] = response
+                while len(self._history) > self.max_history:
+                    self._history.popitem(last=False)
+                    self.evicted += 1
+
+    def __delitem__(self, alias: str) -> None:
+        with self._lock:
+            if alias in self._pinned:
+                del self._pinned[alias]
+            else:
+                del self._history[alias]
+
+    def __contains__(self, alias: object) -> bool:
+        with self._lock:
+            if alias in self._pinned or alias in self._history:
+                return True
+        return alias in self._parent
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            own = list(self._pinned) + list(self._history)
+        seen = set(own)
+        return iter(own + [alias for alias in self._parent if alias not in seen])
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def own_items(self) -> list[tuple[str, Any]]:
+        """Responses recorded in this scenario (pinned, then history), excluding feature state."""
+        with self._lock:
+            return list(self._pinned.items()) + list(self._history.items())
+
+    def pinned(self) -> dict[str, Any]:
+        """Pinned aliases, including those inherited from feature state; the history is not carried over."""
+        with self._lock:
+            return {**self._parent, **self._pinned}
+
+
+def approx_size(value: Any) -> int:
+    """Approximate deep size in bytes of containers, dataclasses and ``__dict__`` objects."""
+    seen: set[int] = set()
+    stack = [value]
+    total = 0
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current, 0)
+        if isinstance(current, (str, bytes, bytearray, int, float, bool)) or current is None:
+            continue
+        if isinstance(current, Mapping):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif dataclasses.is_dataclass(current):
+            stack.extend(getattr(current, item.name) for item in dataclasses.fields(current))
+        elif hasattr(current, "__dict__") and not isinstance(current, type):
+            stack.extend(vars(current).values())
+    return total
 
 
 class ScenarioData:
-    """Lightweight helper over shared_data dict for API-first usage (api-only layout)."""
+    """Lightweight helper over shared_data dict for API-first usage (api-only layout).
+
+    Entities and vars are copy-on-write layers over an optional ``ScenarioBase``: writes land in
+    this scenario's own dicts, reads fall through to the base. Responses live in a bounded
+    ``ResponseHistory``.
+
+    The accessor methods are safe to call from several threads (one re-entrant lock per scenario).
+    For fan-out work prefer ``overlay``/``fan_out``: each task writes to its own layer and the
+    layers are merged in task order, so the outcome does not depend on completion order.
+    """
 
     TEMPLATE = {"api": {"responses": {}, "requests": {}, "entities": {}, "vars": {}}}
 
-    def __init__(self, context: Any, shared_data: dict[str, Any] | None = None) -> None:
+    def __init__(
+        self,
+        context: Any,
+        shared_data: dict[str, Any] | None = None,
+        *,
+        base: ScenarioBase | None = None,
+        max_responses: int = DEFAULT_RESPONSE_HISTORY,
+    ) -> None:
         self.context = context
-        self.raw: dict[str, Any] = copy.deepcopy(shared_data) if shared_data is not None else copy.deepcopy(self.TEMPLATE)
-        self.raw.setdefault("api", {})
-        api = self.raw["api"]
-        api.setdefault("responses", {})
-        api.setdefault("requests", {})
-        api.setdefault("entities", {})
-        api.setdefault("vars", {})
+        self._lock = threading.RLock()
+        self._parsed_bodies: dict[str, tuple[Any, Any]] = {}
+        if shared_data is not None:
+            if base is not None:
+                raise ValueError("Pass either shared_data or base, not both")
+            base = ScenarioBase.from_data(shared_data)
+        self.base = base or ScenarioBase()
+        self.raw: dict[str, Any] = {
+            "api": {
+                **self.base.api,
+                "responses": ResponseHistory(max_responses, self.base.responses),
+                # request contexts are small and mutated in place (headers, params), so they are copied
+                "requests": copy.deepcopy(dict(self.base.requests)) if self.base.requests else {},
+                "entities": ChainMap({}, self.base.entities),
+                "vars": ChainMap({}, self.base.vars),
+            }
+        }
+        if self.base.common:
+            self.raw["common"] = ChainMap({}, self.base.common)
 
     # ---------- API responses ----------
     def put_response(self, alias: str, response: Any, *, overwrite: bool = False) -> None:
         if not alias:
             raise ValueError("Response alias must be non-empty")
-        responses = self.raw["api"]["responses"]
-        if alias in responses and not overwrite:
-            existing = ", ".join(sorted(responses.keys()))
-            raise ValueError(f"Response alias '{alias}' already exists. Existing: [{existing}]")
-        responses[alias] = response
+        with self._lock:
+            responses = self.raw["api"]["responses"]
+            if alias in responses and not overwrite:
+                existing = ", ".join(sorted(responses.keys()))
+                raise ValueError(f"Response alias '{alias}' already exists. Existing: [{existing}]")
+            responses[alias] = response
+            self._parsed_bodies.pop(alias, None)
 
     def get_response(self, alias: str = "last") -> Any:
-        responses = self.raw["api"].get("responses") or {}
-        if alias in responses:
-            return responses[alias]
-        available = ", ".join(sorted(responses.keys())) if responses else "<none>"
-        raise KeyError(f"Response alias '{alias}' not found. Available: [{available}]")
+        with self._lock:
+            responses = self.raw["api"].get("responses") or {}
+            if alias in responses:
+                return responses[alias]
+            available = ", ".join(sorted(responses.keys())) if responses else "<none>"
+            raise KeyError(f"Response alias '{alias}' not found. Available: [{available}]")
+
+    def parsed_body(self, alias: str, response: Any, parse: Callable[[Any], Any]) -> Any:
+        """``parse(response)`` for the response read under ``alias``, computed once per stored response.
+
+        One entry per alias, replaced when the alias is re-stored, and dropped with the scenario.
+        """
+        with self._lock:
+            cached = self._parsed_bodies.get(alias)
+        if cached is not None and cached[0] is response:
+            return cached[1]
+        body = parse(response)
+        with self._lock:
+            self._parsed_bodies[alias] = (response, body)
+        return body
 
     # ---------- Common entities ----------
     def put_entity(self, alias: str, value: Any, *, overwrite: bool = True) -> None:
         if not alias:
             raise ValueError("Entity alias must be non-empty")
-        entities = self.raw["api"]["entities"]
-        if alias in entities and not overwrite:
-            existing = ", ".join(sorted(entities.keys()))
-            raise ValueError(f"Entity alias '{alias}' already exists. Existing: [{existing}]")
-        entities[alias] = value
+        with self._lock:
+            entities = self.raw["api"]["entities"]
+            if alias in entities and not overwrite:
+                existing = ", ".join(sorted(entities.keys()))
+                raise ValueError(f"Entity alias '{alias}' already exists. Existing: [{existing}]")
+            entities[alias] = value
 
     def get_entity(self, alias: str) -> Any:
-        entities = self.raw["api"].get("entities") or {}
-        if alias in entities:
-            return entities[alias]
-        available = ", ".join(sorted(entities.keys())) if entities else "<none>"
-        raise KeyError(f"Entity alias '{alias}' not found. Available: [{available}]")
+        with self._lock:
+            entities = self.raw["api"].get("entities") or {}
+            if alias in entities:
+                return entities[alias]
+            available = ", ".join(sorted(entities.keys())) if entities else "<none>"
+            raise KeyError(f"Entity alias '{alias}' not found. Available: [{available}]")
 
     # ---------- Common vars (string-like) ----------
     def put_var(self, alias: str, value: Any, *, overwrite: bool = True) -> None:
         if not alias:
             raise ValueError("Var alias must be non-empty")
-        vars_map = self.raw["api"]["vars"]
-        if alias in vars_map and not overwrite:
-            existing = ", ".join(sorted(vars_map.keys()))
-            raise ValueError(f"Var alias '{alias}' already exists. Existing: [{existing}]")
-        vars_map[alias] = str(value) if value is not None else ""
+        with self._lock:
+            vars_map = self.raw["api"]["vars"]
+            if alias in vars_map and not overwrite:
+                existing = ", ".join(sorted(vars_map.keys()))
+                raise ValueError(f"Var alias '{alias}' already exists. Existing: [{existing}]")
+            vars_map[alias] = str(value) if value is not None else ""
 
     def get_var(self, alias: str) -> str:
-        vars_map = self.raw["api"].get("vars") or {}
-        if alias in vars_map:
-            return vars_map[alias]
-        available = ", ".join(sorted(vars_map.keys())) if vars_map else "<none>"
-        raise KeyError(f"Var alias '{alias}' not found. Available: [{available}]")
+        with self._lock:
+            vars_map = self.raw["api"].get("vars") or {}
+            if alias in vars_map:
+                return vars_map[alias]
+            available = ", ".join(sorted(vars_map.keys())) if vars_map else "<none>"
+            raise KeyError(f"Var alias '{alias}' not found. Available: [{available}]")
 
     # ---------- Placeholder resolution ----------
     def resolve_placeholders(self, text: Any) -> Any:
-        if not isinstance(text, str):
-            return text
-
-        def replace(match):
-            name = match.group(1)
-            if name in self.raw["api"]["entities"]:
-                return str(self.raw["api"]["entities"][name])
-            if name in self.raw["api"]["vars"]:
-                return str(self.raw["api"]["vars"][name])
-            available = list(self.raw["api"]["entities"].keys()) + list(self.raw["api"]["vars"].keys())
+        return render(text, self.lookup_placeholder, syntax=LOOSE)
+
+    def lookup_placeholder(self, name: str) -> Any:
+        """Entity first, then var; the merged lookup used by every placeholder renderer."""
+        with self._lock:
+            api = self.raw["api"]
+            if name in api["entities"]:
+                return api["entities"][name]
+            if name in api["vars"]:
+                return api["vars"][name]
+            available = list(api["entities"].keys()) + list(api["vars"].keys())
             raise KeyError(f"Placeholder '{name}' not found. Available: {sorted(available)}")
 
-        import re
+    # ---------- State layering & accounting ----------
+    def freeze(self) -> ScenarioBase:
+        """Current state as a ``ScenarioBase`` for later scenarios (e.g. ``context.feature.scenario_base``).
+
+        Entities, vars and ``common`` are deep-copied once; responses and other api keys
+        (clients, base URLs) are shared as they are.
+        """
+        with self._lock:
+            api = self.raw["api"]
+            responses = api["responses"]
+            return ScenarioBase(
+                api=_frozen({key: value for key, value in api.items() if key not in _PARTITIONS}, deep=False),
+                responses=_frozen(
+                    responses.pinned() if isinstance(responses, ResponseHistory) else dict(responses), deep=False
+                ),
+                requests=_frozen(api["requests"]),
+                entities=_frozen(api["entities"]),
+                vars=_frozen(api["vars"]),
+                common=_frozen(self.raw.get("common")),
+            )
+
+    def memory_usage(self) -> dict[str, int]:
+        """Approximate bytes held by this scenario's own layer (the shared base is not counted)."""
+        with self._lock:
+            api = self.raw["api"]
+            responses = api["responses"]
+            own_responses = responses.own_items() if isinstance(responses, ResponseHistory) else list(responses.items())
+            usage = {
+                "responses": approx_size(own_responses),
+                "requests": approx_size(api["requests"]),
+                "entities": approx_size(_own_layer(api["entities"])),
+                "vars": approx_size(_own_layer(api["vars"])),
+                "common": approx_size(_own_layer(self.raw.get("common") or {})),
+            }
+            usage["total"] = sum(usage.values())
+            return usage
 
-        pattern = re.compile(r"\{([^{}]+)\}")
-        return pattern.sub(replace, text)
+    # ---------- Concurrent tasks ----------
+    def overlay(self, order: int) -> "ScenarioOverlay":
+        """Private write layer for one concurrent task; ``merge`` applies overlays sorted by ``order``."""
+        return ScenarioOverlay(self, order)
+
+    def merge(self, overlays: Iterable["ScenarioOverlay"]) -> None:
+        """Replay overlay writes onto this scenario in ``order``.
+
+        A non-overwriting write to an alias that another overlay (or the scenario) already holds
+        raises ``ValueError`` before anything is applied.
+        """
+        ordered = sorted(overlays, key=lambda item: item.order)
+        partitions = {"put_response": "responses", "put_entity": "entities", "put_var": "vars"}
+        with self._lock:
+            claimed: set[tuple[str, str]] = set()
+            for overlay in ordered:
+                if overlay.parent is not self:
+                    raise ValueError("Overlay belongs to a different ScenarioData")
+                for method, alias, _, overwrite in overlay.writes:
+                    key = (method, alias)
+                    if not overwrite and (key in claimed or alias in self.raw["api"][partitions[method]]):
+                        raise ValueError(
+                            f"Task {overlay.order} cannot create {partitions[method]} alias '{alias}': it already exists"
+                        )
+                    claimed.add(key)
+            for overlay in ordered:
+                for method, alias, value, overwrite in overlay.writes:
+                    getattr(self, method)(alias, value, overwrite=overwrite)
+
+    def fan_out(
+        self,
+        items: Sequence[_T],
+        task: Callable[["ScenarioOverlay", _T], _R],
+        *,
+        max_workers: int | None = None,
+    ) -> list[_R]:
+        """Run ``task(overlay, item)`` for every item on a thread pool and merge the overlays in item order.
+
+        Results come back in item order. If any task fails, the first failure (in item order) is
+        raised and nothing is merged.
+        """
+        if not items:
+            return []
+        overlays = [self.overlay(position) for position in range(len(items))]
+        workers = max(1, min(max_workers or DEFAULT_FAN_OUT_WORKERS, len(items)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scenario-fan-out") as pool:
+            futures = [pool.submit(task, overlay, item) for overlay, item in zip(overlays, items)]
+        results = [future.result() for future in futures]
+        self.merge(overlays)
+        return results
 
     # ---------- UI artifacts ----------
     # ---------- helpers ----------
@@ -95,10 +387,63 @@ class ScenarioData:
     def api_state(self) -> dict[str, Any]:
         return self.raw["api"]
 
+    @property
+    def common(self) -> dict[str, Any]:
+        return self.raw.setdefault("common", {})
+
     def get_request_context(self) -> dict[str, Any]:
-        requests = self.raw["api"].setdefault("requests", {})
-        ctx = requests.setdefault("_current", {"headers": {}, "params": {}, "json": {}})
-        ctx.setdefault("headers", {})
-        ctx.setdefault("params", {})
-        ctx.setdefault("json", {})
-        return ctx
+        with self._lock:
+            requests = self.raw["api"].setdefault("requests", {})
+            ctx = requests.setdefault("_current", {"headers": {}, "params": {}, "json": {}})
+            ctx.setdefault("headers", {})
+            ctx.setdefault("params", {})
+            ctx.setdefault("json", {})
+            return ctx
+
+
+class ScenarioOverlay(ScenarioData):
+    """Task-local view of a ``ScenarioData``: reads fall through to the parent, writes are recorded.
+
+    Only responses, entities and vars are merged back. The request context (a private copy taken
+    when the overlay is created) and ``common`` stay task-local.
+    """
+
+    def __init__(self, parent: ScenarioData, order: int) -> None:
+        self.context = parent.context
+        self.parent = parent
+        self.order = order
+        self.base = parent.base
+        self.writes: list[tuple[str, str, Any, bool]] = []
+        self._lock = threading.RLock()
+        self._parsed_bodies = {}
+        with parent._lock:
+            api = parent.raw["api"]
+            self.raw = {
+                "api": {
+                    **{key: value for key, value in api.items() if key not in _PARTITIONS},
+                    "responses": ResponseHistory(0, api["responses"]),
+                    "requests": copy.deepcopy(api["requests"]),
+                    "entities": ChainMap({}, api["entities"]),
+                    "vars": ChainMap({}, api["vars"]),
+                },
+                "common": ChainMap({}, parent.common),
+            }
+
+    def put_response(self, alias: str, response: Any, *, overwrite: bool = False) -> None:
+        super().put_response(alias, response, overwrite=overwrite)
+        self.writes.append(("put_response", alias, response, overwrite))
+
+    def put_entity(self, alias: str, value: Any, *, overwrite: bool = True) -> None:
+        super().put_entity(alias, value, overwrite=overwrite)
+        self.writes.append(("put_entity", alias, value, overwrite))
+
+    def put_var(self, alias: str, value: Any, *, overwrite: bool = True) -> None:
+        super().put_var(alias, value, overwrite=overwrite)
+        self.writes.append(("put_var", alias, value, overwrite))
+
+    def overlay(self, order: int) -> "ScenarioOverlay":
+        raise TypeError("Overlays cannot be nested; fan out from the scenario's ScenarioData")
+
+
+def _own_layer(mapping: Mapping[str, Any]) -> Mapping[str, Any]:
+    return mapping.maps[0] if isinstance(mapping, ChainMap) else mapping
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Protocol
+
+
+# ``{anything-but-braces}``: ScenarioData.resolve_placeholders
+LOOSE = "loose"
+# ``{identifier}`` only, so JSON object braces in payload text are left alone: step modules
+IDENTIFIER = "identifier"
+
+_PATTERNS = {
+    LOOSE: re.compile(r"\{([^{}]+)\}"),
+    IDENTIFIER: re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}"),
+}
+
+# a JSON string literal, or an unquoted ``{identifier}`` (a typed value slot) outside of strings
+_JSON_SCAN = re.compile(r'"(?:[^"\\]|\\.)*"|\{([A-Za-z_][A-Za-z0-9_]*)\}')
+_SLOT_MARK = "\x00slot\x00"
+_SLOT_DUMPED = re.compile(r'"\\u0000slot\\u0000(\d+)"')
+_SLOT_VALUE = "value"
+_SLOT_STRING = "string"
+_SLOT_KEY = "key"
+
+
+class PlaceholderSource(Protocol):
+    def lookup_placeholder(self, name: str) -> Any: ...
+
+    def get_var(self, alias: str) -> str: ...
+
+    def get_entity(self, alias: str) -> Any: ...
+
+
+@dataclass(frozen=True, slots=True)
+class Template:
+    """Text split once into literal segments and placeholder names.
+
+    ``literals`` always has one more item than ``names``: rendering interleaves them.
+    """
+
+    text: str
+    literals: tuple[str, ...]
+    names: tuple[str, ...]
+
+    def render(self, lookup: Callable[[str], Any]) -> str:
+        if not self.names:
+            return self.text
+        parts = [self.literals[0]]
+        for name, literal in zip(self.names, self.literals[1:]):
+            parts.append(str(lookup(name)))
+            parts.append(literal)
+        return "".join(parts)
+
+
+@lru_cache(maxsize=2048)
+def compile_template(text: str, syntax: str = LOOSE) -> Template:
+    pattern = _PATTERNS[syntax]
+    literals: list[str] = []
+    names: list[str] = []
+    position = 0
+    for match in pattern.finditer(text):
+        literals.append(text[position : match.start()])
+        names.append(match.group(1))
+        position = match.end()
+    literals.append(text[position:])
+    return Template(text=text, literals=tuple(literals), names=tuple(names))
+
+
+def render(text: Any, lookup: Callable[[str], Any], *, syntax: str = LOOSE) -> Any:
+    """Render ``text`` through the template cache; non-strings pass through unchanged."""
+    if not isinstance(text, str) or "{" not in text:
+        return text
+    return compile_template(text, syntax).render(lookup)
+
+
+def resolve_step_text(data: PlaceholderSource, text: Any) -> Any:
+    """Step-table/path/payload rendering: ``${name}`` (var first) or ``{identifier}`` placeholders."""
+    if not isinstance(text, str):
+        return text
+    if text.startswith("${") and text.endswith("}"):
+        return str(resolve_step_reference(data, text[2:-1]))
+    return render(text, data.lookup_placeholder, syntax=IDENTIFIER)
+
+
+def resolve_step_reference(data: PlaceholderSource, name: str) -> Any:
+    """Raw value of a ``${name}`` reference, preferring vars over entities."""
+    try:
+        return data.get_var(name)
+    except KeyError:
+        return data.get_entity(name)
+
+
+@dataclass(frozen=True, slots=True)
+class _JsonSlot:
+    container: tuple[Any, ...]
+    key: Any
+    kind: str
+    name: str | None = None
+    template: Template | None = None
+
+
+class JsonTemplate:
+    """JSON payload parsed once into a tree with placeholder slots at known paths.
+
+    An unquoted ``{name}`` is a typed slot: the looked-up value is inserted as is, and string
+    values holding JSON (``"5"``, ``'{"a": 1}'``) are decoded. A quoted ``"{name}"``, a string with
+    placeholders inside it, and a templated object key all render as strings.
+
+    ``render`` copies only the containers on the way to a slot; subtrees without slots are
+    shared between renders, so treat them as read-only. ``render_bytes`` joins pre-serialized
+    compact JSON segments without building the tree at all.
+    """
+
+    def __init__(self, text: str) -> None:
+        slot_names: list[str] = []
+
+        def mark(match: re.Match) -> str:
+            if match.group(1) is None:
+                return match.group(0)
+            slot_names.append(match.group(1))
+            return json.dumps(f"{_SLOT_MARK}{len(slot_names) - 1}")
+
+        try:
+            skeleton = json.loads(_JSON_SCAN.sub(mark, text))
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Invalid JSON template: {exc}") from exc
+
+        slots: list[_JsonSlot] = []
+
+        def add_slot(text: str, container: tuple[Any, ...], key: Any, kind: str) -> str | None:
+            """Register a slot for ``text`` if it has one and return its marker (the new tree value)."""
+            marker = f"{_SLOT_MARK}{len(slots)}"
+            if text.startswith(_SLOT_MARK):
+                name = slot_names[int(text[len(_SLOT_MARK) :])]
+                slot = _JsonSlot(container, marker if kind == _SLOT_KEY else key, kind, name=name)
+            else:
+                template = compile_template(text, IDENTIFIER)
+                if not template.names:
+                    return None
+                slot = _JsonSlot(container, marker if kind == _SLOT_KEY else key, kind, template=template)
+            slots.append(slot)
+            return marker
+
+        def walk(node: Any, path: tuple[Any, ...]) -> Any:
+            if isinstance(node, dict):
+                result = {}
+                for key, value in node.items():
+                    # a templated key is stored under its marker until rendering renames it
+                    out_key = add_slot(key, path, None, _SLOT_KEY) or key
+                    result[out_key] = walk(value, path + (out_key,))
+                return result
+            if isinstance(node, list):
+                return [walk(item, path + (index,)) for index, item in enumerate(node)]
+            if isinstance(node, str):
+                kind = _SLOT_VALUE if node.startswith(_SLOT_MARK) else _SLOT_STRING
+                return add_slot(node, path[:-1], path[-1] if path else None, kind) or node
+            return node
+
+        self.tree = walk(skeleton, ())
+        self.slots = tuple(slots)
+        names: list[str] = []
+        for slot in slots:
+            names.extend(slot.template.names if slot.template is not None else (slot.name,))
+        self.names = tuple(dict.fromkeys(names))
+        self._segments = _SLOT_DUMPED.split(json.dumps(self.tree, ensure_ascii=False, separators=(",", ":")))
+
+    def render(self, lookup: Callable[[str], Any]) -> Any:
+        if not self.slots:
+            return self.tree
+        if isinstance(self.tree, str):
+            return self._slot_value(self.slots[0], lookup)
+        root = _shallow_copy(self.tree)
+        copies: dict[tuple[Any, ...], Any] = {(): root}
+
+        def writable(path: tuple[Any, ...]) -> Any:
+            node = copies.get(path)
+            if node is None:
+                parent = writable(path[:-1])
+                node = _shallow_copy(parent[path[-1]])
+                parent[path[-1]] = node
+                copies[path] = node
+            return node
+
+        renamed: list[tuple[dict[str, Any], str, str]] = []
+        for slot in self.slots:
+            if slot.kind == _SLOT_KEY:
+                renamed.append((writable(slot.container), slot.key, self._slot_value(slot, lookup)))
+            else:
+                writable(slot.container)[slot.key] = self._slot_value(slot, lookup)
+        # rename keys last: value slots below a templated key are addressed by its marker
+        for mapping, marker, new_key in renamed:
+            items = list(mapping.items())
+            mapping.clear()
+            mapping.update((new_key if key == marker else key, value) for key, value in items)
+        return root
+
+    def render_bytes(self, lookup: Callable[[str], Any]) -> bytes:
+        """Compact UTF-8 JSON for the rendered payload."""
+        if not self.slots:
+            return self._segments[0].encode("utf-8")
+        parts = list(self._segments)
+        for position in range(1, len(parts), 2):
+            value = self._slot_value(self.slots[int(parts[position])], lookup)
+            parts[position] = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        return "".join(parts).encode("utf-8")
+
+    @staticmethod
+    def _slot_value(slot: _JsonSlot, lookup: Callable[[str], Any]) -> Any:
+        if slot.template is not None:
+            return slot.template.render(lookup)
+        value = lookup(slot.name)
+        if slot.kind != _SLOT_VALUE:
+            return str(value)
+        if isinstance(value, str):
+            try:
+                return json.loads(value)
+            except ValueError:
+                return value
+        return value
+
+
+def _shallow_copy(node: Any) -> Any:
+    return dict(node) if isinstance(node, dict) else list(node)
+
+
+@lru_cache(maxsize=256)
+def compile_json_template(text: str) -> JsonTemplate:
+    return JsonTemplate(text)
+
+
+def render_json_payload(data: PlaceholderSource, text: str) -> Any:
+    """Raw JSON docstring/file payload rendered through the cached ``JsonTemplate``."""
+    stripped = text.strip()
+    if stripped.startswith("${") and stripped.endswith("}"):
+        return json.loads(resolve_step_text(data, stripped))
+    return compile_json_template(text).render(data.lookup_placeholder)
@@ -1,13 +1,23 @@
 from __future__ import annotations
 
 import os
+import re
 from dataclasses import dataclass, field
-from typing import Any, Mapping
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
+
+from .sources import CONFIG_CACHE_ENV, CONFIG_DIR_ENV, DEFAULT_CONFIG_DIR, layer_files, load_layers
 
 
 _ENV_KEYS = ("ENV", "BEHAVE_ENV")
 _ENV_PREFIX = "E2E__"
 _VALID_ENVS = ("dev", "staging", "prod")
+_TRUE = frozenset({"1", "true", "yes", "y", "on"})
+_FALSE = frozenset({"0", "false", "no", "n", "off", ""})
+_DURATION = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(ms|s|m|h)?\s*$", re.I)
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+_EMPTY_SECTION: Mapping[str, Any] = MappingProxyType({})
 
 
 def _to_nested_dict(env_items: Mapping[str, str]) -> dict[str, Any]:
@@ -34,13 +44,84 @@ def _deep_merge(base: dict[str, Any], override: Mapping[str, Any]) -> dict[str,
     return base
 
 
+def _freeze(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    return value
+
+
+def _flatten(data: Mapping[str, Any]) -> dict[str, Any]:
+    """Index every dotted path (leaves and nested sections) of an already frozen mapping."""
+    index: dict[str, Any] = {}
+    stack: list[tuple[str, Mapping[str, Any]]] = [("", data)]
+    while stack:
+        prefix, mapping = stack.pop()
+        for key, value in mapping.items():
+            path = f"{prefix}{key}"
+            index[path] = value
+            if isinstance(value, Mapping):
+                stack.append((f"{path}.", value))
+    return index
+
+
+def _parse_bool(raw: Any) -> bool:
+    if isinstance(raw, str):
+        text = raw.strip().lower()
+        if text in _TRUE:
+            return True
+        if text in _FALSE:
+            return False
+        raise ValueError(raw)
+    return bool(raw)
+
+
+def _parse_int(raw: Any) -> int:
+    if isinstance(raw, bool) or (isinstance(raw, float) and not raw.is_integer()):
+        raise ValueError(raw)
+    return int(str(raw).strip()) if isinstance(raw, str) else int(raw)
+
+
+def _parse_duration(raw: Any) -> float:
+    """Seconds from a number or a string such as ``"250ms"``, ``"30s"``, ``"5m"``, ``"1h"``."""
+    if isinstance(raw, bool):
+        raise ValueError(raw)
+    if isinstance(raw, (int, float)):
+        return float(raw)
+    match = _DURATION.match(str(raw))
+    if match is None:
+        raise ValueError(raw)
+    amount, unit = match.groups()
+    return float(amount) * _DURATION_UNITS[(unit or "s").lower()]
+
+
 @dataclass(frozen=True)
 class Config:
+    """Merged, read-only configuration.
+
+    A flat index of every dotted path is built once on construction, so ``get`` is a single
+    dict lookup, ``section`` returns cached read-only views and the typed accessors parse each
+    key at most once.
+    """
+
     env: str
     data: dict[str, Any] = field(default_factory=dict)
+    _index: Mapping[str, Any] = field(init=False, repr=False, compare=False)
+    _typed: dict[tuple[str, str], Any] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_index", MappingProxyType(_flatten(_freeze(self.data))))
+        object.__setattr__(self, "_typed", {})
 
     @classmethod
     def load(cls, userdata: Mapping[str, Any] | None = None) -> "Config":
+        """Merge, lowest precedence first: ``base``, ``<env>`` and ``local`` files from the config
+        directory (YAML/TOML/JSON), the userdata block for the env, then ``E2E__*`` variables.
+
+        The directory is userdata ``config_dir`` / ``E2E_CONFIG_DIR`` (default ``config/``). The
+        parsed files are cached under ``<config_dir>/.cache`` unless ``config_cache`` /
+        ``E2E_CONFIG_CACHE`` is ``0``; any other value there is used as the cache directory.
+        Userdata and ``E2E__*`` values are applied after the cache and used verbatim.
+        """
         userdata = userdata or {}
         env = (
             str(userdata.get("env") or "").strip()
@@ -50,23 +131,47 @@ class Config:
         if env not in _VALID_ENVS:
             raise ValueError(f"Unsupported env '{env}', must be one of {_VALID_ENVS}")
 
-        data: dict[str, Any] = {}
+        config_dir = Path(str(userdata.get("config_dir") or os.getenv(CONFIG_DIR_ENV) or DEFAULT_CONFIG_DIR))
+        cache_setting = str(userdata.get("config_cache") or os.getenv(CONFIG_CACHE_ENV) or "").strip()
+        if cache_setting.lower() in _FALSE - {""}:
+            cache_dir = None
+        else:
+            cache_dir = Path(cache_setting) if cache_setting else config_dir / ".cache"
+
         env_block = userdata.get(env)
-        if isinstance(env_block, Mapping):
-            _deep_merge(data, env_block)
-        _deep_merge(data, _to_nested_dict(os.environ))
+        overrides = [env_block if isinstance(env_block, Mapping) else {}, _to_nested_dict(os.environ)]
+        data = load_layers(layer_files(config_dir, env), overrides, merge=_deep_merge, cache_dir=cache_dir)
         return cls(env=env, data=data)
 
     def get(self, key: str, default: Any | None = None) -> Any:
-        if not key:
+        return self._index.get(key, default) if key else default
+
+    def section(self, name: str) -> Mapping[str, Any]:
+        value = self._index.get(name)
+        return value if isinstance(value, Mapping) else _EMPTY_SECTION
+
+    def get_bool(self, key: str, default: bool = False) -> bool:
+        return self._typed_value("bool", key, default, _parse_bool)
+
+    def get_int(self, key: str, default: int | None = None) -> int | None:
+        return self._typed_value("int", key, default, _parse_int)
+
+    def get_float(self, key: str, default: float | None = None) -> float | None:
+        return self._typed_value("float", key, default, float)
+
+    def get_duration(self, key: str, default: float | None = None) -> float | None:
+        return self._typed_value("duration", key, default, _parse_duration)
+
+    def _typed_value(self, kind: str, key: str, default: Any, parse: Callable[[Any], Any]) -> Any:
+        cache_key = (kind, key)
+        if cache_key in self._typed:
+            return self._typed[cache_key]
+        raw = self._index.get(key) if key else None
+        if raw is None or (isinstance(raw, str) and not raw.strip() and kind != "bool"):
             return default
-        cursor: Any = self.data
-        for part in key.split("."):
-            if not isinstance(cursor, Mapping) or part not in cursor:
-                return default
-            cursor = cursor[part]
-        return cursor
-
-    def section(self, name: str) -> dict[str, Any]:
-        value = self.get(name, {})
-        return dict(value) if isinstance(value, Mapping) else {}
+        try:
+            value = parse(raw)
+        except (TypeError, ValueError):
+            raise ValueError(f"Config key '{key}' is not a valid {kind}: {raw!r}") from None
+        self._typed[cache_key] = value
+        return value
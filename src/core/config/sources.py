@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import pickle
+import re
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping
+
+
+logger = logging.getLogger(__name__)
+
+CONFIG_DIR_ENV = "E2E_CONFIG_DIR"
+CONFIG_CACHE_ENV = "E2E_CONFIG_CACHE"
+DEFAULT_CONFIG_DIR = Path(__file__).resolve().parents[3] / "config"
+# order inside one layer when several formats exist for the same stem
+SUPPORTED_SUFFIXES = (".yaml", ".yml", ".toml", ".json")
+_CACHE_VERSION = 2
+# cache files kept per directory: one per combination of file contents (env, edits), newest first
+_CACHE_KEEP = 8
+
+_REFERENCE = re.compile(r"\$\$\{|\$\{([A-Za-z_][A-Za-z0-9_.]*)(?::-([^}]*))?\}")
+
+
+def layer_files(config_dir: Path, env: str) -> list[Path]:
+    """Existing ``base``, ``<env>`` and ``local`` files in ``config_dir``, lowest precedence first."""
+    files = []
+    for stem in ("base", env, "local"):
+        for suffix in SUPPORTED_SUFFIXES:
+            candidate = config_dir / f"{stem}{suffix}"
+            if candidate.is_file():
+                files.append(candidate)
+    return files
+
+
+def parse_file(path: Path, content: bytes) -> dict[str, Any]:
+    suffix = path.suffix.lower()
+    if suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError as exc:
+            raise RuntimeError(f"PyYAML is required to read {path}") from exc
+        data = yaml.safe_load(content.decode("utf-8"))
+    elif suffix == ".toml":
+        try:
+            import tomllib
+        except ImportError:  # Python < 3.11
+            import tomli as tomllib  # type: ignore[no-redef]
+        data = tomllib.loads(content.decode("utf-8"))
+    elif suffix == ".json":
+        data = json.loads(content.decode("utf-8"))
+    else:
+        raise ValueError(f"Unsupported config file type '{suffix}' ({path})")
+    if data is None:
+        return {}
+    if not isinstance(data, Mapping):
+        raise ValueError(f"Config file {path} must contain a mapping at the top level")
+    return dict(data)
+
+
+def interpolate(
+    data: dict[str, Any],
+    environ: Mapping[str, str],
+    literal: frozenset[str] | set[str] = frozenset(),
+) -> dict[str, str]:
+    """Resolve ``${key.path}`` / ``${ENV_VAR}`` references (``${name:-default}``) in place.
+
+    Dotted config keys win over environment variables; a value that is exactly one reference
+    keeps the referenced value's type. ``$${`` escapes a literal ``${``. Values at ``literal``
+    paths are neither resolved nor re-scanned when referenced (userdata/env overrides may hold
+    secrets with a literal ``${``). Returns the environment variables that were consulted.
+    """
+    env_refs: dict[str, str] = {}
+    resolving: list[str] = []
+
+    def lookup(name: str) -> tuple[bool, Any]:
+        cursor: Any = data
+        for part in name.split("."):
+            if not isinstance(cursor, Mapping) or part not in cursor:
+                return False, None
+            cursor = cursor[part]
+        return True, cursor
+
+    def resolve_reference(name: str, default: str | None, where: str) -> Any:
+        if name in resolving:
+            raise ValueError(f"Config reference cycle: {' -> '.join(resolving + [name])}")
+        found, value = lookup(name)
+        if found and name in literal:
+            return value
+        if found and not isinstance(value, Mapping):
+            resolving.append(name)
+            try:
+                return resolve_value(value, name)
+            finally:
+                resolving.pop()
+        if name in environ:
+            env_refs[name] = environ[name]
+            return environ[name]
+        env_refs[name] = ""
+        if default is not None:
+            return default
+        raise ValueError(f"Unresolved config reference ${{{name}}} in '{where}'")
+
+    def resolve_value(value: Any, where: str) -> Any:
+        if isinstance(value, str) and "${" in value:
+            whole = _REFERENCE.fullmatch(value)
+            if whole is not None and whole.group(1):
+                return resolve_reference(whole.group(1), whole.group(2), where)
+
+            def replace(match: re.Match) -> str:
+                if match.group(1) is None:
+                    return "${"
+                return str(resolve_reference(match.group(1), match.group(2), where))
+
+            return _REFERENCE.sub(replace, value)
+        if isinstance(value, list):
+            return [resolve_value(item, where) for item in value]
+        return value
+
+    def walk(mapping: dict[str, Any], prefix: str) -> None:
+        for key, value in mapping.items():
+            path = f"{prefix}{key}"
+            if isinstance(value, dict):
+                walk(value, f"{path}.")
+            elif path not in literal:
+                mapping[key] = resolve_value(value, path)
+
+    walk(data, "")
+    return env_refs
+
+
+def load_layers(
+    files: Iterable[Path],
+    overrides: Iterable[Mapping[str, Any]],
+    *,
+    merge: Callable[[dict[str, Any], Mapping[str, Any]], dict[str, Any]],
+    cache_dir: Path | None,
+    environ: Mapping[str, str] | None = None,
+) -> dict[str, Any]:
+    """Merge config ``files`` then ``overrides`` (in order) and interpolate the file values.
+
+    With ``cache_dir`` set, the merged file layers (parsed, not yet interpolated) are pickled
+    under a name derived from the file hashes, so later loads skip parsing. Overrides are
+    applied after the cache and taken literally: they never reach the cache directory and
+    are not interpolated, though file values may reference them.
+    """
+    environ = os.environ if environ is None else environ
+    data = copy.deepcopy(_file_layers([(path, path.read_bytes()) for path in files], merge, cache_dir))
+    literal: set[str] = set()
+    for override in overrides:
+        literal.update(_leaf_paths(override))
+        merge(data, copy.deepcopy(dict(override)))
+    interpolate(data, environ, literal)
+    return data
+
+
+def _file_layers(
+    contents: list[tuple[Path, bytes]],
+    merge: Callable[[dict[str, Any], Mapping[str, Any]], dict[str, Any]],
+    cache_dir: Path | None,
+) -> dict[str, Any]:
+    cache_path = None
+    if cache_dir is not None and contents:
+        digest = hashlib.sha256(f"v{_CACHE_VERSION}".encode())
+        for path, content in contents:
+            digest.update(str(path.resolve()).encode("utf-8") + b"\0" + hashlib.sha256(content).digest())
+        cache_path = cache_dir / f"config-{digest.hexdigest()[:32]}.pickle"
+        cached = _read_cache(cache_path)
+        if cached is not None:
+            return cached
+    data: dict[str, Any] = {}
+    for path, content in contents:
+        merge(data, parse_file(path, content))
+    if cache_path is not None:
+        _write_cache(cache_path, {"version": _CACHE_VERSION, "data": data})
+    return data
+
+
+def _leaf_paths(mapping: Mapping[str, Any], prefix: str = "") -> Iterable[str]:
+    for key, value in mapping.items():
+        if isinstance(value, Mapping):
+            yield from _leaf_paths(value, f"{prefix}{key}.")
+        else:
+            yield f"{prefix}{key}"
+
+
+def _read_cache(path: Path) -> dict[str, Any] | None:
+    try:
+        with path.open("rb") as fh:
+            payload = pickle.load(fh)
+    except FileNotFoundError:
+        return None
+    except Exception:  # noqa: BLE001
+        logger.warning("Ignoring unreadable config cache %s", path, exc_info=True)
+        return None
+    if not isinstance(payload, dict) or payload.get("version") != _CACHE_VERSION:
+        return None
+    return payload["data"]
+
+
+def _write_cache(path: Path, payload: dict[str, Any]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # write-then-rename so parallel workers never observe a partial cache file
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".config-", suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            pickle.dump(payload, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, path)
+    except OSError:
+        logger.warning("Could not write config cache %s", path, exc_info=True)
+        return
+    _prune_cache(path.parent)
+
+
+def _prune_cache(cache_dir: Path) -> None:
+    """Keep the ``_CACHE_KEEP`` most recently written cache files; older file versions are dropped."""
+    try:
+        entries = sorted(cache_dir.glob("config-*.pickle"), key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for stale in entries[_CACHE_KEEP:]:
+            stale.unlink()
+    except OSError:
+        logger.debug("Could not prune config cache %s", cache_dir, exc_info=True)
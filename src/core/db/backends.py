@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import datetime as _dt
+import decimal
+import hashlib
+import logging
+import re
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Iterable, Sequence
+
+
+logger = logging.getLogger(__name__)
+
+SQLITE_PREFIX = "sqlite:"
+
+
+class DbBackendUnsupported(RuntimeError):
+    """The backend's dialect lacks a feature the requested operation needs."""
+
+
+class DbBackend(ABC):
+    """Driver adapter behind ``DbClient``: connecting plus the few dialect differences it relies on."""
+
+    name = "base"
+    # keep one open cursor per prepared statement so the driver can skip re-preparing it
+    reuse_cursors = True
+    savepoint_sql = "SAVEPOINT {name}"
+    rollback_to_savepoint_sql = "ROLLBACK TO SAVEPOINT {name}"
+
+    @abstractmethod
+    def connect(self, connection_string: str, *, timeout: int, autocommit: bool) -> Any:
+        """Open a new DB-API connection for ``connection_string``."""
+
+    def set_autocommit(self, conn: Any, enabled: bool) -> None:
+        conn.autocommit = enabled
+
+    def prepare_cursor(self, cursor: Any, *, timeout: int) -> None:
+        """Apply per-cursor settings (statement timeout) where the driver supports them."""
+
+    def prepare_bulk_cursor(self, cursor: Any) -> None:
+        """Enable driver-side array binding for ``executemany`` where available."""
+
+    def translate(self, query: str) -> str:
+        return query
+
+    def adapt_params(self, params: Iterable[Any] | None) -> Sequence[Any]:
+        return params if isinstance(params, (list, tuple)) else list(params or [])
+
+    def checksum_sql(self, columns: Sequence[str]) -> str:
+        """Order-independent aggregate checksum expression over ``columns`` for one row range."""
+        raise DbBackendUnsupported(f"DB backend '{self.name}' does not support table checksums")
+
+    def close(self) -> None:
+        """Release backend-wide resources once the owning client is closed."""
+
+
+class PyodbcBackend(DbBackend):
+    """ODBC (SQL Server) backend; ``pyodbc`` is imported on first connect."""
+
+    name = "pyodbc"
+    savepoint_sql = "SAVE TRANSACTION {name}"
+    rollback_to_savepoint_sql = "ROLLBACK TRANSACTION {name}"
+
+    def __init__(self) -> None:
+        self._pyodbc: Any = None
+
+    def connect(self, connection_string: str, *, timeout: int, autocommit: bool) -> Any:
+        if self._pyodbc is None:
+            try:
+                import pyodbc
+            except ImportError as exc:
+                raise RuntimeError("pyodbc is required for ODBC connection strings; install it or use sqlite://") from exc
+            self._pyodbc = pyodbc
+        return self._pyodbc.connect(connection_string, timeout=timeout, autocommit=autocommit)
+
+    def prepare_cursor(self, cursor: Any, *, timeout: int) -> None:
+        try:
+            cursor.timeout = timeout
+        except Exception:
+            logger.debug("pyodbc cursor timeout not supported")
+
+    def prepare_bulk_cursor(self, cursor: Any) -> None:
+        try:
+            cursor.fast_executemany = True
+        except Exception:
+            logger.debug("pyodbc fast_executemany not supported")
+
+    def checksum_sql(self, columns: Sequence[str]) -> str:
+        # BINARY_CHECKSUM skips text/ntext/image/xml columns; good enough to flag a changed chunk
+        return f"CHECKSUM_AGG(BINARY_CHECKSUM({', '.join(columns)}))"
+
+
+_TOP_N = re.compile(r"^(\s*SELECT\s+(?:DISTINCT\s+)?)TOP\s*\(?\s*(\d+)\s*\)?\s+(.*?)\s*;?\s*$", re.I | re.S)
+_LIMIT = re.compile(r"\bLIMIT\s+\d+", re.I)
+
+
+@lru_cache(maxsize=512)
+def _translate_sqlite(query: str) -> str:
+    match = _TOP_N.match(query)
+    if match is None or _LIMIT.search(query):
+        return query
+    head, count, rest = match.groups()
+    return f"{head}{rest} LIMIT {count}"
+
+
+class _SqliteChecksum:
+    """``e2e_checksum(col, ...)`` aggregate: sum of per-row digests, so row order does not matter."""
+
+    def __init__(self) -> None:
+        self._total = 0
+
+    def step(self, *values: Any) -> None:
+        digest = hashlib.blake2b(repr(values).encode("utf-8"), digest_size=8).digest()
+        self._total = (self._total + int.from_bytes(digest, "big")) % (1 << 63)
+
+    def finalize(self) -> int:
+        return self._total
+
+
+def _adapt_sqlite_value(value: Any) -> Any:
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, (_dt.datetime, _dt.date, _dt.time)):
+        return value.isoformat(sep=" ") if isinstance(value, _dt.datetime) else value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+class SqliteBackend(DbBackend):
+    """Bundled ``sqlite3`` backend for hermetic local runs.
+
+    Connection strings follow the SQLAlchemy shape: ``sqlite:///relative.db``,
+    ``sqlite:////abs/path.db`` or ``sqlite://`` / ``sqlite:///:memory:`` for an in-memory database.
+    In-memory databases use a private shared-cache URI kept alive by a keeper connection, so every
+    pooled connection sees the same tables. The dialect shim rewrites ``SELECT TOP n`` to ``LIMIT n``
+    and binds Decimal/date/UUID parameters as text.
+    """
+
+    name = "sqlite"
+    # sqlite3 has its own per-connection statement cache, and a cursor parked mid-result would
+    # hold a read lock on the database
+    reuse_cursors = False
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._memory_uri: str | None = None
+        self._keeper: Any = None
+
+    def connect(self, connection_string: str, *, timeout: int, autocommit: bool) -> Any:
+        import sqlite3
+
+        target = self._target(connection_string)
+        conn = sqlite3.connect(
+            target,
+            timeout=timeout,
+            uri=target.startswith("file:"),
+            check_same_thread=False,
+            isolation_level=None if autocommit else "",
+        )
+        conn.create_aggregate("e2e_checksum", -1, _SqliteChecksum)
+        return conn
+
+    def set_autocommit(self, conn: Any, enabled: bool) -> None:
+        conn.isolation_level = None if enabled else ""
+
+    def translate(self, query: str) -> str:
+        return _translate_sqlite(query)
+
+    def adapt_params(self, params: Iterable[Any] | None) -> Sequence[Any]:
+        return [_adapt_sqlite_value(value) for value in params or []]
+
+    def checksum_sql(self, columns: Sequence[str]) -> str:
+        return f"e2e_checksum({', '.join(columns)})"
+
+    def close(self) -> None:
+        with self._lock:
+            keeper, self._keeper = self._keeper, None
+        if keeper is not None:
+            keeper.close()
+
+    def _target(self, connection_string: str) -> str:
+        path = connection_string
+        if path.lower().startswith(SQLITE_PREFIX):
+            path = path[len(SQLITE_PREFIX) :]
+            path = path[3:] if path.startswith("///") else path.lstrip("/")
+        if path not in ("", ":memory:"):
+            return path
+        import sqlite3
+
+        with self._lock:
+            if self._memory_uri is None:
+                self._memory_uri = f"file:e2e-{uuid.uuid4().hex}?mode=memory&cache=shared"
+                self._keeper = sqlite3.connect(self._memory_uri, uri=True, check_same_thread=False)
+            return self._memory_uri
+
+
+BACKENDS = {"pyodbc": PyodbcBackend, "sqlite": SqliteBackend}
+
+
+def select_backend(connection_string: str, name: str | None = None) -> DbBackend:
+    """Pick a backend by explicit ``name`` or from the connection string (``sqlite:`` prefix)."""
+    if not name:
+        name = "sqlite" if connection_string.lower().startswith(SQLITE_PREFIX) else "pyodbc"
+    try:
+        return BACKENDS[name.lower()]()
+    except KeyError:
+        raise ValueError(f"Unsupported DB backend '{name}', must be one of {sorted(BACKENDS)}") from None
@@ -1,71 +1,610 @@
 from __future__ import annotations
 
+import itertools
 import logging
-from typing import Any, Iterable, Mapping
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator, Mapping, Sequence
 
-import pyodbc
+from .backends import DbBackend, select_backend
+from .instrumentation import QueryStats
+from .pool import ConnectionPool, DbPoolError, PoolMetrics
+from .queries import QueryTemplate
+from .rows import RowStream
+from .waits import IN_CHUNK_SIZE, backoff_delays, validate_identifier
 
 
 logger = logging.getLogger(__name__)
 
+_STATEMENT_CURSORS_PER_CONNECTION = 32
+_WAIT_KEY_ALIAS = "e2e_wait_key"
+
 
 class DbClientError(RuntimeError):
     pass
 
 
 class DbClient:
+    """Pooled DB client over a pluggable driver backend.
+
+    ``backend`` is a ``DbBackend`` or its name (``"pyodbc"``/``"sqlite"``); by default it is chosen
+    from the connection string, a ``sqlite:`` prefix selecting the bundled SQLite backend.
+    """
+
     def __init__(
         self,
         connection_string: str,
         *,
         timeout: int = 10,
         autocommit: bool = False,
+        pool_min_size: int = 1,
+        pool_max_size: int = 1,
+        pool_max_lifetime: float = 1800.0,
+        pool_idle_timeout: float = 300.0,
+        pool_checkout_timeout: float = 30.0,
+        query_stats: QueryStats | None = None,
+        backend: str | DbBackend | None = None,
     ) -> None:
         if not connection_string:
             raise ValueError("connection_string is required")
         self._connection_string = connection_string
+        self._backend = backend if isinstance(backend, DbBackend) else select_backend(connection_string, backend)
         self._timeout = timeout
+        self._autocommit = autocommit
+        self._pinned: Any = None
+        self._pinned_lock = threading.RLock()
+        self._savepoints: list[str] = []
+        self._statement_cursors: dict[int, OrderedDict[str, Any]] = {}
+        self._statement_lock = threading.Lock()
+        self._closed = False
+        self.query_stats = query_stats if query_stats is not None else QueryStats()
         try:
-            self._conn = pyodbc.connect(connection_string, timeout=timeout, autocommit=autocommit)
+            self._pool = ConnectionPool(
+                self._connect,
+                min_size=pool_min_size,
+                max_size=pool_max_size,
+                max_lifetime=pool_max_lifetime,
+                idle_timeout=pool_idle_timeout,
+                checkout_timeout=pool_checkout_timeout,
+                health_check=self._ping,
+                on_close=self._forget_statements,
+            )
         except Exception as exc:  # noqa: BLE001
+            self._backend.close()
             raise DbClientError(f"DB connection failed: {exc}") from exc
 
+    @property
+    def backend(self) -> DbBackend:
+        return self._backend
+
     def close(self) -> None:
+        # idempotent: pool metrics and the query report are published once per client
+        if self._closed:
+            return
+        self._closed = True
+        self.end_isolation(all_levels=True)
         try:
-            self._conn.close()
+            self._pool.close()
+            self._backend.close()
         except Exception:
             logger.exception("DB close failed")
+            return
+        metrics = self._pool.metrics()
+        logger.info(
+            "DB pool closed: created=%s checkouts=%s waits=%s avg_wait=%.3fs max_wait=%.3fs health_failures=%s",
+            metrics.created,
+            metrics.checkouts,
+            metrics.waits,
+            metrics.wait_time_avg_s,
+            metrics.wait_time_max_s,
+            metrics.health_check_failures,
+        )
+        self.query_stats.publish()
+
+    def pool_metrics(self) -> PoolMetrics:
+        return self._pool.metrics()
+
+    # ---------- transactional isolation ----------
+    @property
+    def isolated(self) -> bool:
+        return self._pinned is not None
+
+    def begin_isolation(self) -> None:
+        """Pin one connection and open a transaction on it; nested calls open savepoints.
+
+        While isolated, every call (from any thread) is serialized onto the pinned connection and
+        commits are suppressed, so ``end_isolation`` discards all changes made in between.
+        """
+        with self._pinned_lock:
+            if self._pinned is None:
+                try:
+                    conn = self._pool.acquire()
+                except DbPoolError as exc:
+                    raise DbClientError(f"DB connection unavailable: {exc}") from exc
+                try:
+                    self._backend.set_autocommit(conn, False)
+                except Exception as exc:  # noqa: BLE001
+                    self._pool.release(conn, discard=True)
+                    raise DbClientError(f"DB isolation failed: {exc}") from exc
+                self._pinned = conn
+                return
+            name = f"e2e_sp_{len(self._savepoints) + 1}"
+            self._run_statement(self._pinned, self._backend.savepoint_sql.format(name=name))
+            self._savepoints.append(name)
+
+    def end_isolation(self, *, all_levels: bool = False) -> None:
+        """Roll back the innermost savepoint, or the whole transaction at the outermost level."""
+        with self._pinned_lock:
+            while self._pinned is not None:
+                if self._savepoints:
+                    name = self._savepoints.pop()
+                    self._run_statement(self._pinned, self._backend.rollback_to_savepoint_sql.format(name=name))
+                    if all_levels:
+                        continue
+                    return
+                conn, self._pinned = self._pinned, None
+                discard = False
+                try:
+                    conn.rollback()
+                    self._backend.set_autocommit(conn, self._autocommit)
+                except Exception:  # noqa: BLE001
+                    logger.warning("DB isolation rollback failed; discarding connection", exc_info=True)
+                    discard = True
+                self._pool.release(conn, discard=discard)
+                return
 
     def select_one(self, query: str, params: Iterable[Any] | None = None) -> dict[str, Any] | None:
-        rows = self.select_many(query, params=params)
-        return rows[0] if rows else None
+        with self._read_connection() as conn:
+            cursor = self._cursor(conn)
+            try:
+                started = time.perf_counter()
+                cursor.execute(self._backend.translate(query), self._backend.adapt_params(params))
+                row = cursor.fetchone()
+                self._record(query, started, 0 if row is None else 1)
+                if row is None:
+                    return None
+                columns = [col[0] for col in cursor.description]
+                return dict(zip(columns, row))
+            except Exception as exc:  # noqa: BLE001
+                raise DbClientError(f"DB query failed: {exc}") from exc
+            finally:
+                cursor.close()
 
     def select_many(self, query: str, params: Iterable[Any] | None = None) -> list[dict[str, Any]]:
-        cursor = self._cursor()
+        with self._read_connection() as conn:
+            cursor = self._cursor(conn)
+            try:
+                started = time.perf_counter()
+                cursor.execute(self._backend.translate(query), self._backend.adapt_params(params))
+                columns = [col[0] for col in cursor.description] if cursor.description else []
+                rows = [dict(zip(columns, row)) for row in cursor]
+                self._record(query, started, len(rows))
+                return rows
+            except Exception as exc:  # noqa: BLE001
+                raise DbClientError(f"DB query failed: {exc}") from exc
+            finally:
+                cursor.close()
+
+    def select_one_prepared(self, template: QueryTemplate, values: Mapping[str, Any]) -> dict[str, Any] | None:
+        """Run a registered ``QueryTemplate`` and return its first row (or ``None``)."""
+        rows = self._run_prepared(template, values, first_only=True)
+        return rows[0] if rows else None
+
+    def select_many_prepared(self, template: QueryTemplate, values: Mapping[str, Any]) -> list[dict[str, Any]]:
+        return self._run_prepared(template, values, first_only=False)
+
+    def iter_rows(
+        self,
+        query: str,
+        params: Iterable[Any] | None = None,
+        *,
+        batch_size: int = 1000,
+        row_format: str = "row",
+    ) -> RowStream:
+        """Stream a result set with ``fetchmany`` instead of materializing it.
+
+        ``row_format`` is ``"row"`` (``Row`` objects sharing one column index), ``"tuple"``
+        (plain value tuples; names via ``stream.columns``) or ``"dict"``. The stream holds a
+        pooled connection until exhausted or closed.
+
+        While isolated, the stream reads from the pinned connection and takes its lock per batch,
+        so an idle stream does not block other threads. Their statements share that connection,
+        though, so on drivers without multiple active result sets (pyodbc without MARS) consume
+        or close the stream before issuing other statements.
+        """
+        conn = self._acquire()
+        pinned = conn is self._pinned
+        cursor = None
         try:
-            cursor.execute(query, params or [])
-            columns = [col[0] for col in cursor.description] if cursor.description else []
-            result = [dict(zip(columns, row)) for row in cursor.fetchall()]
-            return result
+            cursor = self._cursor(conn)
+            started = time.perf_counter()
+            cursor.execute(self._backend.translate(query), self._backend.adapt_params(params))
+            execute_seconds = time.perf_counter() - started
         except Exception as exc:  # noqa: BLE001
+            if cursor is not None:
+                _close_quietly(cursor)
+            self._release(conn)
             raise DbClientError(f"DB query failed: {exc}") from exc
-        finally:
-            cursor.close()
+        if pinned:
+            # from here on the stream takes the pinned lock per fetch instead of holding it throughout
+            self._pinned_lock.release()
+
+        def _on_close(stream: RowStream) -> None:
+            if not pinned:
+                self._rollback(conn)
+                self._release(conn)
+            # consumer time between batches is excluded; only execute + fetch time counts
+            elapsed_ms = (execute_seconds + stream.fetch_seconds) * 1000.0
+            self.query_stats.record(query, elapsed_ms, stream.rows_read)
+
+        return RowStream(
+            cursor,
+            batch_size=batch_size,
+            row_format=row_format,
+            on_close=_on_close,
+            lock=self._pinned_lock if pinned else None,
+        )
+
+    def select_columns(
+        self,
+        query: str,
+        params: Iterable[Any] | None = None,
+        *,
+        batch_size: int = 1000,
+    ) -> dict[str, list[Any]]:
+        """Return the result set column-wise (``{column: [values...]}``) for aggregate checks."""
+        with self.iter_rows(query, params, batch_size=batch_size, row_format="tuple") as stream:
+            columns: list[list[Any]] = [[] for _ in stream.columns]
+            for values in stream:
+                for column, value in zip(columns, values):
+                    column.append(value)
+            return dict(zip(stream.columns.names, columns))
+
+    def wait_for_row(
+        self,
+        query: str,
+        params: Iterable[Any] | None = None,
+        predicate: Callable[[Mapping[str, Any]], bool] | None = None,
+        timeout: float = 10.0,
+        *,
+        initial_delay: float = 0.05,
+        max_delay: float = 1.0,
+    ) -> dict[str, Any]:
+        """Poll ``query`` until it returns a row (matching ``predicate``) or ``timeout`` expires.
+
+        Polls back off exponentially with jitter, so fast commits are seen almost immediately
+        while slow ones do not hammer the database.
+        """
+        params = list(params or [])
+        deadline = time.monotonic() + timeout
+        last_rows: list[dict[str, Any]] = []
+        for delay in backoff_delays(initial=initial_delay, maximum=max_delay):
+            if predicate is None:
+                row = self.select_one(query, params=params)
+                if row is not None:
+                    return row
+            else:
+                last_rows = self.select_many(query, params=params)
+                for row in last_rows:
+                    if predicate(row):
+                        return row
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(delay, remaining))
+        preview = f" Last rows: {last_rows[:3]!r}" if last_rows else ""
+        raise DbClientError(f"Timed out after {timeout}s waiting for row: {query}.{preview}")
+
+    def wait_for_rows(
+        self,
+        table: str,
+        key_column: str,
+        keys: Iterable[Any],
+        timeout: float = 10.0,
+        *,
+        columns: Iterable[str] | None = None,
+        predicate: Callable[[Mapping[str, Any]], bool] | None = None,
+        initial_delay: float = 0.05,
+        max_delay: float = 1.0,
+    ) -> dict[str, dict[str, Any]]:
+        """Wait for one row per key, polling all still-pending keys with one ``IN (...)`` query per tick.
+
+        Returns rows keyed by ``str(key)``.
+        """
+        validate_identifier(table)
+        validate_identifier(key_column)
+        projection = ", ".join(validate_identifier(col) for col in columns) if columns else "*"
+        # the key is always selected under a plain alias: ``columns`` may omit it, and a dotted
+        # ``key_column`` (``t.id``) comes back under its bare column name
+        projection = f"{key_column} AS {_WAIT_KEY_ALIAS}, {projection}"
+        pending = {str(key): key for key in keys}
+        found: dict[str, dict[str, Any]] = {}
+        deadline = time.monotonic() + timeout
+        for delay in backoff_delays(initial=initial_delay, maximum=max_delay):
+            pending_keys = list(pending.values())
+            for start in range(0, len(pending_keys), IN_CHUNK_SIZE):
+                chunk = pending_keys[start : start + IN_CHUNK_SIZE]
+                placeholders = ", ".join("?" for _ in chunk)
+                query = f"SELECT {projection} FROM {table} WHERE {key_column} IN ({placeholders})"
+                for row in self.select_many(query, params=chunk):
+                    key = str(row.pop(_WAIT_KEY_ALIAS))
+                    if key in pending and (predicate is None or predicate(row)):
+                        found[key] = row
+                        pending.pop(key)
+            if not pending:
+                return found
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(delay, remaining))
+        missing = sorted(pending)
+        raise DbClientError(
+            f"Timed out after {timeout}s waiting for {len(missing)} row(s) in {table}: {missing[:20]}"
+        )
 
     def execute(self, query: str, params: Iterable[Any] | None = None) -> int:
-        cursor = self._cursor()
+        with self._connection() as conn:
+            cursor = self._cursor(conn)
+            try:
+                started = time.perf_counter()
+                cursor.execute(self._backend.translate(query), self._backend.adapt_params(params))
+                self._record(query, started, cursor.rowcount)
+                self._commit(conn)
+                return cursor.rowcount
+            except Exception as exc:  # noqa: BLE001
+                self._rollback(conn)
+                raise DbClientError(f"DB execute failed: {exc}") from exc
+            finally:
+                cursor.close()
+
+    def execute_many(
+        self,
+        query: str,
+        rows: Iterable[Sequence[Any]],
+        *,
+        chunk_size: int = 1000,
+    ) -> int:
+        """Run ``query`` for every parameter row in chunks, with driver array binding where supported.
+
+        Commits after the last chunk unless the client is in autocommit mode. Returns the
+        number of parameter rows sent.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        total = 0
+        iterator = iter(rows)
+        with self._connection() as conn:
+            cursor = self._cursor(conn)
+            self._backend.prepare_bulk_cursor(cursor)
+            statement = self._backend.translate(query)
+            try:
+                while True:
+                    chunk = [self._backend.adapt_params(row) for row in itertools.islice(iterator, chunk_size)]
+                    if not chunk:
+                        break
+                    started = time.perf_counter()
+                    cursor.executemany(statement, chunk)
+                    self._record(query, started, len(chunk))
+                    total += len(chunk)
+                self._commit(conn)
+            except Exception as exc:  # noqa: BLE001
+                self._rollback(conn)
+                raise DbClientError(f"DB executemany failed after {total} rows: {exc}") from exc
+            finally:
+                cursor.close()
+        return total
+
+    def bulk_insert(
+        self,
+        table: str,
+        rows: Iterable[Mapping[str, Any]],
+        *,
+        columns: Sequence[str] | None = None,
+        chunk_size: int = 1000,
+    ) -> int:
+        """Insert mapping rows; ``columns`` defaults to the keys of the first row."""
+        iterator = iter(rows)
+        if columns is None:
+            first = next(iterator, None)
+            if first is None:
+                return 0
+            columns = list(first.keys())
+            iterator = itertools.chain([first], iterator)
+        column_sql = ", ".join(validate_identifier(col) for col in columns)
+        placeholders = ", ".join("?" for _ in columns)
+        query = f"INSERT INTO {validate_identifier(table)} ({column_sql}) VALUES ({placeholders})"
+        values = ([row.get(col) for col in columns] for row in iterator)
+        return self.execute_many(query, values, chunk_size=chunk_size)
+
+    def delete_keys(
+        self,
+        table: str,
+        key_column: str,
+        keys: Iterable[Any],
+        *,
+        chunk_size: int = IN_CHUNK_SIZE,
+    ) -> int:
+        """Delete rows by key with one set-based ``IN (...)`` statement per chunk."""
+        validate_identifier(table)
+        validate_identifier(key_column)
+        unique_keys = list(dict.fromkeys(keys))
+        deleted = 0
+        with self._connection() as conn:
+            cursor = self._cursor(conn)
+            try:
+                for start in range(0, len(unique_keys), chunk_size):
+                    chunk = unique_keys[start : start + chunk_size]
+                    placeholders = ", ".join("?" for _ in chunk)
+                    statement = f"DELETE FROM {table} WHERE {key_column} IN ({placeholders})"
+                    started = time.perf_counter()
+                    cursor.execute(statement, self._backend.adapt_params(chunk))
+                    self._record(statement, started, cursor.rowcount)
+                    deleted += max(cursor.rowcount, 0)
+                self._commit(conn)
+            except Exception as exc:  # noqa: BLE001
+                self._rollback(conn)
+                raise DbClientError(f"DB delete failed: {exc}") from exc
+            finally:
+                cursor.close()
+        return deleted
+
+    def _run_prepared(
+        self,
+        template: QueryTemplate,
+        values: Mapping[str, Any],
+        *,
+        first_only: bool,
+    ) -> list[dict[str, Any]]:
+        query = self._backend.translate(template.sql)
+        params = self._backend.adapt_params(template.bind(values))
+        reuse = self._backend.reuse_cursors
+        with self._read_connection() as conn:
+            cursor = self._statement_cursor(conn, query) if reuse else self._cursor(conn)
+            try:
+                started = time.perf_counter()
+                cursor.execute(query, params)
+                columns = [col[0] for col in cursor.description]
+                if first_only:
+                    row = cursor.fetchone()
+                    rows = [] if row is None else [dict(zip(columns, row))]
+                    if reuse:
+                        # a cached cursor must not go back with rows pending: without MARS the
+                        # connection stays busy until the result set is consumed
+                        _discard_pending(cursor)
+                else:
+                    rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+                self._record(template.sql, started, len(rows))
+                return rows
+            except Exception as exc:  # noqa: BLE001
+                if reuse:
+                    self._drop_statement(conn, query)
+                raise DbClientError(f"DB query '{template.name}' failed: {exc}") from exc
+            finally:
+                if not reuse:
+                    cursor.close()
+
+    def _statement_cursor(self, conn: Any, query: str) -> Any:
+        """Cursor dedicated to ``query`` on ``conn``; re-executing the same SQL on it skips the prepare."""
+        with self._statement_lock:
+            cursors = self._statement_cursors.setdefault(id(conn), OrderedDict())
+            cursor = cursors.get(query)
+            if cursor is not None:
+                cursors.move_to_end(query)
+                return cursor
+        cursor = self._cursor(conn)
+        evicted = None
+        with self._statement_lock:
+            cursors[query] = cursor
+            if len(cursors) > _STATEMENT_CURSORS_PER_CONNECTION:
+                _, evicted = cursors.popitem(last=False)
+        if evicted is not None:
+            _close_quietly(evicted)
+        return cursor
+
+    def _drop_statement(self, conn: Any, query: str) -> None:
+        with self._statement_lock:
+            cursor = self._statement_cursors.get(id(conn), {}).pop(query, None)
+        if cursor is not None:
+            _close_quietly(cursor)
+
+    def _forget_statements(self, conn: Any) -> None:
+        with self._statement_lock:
+            cursors = self._statement_cursors.pop(id(conn), None)
+        for cursor in (cursors or {}).values():
+            _close_quietly(cursor)
+
+    def _record(self, query: str, started: float, rows: int) -> None:
+        self.query_stats.record(query, (time.perf_counter() - started) * 1000.0, rows)
+
+    def _commit(self, conn: Any) -> None:
+        if not self._autocommit and conn is not self._pinned:
+            conn.commit()
+
+    def _rollback(self, conn: Any) -> None:
+        if self._autocommit or conn is self._pinned:
+            return
         try:
-            cursor.execute(query, params or [])
-            return cursor.rowcount
+            conn.rollback()
+        except Exception:  # noqa: BLE001
+            logger.debug("DB rollback failed", exc_info=True)
+
+    @contextmanager
+    def _connection(self) -> Iterator[Any]:
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    @contextmanager
+    def _read_connection(self) -> Iterator[Any]:
+        """``_connection`` for reads: ends the implicit read transaction before the connection is pooled again."""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._rollback(conn)
+            self._release(conn)
+
+    def _acquire(self) -> Any:
+        self._pinned_lock.acquire()
+        if self._pinned is not None:
+            return self._pinned  # lock stays held until _release
+        self._pinned_lock.release()
+        try:
+            return self._pool.acquire()
+        except DbPoolError as exc:
+            raise DbClientError(f"DB connection unavailable: {exc}") from exc
+        except Exception as exc:  # noqa: BLE001
+            raise DbClientError(f"DB connection failed: {exc}") from exc
+
+    def _release(self, conn: Any) -> None:
+        if conn is self._pinned:
+            self._pinned_lock.release()
+            return
+        self._pool.release(conn)
+
+    def _run_statement(self, conn: Any, statement: str) -> None:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(statement)
         except Exception as exc:  # noqa: BLE001
-            raise DbClientError(f"DB execute failed: {exc}") from exc
+            raise DbClientError(f"DB statement failed: {statement}: {exc}") from exc
         finally:
             cursor.close()
 
-    def _cursor(self) -> pyodbc.Cursor:
-        cursor = self._conn.cursor()
+    def _connect(self) -> Any:
+        return self._backend.connect(self._connection_string, timeout=self._timeout, autocommit=self._autocommit)
+
+    def _ping(self, conn: Any) -> bool:
+        cursor = conn.cursor()
         try:
-            cursor.timeout = self._timeout
-        except Exception:
-            logger.debug("pyodbc cursor timeout not supported")
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+            return True
+        finally:
+            cursor.close()
+
+    def _cursor(self, conn: Any) -> Any:
+        cursor = conn.cursor()
+        self._backend.prepare_cursor(cursor, timeout=self._timeout)
         return cursor
+
+
+def _discard_pending(cursor: Any) -> None:
+    """Drop unread rows (and any further result sets) of the last execute on ``cursor``."""
+    nextset = getattr(cursor, "nextset", None)
+    if nextset is None:
+        cursor.fetchall()
+        return
+    while nextset():
+        pass
+
+
+def _close_quietly(cursor: Any) -> None:
+    try:
+        cursor.close()
+    except Exception:  # noqa: BLE001
+        logger.debug("DB cursor close failed", exc_info=True)
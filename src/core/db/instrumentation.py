@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+import logging
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from src.core.metrics.latency import percentile
+
+
+logger = logging.getLogger(__name__)
+try:
+    import allure
+    from allure_commons.types import AttachmentType
+
+    _ALLURE_AVAILABLE = True
+except Exception:  # noqa: BLE001
+    allure = None
+    AttachmentType = None
+    _ALLURE_AVAILABLE = False
+
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRINGS = re.compile(r"N?'(?:[^']|'')*'")
+_NUMBERS = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_IN_LISTS = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.I)
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql: str) -> str:
+    """Normalize SQL so statements differing only in literals or IN-list length aggregate together."""
+    text = _COMMENTS.sub(" ", sql)
+    text = _STRINGS.sub("?", text)
+    text = _NUMBERS.sub("?", text)
+    text = _IN_LISTS.sub("IN (...)", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+@dataclass(slots=True)
+class StatementStats:
+    fingerprint: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    rows: int = 0
+    samples: deque = field(default_factory=lambda: deque(maxlen=2048))
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    @property
+    def p95_ms(self) -> float:
+        return percentile(sorted(self.samples), 95) if self.samples else 0.0
+
+
+class QueryStats:
+    """Thread-safe per-fingerprint query timings with a slow-query log."""
+
+    def __init__(self, *, slow_threshold_ms: float | None = 500.0, top_n: int = 10) -> None:
+        self._lock = threading.RLock()
+        self._stats: dict[str, StatementStats] = {}
+        self.slow_threshold_ms = slow_threshold_ms
+        self.top_n = top_n
+
+    def record(self, sql: str, elapsed_ms: float, rows: int = 0) -> None:
+        key = fingerprint(sql)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = StatementStats(fingerprint=key)
+                self._stats[key] = stats
+            stats.count += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            stats.rows += max(rows, 0)
+            stats.samples.append(elapsed_ms)
+        if self.slow_threshold_ms is not None and elapsed_ms >= self.slow_threshold_ms:
+            self._report_slow(key, elapsed_ms, rows)
+
+    def top(self, n: int | None = None, *, by: str = "total_ms") -> list[StatementStats]:
+        with self._lock:
+            stats = list(self._stats.values())
+        return sorted(stats, key=lambda item: getattr(item, by), reverse=True)[: n or self.top_n]
+
+    def report(self, n: int | None = None) -> str:
+        lines = [f"Top {n or self.top_n} DB statements by total time"]
+        for stats in self.top(n):
+            lines.append(
+                f"  n={stats.count:<6} total={stats.total_ms:10.1f} mean={stats.mean_ms:8.1f} "
+                f"p95={stats.p95_ms:8.1f} max={stats.max_ms:8.1f} ms rows={stats.rows:<8} {stats.fingerprint}"
+            )
+        return "\n".join(lines)
+
+    def publish(self, n: int | None = None) -> None:
+        """Log the top-N summary and attach it to the Allure report when available."""
+        if not self._stats:
+            return
+        logger.info("%s", self.report(n))
+        if _ALLURE_AVAILABLE:
+            payload = [
+                {
+                    "fingerprint": stats.fingerprint,
+                    "count": stats.count,
+                    "total_ms": round(stats.total_ms, 3),
+                    "p95_ms": round(stats.p95_ms, 3),
+                    "max_ms": round(stats.max_ms, 3),
+                    "rows": stats.rows,
+                }
+                for stats in self.top(n)
+            ]
+            allure.attach(
+                json.dumps(payload, ensure_ascii=False, indent=2),
+                name="DB Query Summary",
+                attachment_type=AttachmentType.JSON,
+            )
+
+    def _report_slow(self, key: str, elapsed_ms: float, rows: int) -> None:
+        logger.warning("Slow DB query (%.1f ms >= %.1f ms, rows=%s): %s", elapsed_ms, self.slow_threshold_ms, rows, key)
+        if _ALLURE_AVAILABLE:
+            allure.attach(
+                json.dumps({"sql": key, "elapsed_ms": round(elapsed_ms, 3), "rows": rows}, ensure_ascii=False, indent=2),
+                name="Slow DB Query",
+                attachment_type=AttachmentType.JSON,
+            )
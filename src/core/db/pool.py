@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
+
+
+logger = logging.getLogger(__name__)
+
+
+class DbPoolError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class PoolMetrics:
+    created: int
+    closed: int
+    in_use: int
+    idle: int
+    checkouts: int
+    waits: int
+    wait_time_total_s: float
+    wait_time_max_s: float
+    health_check_failures: int
+
+    @property
+    def wait_time_avg_s(self) -> float:
+        return self.wait_time_total_s / self.checkouts if self.checkouts else 0.0
+
+
+class _PooledConnection:
+    __slots__ = ("conn", "created_at", "last_used")
+
+    def __init__(self, conn: Any) -> None:
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class ConnectionPool:
+    """Thread-safe pool of DB-API connections.
+
+    Connections are handed out LIFO so the warmest one is reused first. On checkout a
+    connection older than ``max_lifetime`` is replaced, and one idle for longer than
+    ``health_check_idle`` seconds is validated with ``health_check`` first. Idle
+    connections above ``min_size`` are evicted after ``idle_timeout`` seconds.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        *,
+        min_size: int = 1,
+        max_size: int = 1,
+        max_lifetime: float = 1800.0,
+        idle_timeout: float = 300.0,
+        checkout_timeout: float = 30.0,
+        health_check: Callable[[Any], bool] | None = None,
+        health_check_idle: float = 5.0,
+        on_close: Callable[[Any], None] | None = None,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        if not 0 <= min_size <= max_size:
+            raise ValueError("min_size must be between 0 and max_size")
+        self._connect = connect
+        self._min_size = min_size
+        self._max_size = max_size
+        self._max_lifetime = max_lifetime
+        self._idle_timeout = idle_timeout
+        self._checkout_timeout = checkout_timeout
+        self._health_check = health_check
+        self._health_check_idle = health_check_idle
+        self._on_close = on_close
+
+        self._cond = threading.Condition()
+        self._idle: deque[_PooledConnection] = deque()
+        self._in_use: dict[int, _PooledConnection] = {}
+        self._pending = 0
+        self._closed = False
+
+        self._created = 0
+        self._closed_count = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._health_failures = 0
+
+        for _ in range(min_size):
+            self._idle.append(self._open())
+
+    @property
+    def size(self) -> int:
+        with self._cond:
+            return len(self._idle) + len(self._in_use) + self._pending
+
+    @contextmanager
+    def connection(self, timeout: float | None = None) -> Iterator[Any]:
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def acquire(self, timeout: float | None = None) -> Any:
+        wait_limit = self._checkout_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + wait_limit
+        waited = False
+        pooled: _PooledConnection | None = None
+        evicted: list[_PooledConnection] = []
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise DbPoolError("Connection pool is closed")
+                evicted.extend(self._evict_idle())
+                if self._idle or len(self._in_use) + self._pending < self._max_size:
+                    # reserve a slot; it is released on failure or converted to in-use below
+                    self._pending += 1
+                    pooled = self._idle.pop() if self._idle else None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise DbPoolError(f"Timed out after {wait_limit}s waiting for a DB connection")
+                waited = True
+                self._cond.wait(remaining)
+        for stale in evicted:
+            self._close_conn(stale)
+
+        # validation and connect run outside the lock while the slot stays reserved
+        try:
+            while pooled is not None and not self._usable(pooled):
+                self._close_conn(pooled)
+                with self._cond:
+                    pooled = self._idle.pop() if self._idle else None
+            if pooled is None:
+                pooled = self._open()
+        except BaseException:
+            with self._cond:
+                self._pending -= 1
+                self._cond.notify()
+            raise
+
+        elapsed = time.monotonic() - started
+        with self._cond:
+            self._pending -= 1
+            self._in_use[id(pooled.conn)] = pooled
+            self._checkouts += 1
+            self._waits += int(waited)
+            self._wait_total += elapsed
+            self._wait_max = max(self._wait_max, elapsed)
+        return pooled.conn
+
+    def release(self, conn: Any, *, discard: bool = False) -> None:
+        with self._cond:
+            pooled = self._in_use.pop(id(conn), None)
+            if pooled is None:
+                raise DbPoolError("Connection does not belong to this pool")
+            pooled.last_used = time.monotonic()
+            if discard or self._closed or self._expired(pooled):
+                to_close: _PooledConnection | None = pooled
+            else:
+                self._idle.append(pooled)
+                to_close = None
+            self._cond.notify()
+        if to_close is not None:
+            self._close_conn(to_close)
+
+    def metrics(self) -> PoolMetrics:
+        with self._cond:
+            return PoolMetrics(
+                created=self._created,
+                closed=self._closed_count,
+                in_use=len(self._in_use),
+                idle=len(self._idle),
+                checkouts=self._checkouts,
+                waits=self._waits,
+                wait_time_total_s=self._wait_total,
+                wait_time_max_s=self._wait_max,
+                health_check_failures=self._health_failures,
+            )
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for pooled in idle:
+            self._close_conn(pooled)
+
+    # ---------- internals ----------
+    def _open(self) -> _PooledConnection:
+        conn = self._connect()
+        with self._cond:
+            self._created += 1
+        return _PooledConnection(conn)
+
+    def _close_conn(self, pooled: _PooledConnection) -> None:
+        if self._on_close is not None:
+            try:
+                self._on_close(pooled.conn)
+            except Exception:  # noqa: BLE001
+                logger.debug("DB connection close hook failed", exc_info=True)
+        try:
+            pooled.conn.close()
+        except Exception:  # noqa: BLE001
+            logger.debug("Failed to close pooled DB connection", exc_info=True)
+        with self._cond:
+            self._closed_count += 1
+
+    def _usable(self, pooled: _PooledConnection) -> bool:
+        if self._expired(pooled):
+            return False
+        if self._health_check is None or time.monotonic() - pooled.last_used < self._health_check_idle:
+            return True
+        try:
+            healthy = bool(self._health_check(pooled.conn))
+        except Exception:  # noqa: BLE001
+            logger.debug("DB connection health check failed", exc_info=True)
+            healthy = False
+        if not healthy:
+            with self._cond:
+                self._health_failures += 1
+        return healthy
+
+    def _expired(self, pooled: _PooledConnection) -> bool:
+        return self._max_lifetime > 0 and time.monotonic() - pooled.created_at >= self._max_lifetime
+
+    def _evict_idle(self) -> list[_PooledConnection]:
+        """Drop connections idle past ``idle_timeout`` while keeping ``min_size``; caller holds the lock."""
+        if self._idle_timeout <= 0:
+            return []
+        now = time.monotonic()
+        total = len(self._idle) + len(self._in_use) + self._pending
+        keep: deque[_PooledConnection] = deque()
+        evicted: list[_PooledConnection] = []
+        for pooled in self._idle:
+            if total > self._min_size and now - pooled.last_used >= self._idle_timeout:
+                evicted.append(pooled)
+                total -= 1
+            else:
+                keep.append(pooled)
+        self._idle = keep
+        return evicted
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping
+
+from .waits import validate_identifier
+
+
+@dataclass(frozen=True, slots=True)
+class QueryTemplate:
+    """Named, parameterized statement whose SQL is built (and validated) exactly once."""
+
+    name: str
+    sql: str
+    params: tuple[str, ...]
+
+    def bind(self, values: Mapping[str, Any]) -> list[Any]:
+        """Order ``values`` by the template's placeholders."""
+        try:
+            return [values[param] for param in self.params]
+        except KeyError as exc:
+            raise ValueError(f"Query '{self.name}' is missing parameter {exc.args[0]!r}") from None
+
+
+class QueryRegistry:
+    """Thread-safe cache of ``QueryTemplate`` objects.
+
+    ``select`` returns the same template instance for the same definition, so hot lookups skip
+    SQL construction and hand the driver byte-identical SQL it can keep prepared.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._by_definition: dict[tuple[Any, ...], QueryTemplate] = {}
+        self._by_name: dict[str, QueryTemplate] = {}
+
+    def select(
+        self,
+        name: str,
+        *,
+        table: str,
+        columns: Iterable[str],
+        where: Iterable[str],
+        order_by: Iterable[str] = (),
+    ) -> QueryTemplate:
+        """``SELECT <columns> FROM <table> WHERE <c1> = ? AND ...``; placeholders are named after the where columns."""
+        key = ("select", name, table, tuple(columns), tuple(where), tuple(order_by))
+        template = self._by_definition.get(key)
+        if template is not None:
+            return template
+        _, _, table, columns, where, order_by = key
+        if not columns:
+            raise ValueError(f"Query '{name}' needs an explicit column projection")
+        if not where:
+            raise ValueError(f"Query '{name}' needs at least one where column")
+        sql = (
+            f"SELECT {', '.join(validate_identifier(col) for col in columns)} FROM {validate_identifier(table)} "
+            f"WHERE {' AND '.join(f'{validate_identifier(col)} = ?' for col in where)}"
+        )
+        if order_by:
+            sql += f" ORDER BY {', '.join(validate_identifier(col) for col in order_by)}"
+        template = QueryTemplate(name=name, sql=sql, params=where)
+        with self._lock:
+            template = self._by_definition.setdefault(key, template)
+            self._by_name[name] = template
+        return template
+
+    def get(self, name: str) -> QueryTemplate:
+        with self._lock:
+            try:
+                return self._by_name[name]
+            except KeyError:
+                raise KeyError(f"Unknown query template '{name}'") from None
+
+    def names(self) -> list[str]:
+        with self._lock:
+            return sorted(self._by_name)
+
+
+QUERIES = QueryRegistry()
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Mapping
+from contextlib import AbstractContextManager, nullcontext
+from typing import Any, Callable, Iterator, Sequence
+
+
+class ColumnIndex:
+    """Column name -> position lookup shared by every row of a result set."""
+
+    __slots__ = ("names", "_positions")
+
+    def __init__(self, names: Sequence[str]) -> None:
+        self.names: tuple[str, ...] = tuple(names)
+        self._positions = {name: pos for pos, name in enumerate(self.names)}
+
+    def position(self, name: str) -> int:
+        try:
+            return self._positions[name]
+        except KeyError:
+            raise KeyError(f"Unknown column '{name}'. Available: {list(self.names)}") from None
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._positions
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+
+class Row(Mapping):
+    """Read-only row over a value tuple; column names live once in the shared ``ColumnIndex``."""
+
+    __slots__ = ("_index", "_values")
+
+    def __init__(self, index: ColumnIndex, values: Sequence[Any]) -> None:
+        self._index = index
+        self._values = tuple(values)
+
+    def __getitem__(self, key: str | int) -> Any:
+        if isinstance(key, int):
+            return self._values[key]
+        return self._values[self._index.position(key)]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index.names)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def values_tuple(self) -> tuple[Any, ...]:
+        return self._values
+
+    def as_dict(self) -> dict[str, Any]:
+        return dict(zip(self._index.names, self._values))
+
+    def __repr__(self) -> str:
+        return f"Row({self.as_dict()!r})"
+
+
+ROW_FORMATS = ("row", "tuple", "dict")
+
+
+class RowStream:
+    """Iterator over a result set fetched in ``batch_size`` chunks via ``fetchmany``.
+
+    The stream owns a checked-out connection until it is exhausted or closed, so use it as a
+    context manager (or iterate it fully) to hand the connection back to the pool promptly.
+    ``lock``, when given, is held around each ``fetchmany`` and the final cursor close only.
+    """
+
+    def __init__(
+        self,
+        cursor: Any,
+        *,
+        batch_size: int,
+        row_format: str,
+        on_close: Callable[["RowStream"], None],
+        lock: AbstractContextManager[Any] | None = None,
+    ) -> None:
+        if row_format not in ROW_FORMATS:
+            raise ValueError(f"Unsupported row_format '{row_format}', must be one of {ROW_FORMATS}")
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        self._cursor = cursor
+        self._batch_size = batch_size
+        self._row_format = row_format
+        self._on_close = on_close
+        self._lock = lock if lock is not None else nullcontext()
+        self._closed = False
+        self.rows_read = 0
+        self.fetch_seconds = 0.0
+        self.columns = ColumnIndex([col[0] for col in cursor.description] if cursor.description else [])
+
+    def __iter__(self) -> Iterator[Any]:
+        try:
+            while not self._closed:
+                started = time.perf_counter()
+                with self._lock:
+                    batch = self._cursor.fetchmany(self._batch_size)
+                self.fetch_seconds += time.perf_counter() - started
+                if not batch:
+                    break
+                self.rows_read += len(batch)
+                yield from self._convert(batch)
+        finally:
+            self.close()
+
+    def _convert(self, batch: Sequence[Sequence[Any]]) -> Iterator[Any]:
+        if self._row_format == "tuple":
+            return (tuple(values) for values in batch)
+        if self._row_format == "dict":
+            names = self.columns.names
+            return (dict(zip(names, values)) for values in batch)
+        index = self.columns
+        return (Row(index, values) for values in batch)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            with self._lock:
+                self._cursor.close()
+        finally:
+            self._on_close(self)
+
+    def __enter__(self) -> "RowStream":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        if not getattr(self, "_closed", True):
+            self.close()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import csv
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Mapping
+
+if TYPE_CHECKING:
+    from .db_client import DbClient
+
+
+logger = logging.getLogger(__name__)
+
+
+def load_seed_rows(path: str | Path) -> Iterator[dict[str, Any]]:
+    """Stream seed rows from a ``.csv`` (header row required) or ``.jsonl`` file."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        with path.open("r", encoding="utf-8", newline="") as fh:
+            yield from csv.DictReader(fh)
+        return
+    if suffix in {".jsonl", ".ndjson"}:
+        with path.open("r", encoding="utf-8") as fh:
+            for line_no, line in enumerate(fh, start=1):
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                if not isinstance(row, Mapping):
+                    raise ValueError(f"{path}:{line_no} is not a JSON object")
+                yield dict(row)
+        return
+    raise ValueError(f"Unsupported seed file type '{suffix}' (expected .csv or .jsonl)")
+
+
+class SeedLedger:
+    """Scenario-scoped record of seeded keys, deleted set-wise on teardown.
+
+    Tables are cleaned in reverse seeding order so children seeded after their parents are
+    removed first.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._keys: dict[tuple[str, str], list[Any]] = {}
+
+    def record(self, table: str, key_column: str, keys: Iterable[Any]) -> None:
+        with self._lock:
+            self._keys.setdefault((table, key_column), []).extend(keys)
+
+    def seed(
+        self,
+        client: "DbClient",
+        table: str,
+        key_column: str,
+        rows: Iterable[Mapping[str, Any]],
+        *,
+        chunk_size: int = 1000,
+    ) -> int:
+        """Bulk insert ``rows`` into ``table`` and remember their ``key_column`` values."""
+
+        def _tracked() -> Iterator[Mapping[str, Any]]:
+            for row in rows:
+                if key_column not in row:
+                    raise ValueError(f"Seed row for {table} is missing key column '{key_column}'")
+                self.record(table, key_column, [row[key_column]])
+                yield row
+
+        return client.bulk_insert(table, _tracked(), chunk_size=chunk_size)
+
+    def pending(self) -> dict[tuple[str, str], int]:
+        with self._lock:
+            return {target: len(keys) for target, keys in self._keys.items()}
+
+    def clear(self) -> None:
+        """Forget recorded keys without deleting them (e.g. when a transaction rollback removes them)."""
+        with self._lock:
+            self._keys = {}
+
+    def cleanup(self, client: "DbClient") -> int:
+        with self._lock:
+            targets = list(self._keys.items())
+            self._keys = {}
+        deleted = 0
+        for (table, key_column), keys in reversed(targets):
+            try:
+                deleted += client.delete_keys(table, key_column, keys)
+            except Exception:  # noqa: BLE001
+                logger.warning("Failed to clean up %s seeded rows from %s", len(keys), table, exc_info=True)
+        return deleted
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Sequence
+
+from .backends import DbBackendUnsupported
+from .db_client import DbClient, DbClientError
+from .waits import validate_identifier
+
+
+def _row_digest(values: Sequence[Any]) -> bytes:
+    return hashlib.blake2b(repr(tuple(values)).encode("utf-8"), digest_size=8).digest()
+
+
+@dataclass(slots=True)
+class SnapshotChunk:
+    """Primary-key range ``[lower, upper)`` (``None`` = unbounded) with its server-side checksum."""
+
+    lower: Any
+    upper: Any
+    count: int = 0
+    checksum: Any = None
+    rows: dict[Any, bytes] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class TableSnapshot:
+    table: str
+    key_column: str
+    columns: tuple[str, ...]
+    where: str | None
+    params: tuple[Any, ...]
+    chunks: list[SnapshotChunk]
+
+    @property
+    def row_count(self) -> int:
+        return sum(chunk.count for chunk in self.chunks)
+
+
+@dataclass(frozen=True, slots=True)
+class TableDiff:
+    table: str
+    added: tuple[Any, ...]
+    removed: tuple[Any, ...]
+    changed: tuple[Any, ...]
+    chunks_total: int
+    chunks_changed: int
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+    def unexpected(
+        self,
+        *,
+        added: Iterable[Any] = (),
+        removed: Iterable[Any] = (),
+        changed: Iterable[Any] = (),
+    ) -> list[str]:
+        """Describe every deviation from the expected key sets (keys compared as strings)."""
+        problems = []
+        for kind, actual, expected in (
+            ("added", self.added, added),
+            ("removed", self.removed, removed),
+            ("changed", self.changed, changed),
+        ):
+            actual_keys = {str(key) for key in actual}
+            expected_keys = {str(key) for key in expected}
+            if actual_keys - expected_keys:
+                problems.append(f"unexpected {kind} rows: {sorted(actual_keys - expected_keys)[:20]}")
+            if expected_keys - actual_keys:
+                problems.append(f"expected {kind} rows missing: {sorted(expected_keys - actual_keys)[:20]}")
+        return problems
+
+    def summary(self) -> str:
+        return (
+            f"{self.table}: added={list(self.added)[:20]} removed={list(self.removed)[:20]} "
+            f"changed={list(self.changed)[:20]} ({self.chunks_changed}/{self.chunks_total} chunks changed)"
+        )
+
+
+def snapshot_table(
+    client: "DbClient",
+    table: str,
+    key_column: str,
+    *,
+    columns: Sequence[str] | None = None,
+    where: str | None = None,
+    params: Iterable[Any] = (),
+    chunk_size: int = 1000,
+) -> TableSnapshot:
+    """Snapshot ``table`` (optionally the slice matching ``where``) as primary-key ordered chunks.
+
+    Rows are streamed once to record compact 8-byte row digests and the chunk boundaries; each
+    chunk's row count and checksum are then computed by the database, so ``diff_table`` only
+    needs one aggregate query per chunk and fetches rows solely for chunks that changed.
+    ``where`` is an SQL fragment with ``?`` placeholders bound from ``params``.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+    validate_identifier(table)
+    validate_identifier(key_column)
+    projection = ", ".join(validate_identifier(col) for col in columns) if columns else "*"
+    params = tuple(params)
+    query = f"SELECT {projection} FROM {table}{_where_sql([where] if where else [])} ORDER BY {key_column}"
+
+    chunks: list[SnapshotChunk] = []
+    with client.iter_rows(query, params, batch_size=chunk_size, row_format="tuple") as stream:
+        names = stream.columns.names
+        key_pos = stream.columns.position(key_column)
+        current: SnapshotChunk | None = None
+        for values in stream:
+            if current is None or len(current.rows) >= chunk_size:
+                # the first chunk is open below so rows inserted ahead of the smallest key are seen
+                current = SnapshotChunk(lower=values[key_pos] if chunks else None, upper=None)
+                if chunks:
+                    chunks[-1].upper = current.lower
+                chunks.append(current)
+            current.rows[values[key_pos]] = _row_digest(values)
+    if not chunks:
+        chunks.append(SnapshotChunk(lower=None, upper=None))
+
+    snapshot = TableSnapshot(
+        table=table,
+        key_column=key_column,
+        columns=tuple(names),
+        where=where,
+        params=params,
+        chunks=chunks,
+    )
+    for chunk in chunks:
+        chunk.count, chunk.checksum = _chunk_checksum(client, snapshot, chunk)
+    return snapshot
+
+
+def diff_table(client: "DbClient", snapshot: TableSnapshot) -> TableDiff:
+    """Compare the table with ``snapshot``, drilling into rows only where a chunk checksum moved."""
+    added: list[Any] = []
+    removed: list[Any] = []
+    changed: list[Any] = []
+    chunks_changed = 0
+    key_pos = snapshot.columns.index(snapshot.key_column)
+    projection = ", ".join(snapshot.columns)
+    for chunk in snapshot.chunks:
+        if _chunk_checksum(client, snapshot, chunk) == (chunk.count, chunk.checksum):
+            continue
+        chunks_changed += 1
+        where, params = _range_filter(snapshot, chunk)
+        query = f"SELECT {projection} FROM {snapshot.table}{where} ORDER BY {snapshot.key_column}"
+        seen = set()
+        with client.iter_rows(query, params, row_format="tuple") as stream:
+            for values in stream:
+                key = values[key_pos]
+                seen.add(key)
+                before = chunk.rows.get(key)
+                if before is None:
+                    added.append(key)
+                elif before != _row_digest(values):
+                    changed.append(key)
+        removed.extend(key for key in chunk.rows if key not in seen)
+    return TableDiff(
+        table=snapshot.table,
+        added=tuple(added),
+        removed=tuple(removed),
+        changed=tuple(changed),
+        chunks_total=len(snapshot.chunks),
+        chunks_changed=chunks_changed,
+    )
+
+
+def _chunk_checksum(client: "DbClient", snapshot: TableSnapshot, chunk: SnapshotChunk) -> tuple[int, Any]:
+    where, params = _range_filter(snapshot, chunk)
+    try:
+        checksum = client.backend.checksum_sql(snapshot.columns)
+    except DbBackendUnsupported as exc:
+        raise DbClientError(f"Table snapshot of {snapshot.table} failed: {exc}") from exc
+    row = client.select_one(f"SELECT COUNT(*) AS n, {checksum} AS checksum FROM {snapshot.table}{where}", params)
+    return (int(row["n"]), row["checksum"]) if row else (0, None)
+
+
+def _range_filter(snapshot: TableSnapshot, chunk: SnapshotChunk) -> tuple[str, list[Any]]:
+    clauses = [snapshot.where] if snapshot.where else []
+    params = list(snapshot.params)
+    if chunk.lower is not None:
+        clauses.append(f"{snapshot.key_column} >= ?")
+        params.append(chunk.lower)
+    if chunk.upper is not None:
+        clauses.append(f"{snapshot.key_column} < ?")
+        params.append(chunk.upper)
+    return _where_sql(clauses), params
+
+
+def _where_sql(clauses: list[str]) -> str:
+    return f" WHERE {' AND '.join(f'({clause})' for clause in clauses)}" if clauses else ""
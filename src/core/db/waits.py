@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import random
+import re
+from typing import Iterator
+
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*$")
+
+# Keep IN lists well below driver parameter limits (SQL Server caps a statement at 2100).
+IN_CHUNK_SIZE = 1000
+
+
+def backoff_delays(
+    *,
+    initial: float = 0.05,
+    maximum: float = 1.0,
+    factor: float = 2.0,
+    jitter: float = 0.2,
+) -> Iterator[float]:
+    """Yield exponentially growing poll delays capped at ``maximum``, each with +/- ``jitter`` spread."""
+    delay = initial
+    while True:
+        spread = delay * jitter
+        yield max(delay + random.uniform(-spread, spread), 0.0)
+        delay = min(delay * factor, maximum)
+
+
+def validate_identifier(name: str) -> str:
+    """Allow plain or dotted (schema.table) identifiers only, since they are interpolated into SQL."""
+    if not isinstance(name, str) or not _IDENTIFIER.match(name):
+        raise ValueError(f"Invalid SQL identifier: {name!r}")
+    return name
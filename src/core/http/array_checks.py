@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+import math
+from array import array
+from collections import Counter
+from typing import Any, Iterable, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # optional: checks fall back to compact ``array('d')`` columns and plain loops
+    np = None
+
+
+AGGREGATES = ("count", "sum", "min", "max", "mean")
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def numeric_column(values: Sequence[Any]) -> Any:
+    """``values`` as a float64 column (NumPy array when available, else ``array('d')``)."""
+    for position, value in enumerate(values):
+        if not _is_number(value):
+            raise TypeError(f"element {position} is not a number: {value!r}")
+    if np is not None:
+        return np.asarray(values, dtype=np.float64)
+    return array("d", values)
+
+
+def _token(value: Any) -> str:
+    """Strings as-is, everything else as compact JSON (``true``, ``5``, ``null``)."""
+    kind = type(value)
+    if kind is str:
+        return value
+    if kind is int or kind is float:
+        return repr(value)
+    return json.dumps(value, separators=(",", ":"), sort_keys=True)
+
+
+def outside(values: Sequence[Any], allowed: Iterable[str]) -> list[tuple[int, Any]]:
+    """``(index, value)`` of every element not in ``allowed``.
+
+    All-numeric values against all-numeric options compare as floats (``5`` matches ``"5.0"``),
+    with or without NumPy; anything else compares by token.
+    """
+    allowed = set(allowed)
+    if values and all(map(_is_number, values)):
+        try:
+            options = {float(option) for option in allowed}
+        except ValueError:
+            options = None
+        if options is not None:
+            if np is not None:
+                column = numeric_column(values)
+                missing = ~np.isin(column, np.fromiter(options, dtype=np.float64, count=len(options)))
+                return [(int(index), values[index]) for index in np.flatnonzero(missing)]
+            return [(index, value) for index, value in enumerate(values) if float(value) not in options]
+    return [(index, value) for index, value in enumerate(values) if _token(value) not in allowed]
+
+
+def duplicates(values: Sequence[Any]) -> list[Any]:
+    """Values that occur more than once, each reported once."""
+    if values and all(map(_is_number, values)):
+        if np is not None:
+            unique, counts = np.unique(np.asarray(values), return_counts=True)
+            return unique[counts > 1].tolist()
+        return [value for value, count in Counter(values).items() if count > 1]
+    counts = Counter(_token(value) for value in values)
+    seen: set[str] = set()
+    repeated = []
+    for value in values:
+        token = _token(value)
+        if counts[token] > 1 and token not in seen:
+            seen.add(token)
+            repeated.append(value)
+    return repeated
+
+
+def aggregate(values: Sequence[Any], name: str) -> float:
+    if name not in AGGREGATES:
+        raise ValueError(f"Unknown aggregate '{name}' (expected one of {', '.join(AGGREGATES)})")
+    if name == "count":
+        return float(len(values))
+    if not values:
+        raise ValueError(f"Cannot compute {name} of an empty array")
+    column = numeric_column(values)
+    if np is not None:
+        return float(getattr(np, name)(column))
+    if name == "sum":
+        return math.fsum(column)
+    if name == "mean":
+        return math.fsum(column) / len(column)
+    return float(min(column) if name == "min" else max(column))
+
+
+def first_unsorted(values: Sequence[Any], *, descending: bool = False) -> int | None:
+    """Index of the first element out of order (compared with its predecessor), or ``None``."""
+    if len(values) < 2:
+        return None
+    if np is not None and (all(map(_is_number, values)) or all(isinstance(value, str) for value in values)):
+        column = numeric_column(values) if _is_number(values[0]) else np.asarray(values)
+        broken = column[1:] > column[:-1] if descending else column[1:] < column[:-1]
+        positions = np.flatnonzero(broken)
+        return int(positions[0]) + 1 if positions.size else None
+    for position in range(1, len(values)):
+        previous, current = values[position - 1], values[position]
+        if (current > previous) if descending else (current < previous):
+            return position
+    return None
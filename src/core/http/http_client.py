@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import json
 import logging
+import time
+import uuid
 from dataclasses import dataclass
 from typing import Any, Mapping
 from urllib.parse import urljoin
@@ -13,6 +15,7 @@ from ..security.token_manager import TokenManager
 
 
 logger = logging.getLogger(__name__)
+DEFAULT_CORRELATION_HEADER = "X-Correlation-ID"
 try:
     import allure
     from allure_commons.types import AttachmentType
@@ -37,6 +40,9 @@ class HttpResponse:
     text: str
     json: Any | None
     raw: requests.Response
+    correlation_id: str | None = None
+    sent_at: float | None = None
+    received_at: float | None = None
 
 
 class HttpClient:
@@ -46,6 +52,7 @@ class HttpClient:
         token_manager: TokenManager | None = None,
         timeout: float = 10.0,
         validate_schema: bool = False,
+        correlation_header: str | None = None,
     ) -> None:
         if not base_url:
             raise ValueError("base_url is required")
@@ -54,6 +61,11 @@ class HttpClient:
         self._timeout = timeout
         self._token_manager = token_manager or TokenManager()
         self._validate_schema = validate_schema
+        self._correlation_header = correlation_header
+
+    @property
+    def correlation_header(self) -> str | None:
+        return self._correlation_header
 
     def request(
         self,
@@ -68,11 +80,13 @@ class HttpClient:
         timeout: float | None = None,
         schema: Any | None = None,
         validate_schema: bool | None = None,
+        correlation_id: str | None = None,
     ) -> HttpResponse:
         url = urljoin(self._base_url, path.lstrip("/"))
         req_headers = {"Accept": "application/json"}
         if headers:
             req_headers.update(headers)
+        correlation_id = self._stamp_correlation_id(req_headers, correlation_id)
         if service:
             token = self._token_manager.get_token(service)
             if token:
@@ -90,6 +104,7 @@ class HttpClient:
                 json_body=json_body,
             )
 
+        sent_at = time.time()
         try:
             response = self._session.request(
                 method=method.upper(),
@@ -106,6 +121,7 @@ class HttpClient:
         except requests.RequestException as exc:
             logger.exception("HTTP request failed", extra={"url": url})
             raise HttpClientError(f"HTTP request failed for {url}: {exc}") from exc
+        received_at = time.time()
 
         response_json: Any | None = None
         content_type = response.headers.get("Content-Type", "")
@@ -138,11 +154,23 @@ class HttpClient:
             text=response.text,
             json=response_json,
             raw=response,
+            correlation_id=correlation_id,
+            sent_at=sent_at,
+            received_at=received_at,
         )
         if _ALLURE_AVAILABLE:
             self._attach_response(http_response)
         return http_response
 
+    def _stamp_correlation_id(self, headers: dict[str, str], correlation_id: str | None) -> str | None:
+        if correlation_id is None and self._correlation_header is None:
+            return None
+        header = self._correlation_header or DEFAULT_CORRELATION_HEADER
+        if correlation_id is None:
+            correlation_id = headers.get(header) or uuid.uuid4().hex
+        headers[header] = correlation_id
+        return correlation_id
+
     @staticmethod
     def _attach_request(
         *,
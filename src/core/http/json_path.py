@@ -0,0 +1,370 @@
+from __future__ import annotations
+
+import json
+import operator
+import re
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Iterator
+
+
+class JsonPathError(ValueError):
+    """Raised for malformed path expressions."""
+
+
+_NAME = re.compile(r"[^.\[\]]+")
+_FILTER = re.compile(r"^\s*(?:@\.?)?(?P<path>[^=!<>\s]+)\s*(?:(?P<op>==|!=|<=|>=|<|>)\s*(?P<value>.+?))?\s*$", re.S)
+_OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def _is_array(node: Any) -> bool:
+    return isinstance(node, Sequence) and not isinstance(node, (str, bytes, Mapping))
+
+
+def _children(node: Any) -> Iterable[Any]:
+    if isinstance(node, Mapping):
+        return node.values()
+    if _is_array(node):
+        return node
+    return ()
+
+
+def _child_items(node: Any) -> Iterable[tuple[Any, Any]]:
+    if isinstance(node, Mapping):
+        return node.items()
+    if _is_array(node):
+        return enumerate(node)
+    return ()
+
+
+def _descendants(node: Any) -> Iterator[Any]:
+    """``node`` and everything below it, in document order."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        yield current
+        children = list(_children(current))
+        children.reverse()
+        stack.extend(children)
+
+
+def _located_descendants(node: Any) -> Iterator[tuple[tuple[Any, ...], Any]]:
+    stack = [((), node)]
+    while stack:
+        location, current = stack.pop()
+        yield location, current
+        children = [(location + (key,), child) for key, child in _child_items(current)]
+        children.reverse()
+        stack.extend(children)
+
+
+@dataclass(frozen=True, slots=True)
+class _Key:
+    name: str
+
+    def select(self, node: Any) -> Iterable[Any]:
+        if isinstance(node, Mapping) and self.name in node:
+            return (node[self.name],)
+        return ()
+
+    def locate(self, node: Any) -> Iterable[tuple[tuple[Any, ...], Any]]:
+        if isinstance(node, Mapping) and self.name in node:
+            return (((self.name,), node[self.name]),)
+        return ()
+
+
+@dataclass(frozen=True, slots=True)
+class _Index:
+    index: int
+
+    def select(self, node: Any) -> Iterable[Any]:
+        if _is_array(node) and -len(node) <= self.index < len(node):
+            return (node[self.index],)
+        return ()
+
+    def locate(self, node: Any) -> Iterable[tuple[tuple[Any, ...], Any]]:
+        if _is_array(node) and -len(node) <= self.index < len(node):
+            return (((self.index % len(node),), node[self.index]),)
+        return ()
+
+
+@dataclass(frozen=True, slots=True)
+class _Wildcard:
+    def select(self, node: Any) -> Iterable[Any]:
+        return _children(node)
+
+    def locate(self, node: Any) -> Iterable[tuple[tuple[Any, ...], Any]]:
+        return [((key,), child) for key, child in _child_items(node)]
+
+
+@dataclass(frozen=True, slots=True)
+class _Slice:
+    start: int | None
+    stop: int | None
+    step: int | None
+
+    def select(self, node: Any) -> Iterable[Any]:
+        return node[self.start : self.stop : self.step] if _is_array(node) else ()
+
+    def locate(self, node: Any) -> Iterable[tuple[tuple[Any, ...], Any]]:
+        if not _is_array(node):
+            return ()
+        return [((index,), node[index]) for index in range(*slice(self.start, self.stop, self.step).indices(len(node)))]
+
+
+@dataclass(frozen=True, slots=True)
+class _Descend:
+    segment: Any
+
+    def select(self, node: Any) -> Iterable[Any]:
+        return [match for current in _descendants(node) for match in self.segment.select(current)]
+
+    def locate(self, node: Any) -> Iterable[tuple[tuple[Any, ...], Any]]:
+        return [
+            (location + relative, match)
+            for location, current in _located_descendants(node)
+            for relative, match in self.segment.locate(current)
+        ]
+
+
+@dataclass(frozen=True, slots=True)
+class _Filter:
+    path: "JsonPath"
+    compare: Callable[[Any, Any], bool] | None
+    value: Any
+
+    def select(self, node: Any) -> Iterable[Any]:
+        return [child for child in _children(node) if self._matches(child)]
+
+    def locate(self, node: Any) -> Iterable[tuple[tuple[Any, ...], Any]]:
+        return [((key,), child) for key, child in _child_items(node) if self._matches(child)]
+
+    def _matches(self, item: Any) -> bool:
+        actual, found = self.path.resolve(item)
+        if self.compare is None:
+            return found
+        if not found:
+            return False
+        try:
+            return bool(self.compare(actual, self.value))
+        except TypeError:
+            return False
+
+
+@dataclass(frozen=True, slots=True)
+class JsonPath:
+    """Parsed path expression; build through ``compile_path`` so parsing happens once per expression.
+
+    ``definite`` paths (keys and indexes only) address at most one value; the others
+    (wildcards, slices, ``..`` recursive descent, ``[?...]`` filters) collect a list.
+    """
+
+    expression: str
+    segments: tuple[Any, ...]
+    definite: bool
+
+    def find(self, document: Any) -> list[Any]:
+        """Every matching value, in document order."""
+        nodes = [document]
+        for segment in self.segments:
+            nodes = [match for node in nodes for match in segment.select(node)]
+            if not nodes:
+                break
+        return nodes
+
+    def locate(self, document: Any) -> list[tuple[tuple[Any, ...], Any]]:
+        """``(location, value)`` for every match; a location is the tuple of keys/indexes from the root."""
+        nodes: list[tuple[tuple[Any, ...], Any]] = [((), document)]
+        for segment in self.segments:
+            nodes = [
+                (location + relative, match)
+                for location, node in nodes
+                for relative, match in segment.locate(node)
+            ]
+            if not nodes:
+                break
+        return nodes
+
+    def resolve(self, document: Any) -> tuple[Any, bool]:
+        """``(value, found)`` for definite paths; ``(matches, bool(matches))`` otherwise."""
+        if not self.definite:
+            matches = self.find(document)
+            return matches, bool(matches)
+        current = document
+        for segment in self.segments:
+            if isinstance(segment, _Key):
+                if not isinstance(current, Mapping) or segment.name not in current:
+                    return None, False
+                current = current[segment.name]
+            else:
+                if not _is_array(current) or not -len(current) <= segment.index < len(current):
+                    return None, False
+                current = current[segment.index]
+        return current, True
+
+
+@lru_cache(maxsize=1024)
+def compile_path(expression: str) -> JsonPath:
+    """Parse ``a.b[0]``, ``$.items[*].id``, ``items[1:3]``, ``$..id``, ``items[?status=="ACTIVE"]``."""
+    segments = _Parser(expression).parse()
+    definite = all(isinstance(segment, (_Key, _Index)) for segment in segments)
+    return JsonPath(expression=expression, segments=tuple(segments), definite=definite)
+
+
+def find(document: Any, expression: str) -> list[Any]:
+    return compile_path(expression).find(document)
+
+
+def resolve(document: Any, expression: str) -> tuple[Any, bool]:
+    return compile_path(expression).resolve(document)
+
+
+_TrieNode = tuple[dict[Any, "_TrieNode"], list[int]]
+
+
+def resolve_many(document: Any, expressions: Iterable[str]) -> list[tuple[Any, bool]]:
+    """``resolve`` for several expressions at once; definite paths sharing a prefix walk it only once."""
+    results: list[tuple[Any, bool]] = []
+    trie: _TrieNode = ({}, [])
+    for position, expression in enumerate(expressions):
+        path = compile_path(expression)
+        results.append((None, False))
+        if not path.definite:
+            results[position] = path.resolve(document)
+            continue
+        node = trie
+        for segment in path.segments:
+            node = node[0].setdefault(segment, ({}, []))
+        node[1].append(position)
+    _resolve_trie(trie, document, True, results)
+    return results
+
+
+def _resolve_trie(node: _TrieNode, current: Any, found: bool, results: list[tuple[Any, bool]]) -> None:
+    for position in node[1]:
+        results[position] = (current, True) if found else (None, False)
+    for segment, child in node[0].items():
+        matches = segment.select(current) if found else ()
+        if matches:
+            _resolve_trie(child, matches[0], True, results)
+        else:
+            _resolve_trie(child, None, False, results)
+
+
+class _Parser:
+    def __init__(self, expression: str) -> None:
+        self.text = expression
+        self.pos = 0
+
+    def parse(self) -> list[Any]:
+        text = self.text
+        if not text:
+            raise JsonPathError("Empty JSON path")
+        segments: list[Any] = []
+        bare_start = not text.startswith("$")
+        if not bare_start:
+            self.pos = 1
+        while self.pos < len(text):
+            if text.startswith("..", self.pos):
+                self.pos += 2
+                segment = self._bracket() if self._peek("[") else self._name()
+                segments.append(_Descend(segment))
+            elif self._peek("."):
+                self.pos += 1
+                segments.append(self._name())
+            elif self._peek("["):
+                segments.append(self._bracket())
+            elif bare_start and not segments:
+                segments.append(self._name())
+            else:
+                self._fail("unexpected character")
+        return segments
+
+    def _peek(self, token: str) -> bool:
+        return self.text.startswith(token, self.pos)
+
+    def _fail(self, reason: str) -> None:
+        raise JsonPathError(f"Invalid JSON path {self.text!r} at position {self.pos}: {reason}")
+
+    def _name(self) -> Any:
+        match = _NAME.match(self.text, self.pos)
+        if match is None:
+            self._fail("expected a field name")
+        self.pos = match.end()
+        return _Wildcard() if match.group(0) == "*" else _Key(match.group(0))
+
+    def _bracket(self) -> Any:
+        start = self.pos + 1
+        end = self._closing_bracket(start)
+        body = self.text[start:end].strip()
+        self.pos = end + 1
+        if body == "*":
+            return _Wildcard()
+        if body[:1] in ("'", '"'):
+            return _Key(self._literal(body))
+        if body.startswith("?"):
+            return self._filter(body[1:])
+        try:
+            if ":" in body:
+                parts = [int(part) if part.strip() else None for part in body.split(":")]
+                if len(parts) > 3 or parts[2:] == [0]:
+                    raise ValueError
+                return _Slice(*(parts + [None] * (3 - len(parts))))
+            return _Index(int(body))
+        except ValueError:
+            self.pos = start
+            self._fail(f"unsupported selector [{body}]")
+
+    def _closing_bracket(self, start: int) -> int:
+        quote = None
+        depth = 0
+        index = start
+        while index < len(self.text):
+            char = self.text[index]
+            if quote:
+                if char == "\\":
+                    index += 1
+                elif char == quote:
+                    quote = None
+            elif char in ("'", '"'):
+                quote = char
+            elif char == "[":
+                # filter bodies may index into the item: [?tags[0] == 'a']
+                depth += 1
+            elif char == "]":
+                if not depth:
+                    return index
+                depth -= 1
+            index += 1
+        self._fail("unclosed '['")
+
+    def _filter(self, body: str) -> _Filter:
+        body = body.strip()
+        if body.startswith("(") and body.endswith(")"):
+            body = body[1:-1]
+        match = _FILTER.match(body)
+        if match is None:
+            self._fail(f"unsupported filter [?{body}]")
+        path = compile_path(match.group("path"))
+        if not path.definite:
+            self._fail("filter paths must be plain keys and indexes")
+        if match.group("op") is None:
+            return _Filter(path=path, compare=None, value=None)
+        return _Filter(path=path, compare=_OPERATORS[match.group("op")], value=self._literal(match.group("value")))
+
+    def _literal(self, raw: str) -> Any:
+        raw = raw.strip()
+        if len(raw) >= 2 and raw[0] == raw[-1] == "'":
+            raw = json.dumps(raw[1:-1].replace("\\'", "'"))
+        try:
+            return json.loads(raw)
+        except ValueError:
+            self._fail(f"invalid literal {raw}")
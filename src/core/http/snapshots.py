@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Sequence
+
+from .json_path import compile_path
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_DIR = Path(__file__).resolve().parents[3] / "features" / "snapshots"
+MASK = "<volatile>"
+SUFFIX = ".snapshot"
+_FORMAT = 1
+_NAME = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+@dataclass(frozen=True, slots=True)
+class HashNode:
+    """Merkle node of a JSON container: ``digest`` covers it and everything below it.
+
+    ``children`` holds nodes for nested containers only (by key or index); scalar members are
+    folded into the parent digest and compared directly when the digests differ.
+    """
+
+    digest: bytes
+    children: Mapping[Any, "HashNode"]
+
+
+# parsed JSON only holds dicts and lists, and concrete type checks keep hashing off the ABC machinery
+_CONTAINERS = (dict, list)
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str).encode
+_canonical = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), sort_keys=True, default=str).encode
+
+
+def _is_container(value: Any) -> bool:
+    return isinstance(value, _CONTAINERS)
+
+
+def hash_tree(value: Any) -> HashNode:
+    """Merkle tree of a JSON value; object keys are hashed in sorted order, so key order does not matter.
+
+    Each container costs one serialization of its direct members (nested containers by digest),
+    so hashing stays a single C-level ``json.dumps`` + ``blake2b`` per container.
+    """
+    if isinstance(value, dict):
+        kind, members = b"o", sorted(((str(key), child) for key, child in value.items()), key=lambda item: item[0])
+    elif isinstance(value, list):
+        kind, members = b"a", list(enumerate(value))
+    else:
+        return HashNode(hashlib.blake2b(b"v" + _encode(value).encode("utf-8"), digest_size=16).digest(), {})
+    children: dict[Any, HashNode] = {}
+    parts = []
+    for key, child in members:
+        if isinstance(child, _CONTAINERS):
+            node = children[key] = hash_tree(child)
+            parts.append((key, "h", node.digest.hex()))
+        else:
+            parts.append((key, "v", child))
+    return HashNode(hashlib.blake2b(kind + _encode(parts).encode("utf-8"), digest_size=16).digest(), children)
+
+
+def content_digest(value: Any) -> str:
+    """Digest of the canonical (sorted-key, compact) JSON encoding: one C-level pass for the equality check."""
+    return hashlib.blake2b(_canonical(value).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def mask_volatile(body: Any, volatile_paths: Iterable[str]) -> Any:
+    """``body`` with every value matched by ``volatile_paths`` replaced by ``MASK``.
+
+    Only the containers on the way to a masked value are copied; ``body`` itself is not modified.
+    """
+    paths = [path for path in volatile_paths if path]
+    if not paths or not _is_container(body):
+        return body
+    root = _shallow_copy(body)
+    copies: dict[tuple[Any, ...], Any] = {(): root}
+
+    def writable(location: tuple[Any, ...]) -> Any:
+        node = copies.get(location)
+        if node is None:
+            parent = writable(location[:-1])
+            node = parent[location[-1]] = _shallow_copy(parent[location[-1]])
+            copies[location] = node
+        return node
+
+    for path in paths:
+        for location, _ in compile_path(path).locate(root):
+            if location:
+                writable(location[:-1])[location[-1]] = MASK
+    return root
+
+
+def _shallow_copy(node: Any) -> Any:
+    return dict(node) if isinstance(node, dict) else list(node)
+
+
+def format_location(location: Sequence[Any]) -> str:
+    parts = []
+    for key in location:
+        if isinstance(key, int):
+            parts.append(f"[{key}]")
+        elif _NAME.match(key) and "." not in key:
+            parts.append(f".{key}" if parts else key)
+        else:
+            parts.append(f"[{json.dumps(key)}]")
+    return "".join(parts) or "$"
+
+
+def diff_trees(
+    expected: Any,
+    actual: Any,
+    expected_tree: HashNode,
+    actual_tree: HashNode,
+    *,
+    limit: int = 50,
+) -> list[str]:
+    """Differences between two JSON values, descending only into subtrees whose digests differ."""
+    differences: list[str] = []
+    stack: list[tuple[tuple[Any, ...], Any, Any, HashNode | None, HashNode | None]] = [
+        ((), expected, actual, expected_tree, actual_tree)
+    ]
+    while stack and len(differences) < limit:
+        location, left, right, left_node, right_node = stack.pop()
+        if left_node is not None and right_node is not None:
+            if left_node.digest == right_node.digest:
+                continue
+        elif _encode(left) == _encode(right):
+            continue
+        where = format_location(location)
+        if isinstance(left, dict) and isinstance(right, dict):
+            for key in sorted(set(left) - set(right), key=str):
+                differences.append(f"{format_location(location + (key,))}: missing (expected {_preview(left[key])})")
+            for key in sorted(set(right) - set(left), key=str):
+                differences.append(f"{format_location(location + (key,))}: unexpected {_preview(right[key])}")
+            keys = sorted(set(left) & set(right), key=str, reverse=True)
+        elif isinstance(left, list) and isinstance(right, list):
+            if len(left) != len(right):
+                differences.append(f"{where}: expected {len(left)} items, got {len(right)}")
+            keys = reversed(range(min(len(left), len(right))))
+        else:
+            differences.append(f"{where}: expected {_preview(left)}, got {_preview(right)}")
+            continue
+        stack.extend(
+            (location + (key,), left[key], right[key], left_node.children.get(key), right_node.children.get(key))
+            for key in keys
+        )
+    return differences[:limit]
+
+
+def _preview(value: Any) -> str:
+    text = json.dumps(value, ensure_ascii=False, default=str)
+    return text if len(text) <= 120 else f"{text[:117]}..."
+
+
+@dataclass(slots=True)
+class _Stored:
+    mtime_ns: int
+    size: int
+    root: str
+    volatile: tuple[str, ...]
+    body: Any = None
+    tree: HashNode | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class SnapshotResult:
+    name: str
+    path: Path
+    status: str  # "matched" | "created" | "updated" | "mismatch"
+    differences: tuple[str, ...] = ()
+
+    @property
+    def ok(self) -> bool:
+        return self.status != "mismatch"
+
+
+class SnapshotStore:
+    """On-disk response snapshots compared by root digest, diffed by Merkle tree.
+
+    A snapshot file holds a one-line header (format, root digest, volatile paths) followed by
+    the normalized body. Matching hashes the masked response once and reads only the header
+    (cached per file mtime/size). Only when the digests differ are the stored body parsed and
+    both Merkle trees built; the diff then descends only into subtrees whose hashes differ.
+    Recorded volatile paths stay masked until an update rewrites the header with the configured ones.
+    """
+
+    def __init__(self, directory: Path = DEFAULT_SNAPSHOT_DIR, *, update: bool = False) -> None:
+        self.directory = Path(directory)
+        self.update = update
+        self._lock = threading.Lock()
+        self._cache: dict[Path, _Stored] = {}
+
+    def path_for(self, name: str) -> Path:
+        if not _NAME.match(name) or name.startswith("."):
+            raise ValueError(f"Invalid snapshot name '{name}' (use letters, digits, '.', '_' and '-')")
+        return self.directory / f"{name}{SUFFIX}"
+
+    def check(self, name: str, body: Any, volatile_paths: Iterable[str] = ()) -> SnapshotResult:
+        path = self.path_for(name)
+        stored = self._read_header(path)
+        configured = sorted(set(volatile_paths))
+        if stored is None or self.update:
+            # recording writes exactly the configured paths, so dropping one from the config unmasks it
+            masked = mask_volatile(body, configured)
+            root = content_digest(masked)
+            if stored is not None and stored.root == root and list(stored.volatile) == configured:
+                return SnapshotResult(name, path, "matched")
+            self._write(path, root, configured, masked)
+            status = "created" if stored is None else "updated"
+            logger.info("Snapshot %s %s (%s)", name, status, path)
+            return SnapshotResult(name, path, status)
+        # paths recorded with the snapshot keep applying, so narrowing the config cannot unmask them
+        volatile = sorted(set(configured) | set(stored.volatile))
+        masked = mask_volatile(body, volatile)
+        root = content_digest(masked)
+        if set(volatile) == set(stored.volatile):
+            if stored.root == root:
+                return SnapshotResult(name, path, "matched")
+            self._load_body(path, stored)
+            expected, expected_tree = stored.body, stored.tree
+        else:
+            # newly configured paths were not masked when the snapshot was recorded: mask both sides alike
+            self._load_body(path, stored)
+            expected = mask_volatile(stored.body, volatile)
+            if content_digest(expected) == root:
+                return SnapshotResult(name, path, "matched")
+            expected_tree = hash_tree(expected)
+        differences = diff_trees(expected, masked, expected_tree, hash_tree(masked))
+        return SnapshotResult(name, path, "mismatch", tuple(differences))
+
+    def _read_header(self, path: Path) -> _Stored | None:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        cached = self._cache.get(path)
+        if cached is not None and (cached.mtime_ns, cached.size) == (stat.st_mtime_ns, stat.st_size):
+            return cached
+        with path.open("r", encoding="utf-8") as fh:
+            header = json.loads(fh.readline())
+        if header.get("format") != _FORMAT:
+            raise ValueError(f"Unsupported snapshot format in {path}: {header.get('format')!r}")
+        stored = _Stored(stat.st_mtime_ns, stat.st_size, header["root"], tuple(header.get("volatile") or ()))
+        with self._lock:
+            self._cache[path] = stored
+        return stored
+
+    @staticmethod
+    def _load_body(path: Path, stored: _Stored) -> None:
+        if stored.tree is not None:
+            return
+        with path.open("r", encoding="utf-8") as fh:
+            fh.readline()
+            stored.body = json.loads(fh.read())
+        stored.tree = hash_tree(stored.body)
+
+    def _write(self, path: Path, root: str, volatile: list[str], body: Any) -> None:
+        header = json.dumps({"format": _FORMAT, "root": root, "volatile": volatile}, separators=(",", ":"))
+        content = header + "\n" + json.dumps(body, ensure_ascii=False, indent=2, sort_keys=True) + "\n"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # write-then-rename so parallel workers never read a half-written snapshot
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".snapshot-", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(content)
+        os.replace(tmp_name, path)
+        with self._lock:
+            self._cache.pop(path, None)
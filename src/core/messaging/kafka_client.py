@@ -4,11 +4,14 @@ import json
 import logging
 import time
 import uuid
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Any, Callable, Iterable, Mapping
 
 
 logger = logging.getLogger(__name__)
+_CORRELATION_INDEX_LIMIT = 10_000
+_BACKENDS = ("confluent", "memory")
 
 
 class KafkaClientError(RuntimeError):
@@ -24,6 +27,15 @@ class KafkaMessage:
     timestamp_ms: int | None
 
 
+@dataclass(slots=True)
+class KafkaExpectation:
+    name: str
+    topic: str
+    predicate: Callable[[KafkaMessage], bool] | None = None
+    after: tuple[str, ...] = ()
+    forbidden: bool = False
+
+
 class KafkaClient:
     def __init__(
         self,
@@ -32,21 +44,37 @@ class KafkaClient:
         scenario_id: str | None = None,
         group_prefix: str = "e2e",
         security_config: Mapping[str, Any] | None = None,
+        correlation_header: str | None = None,
+        backend: str = "confluent",
+        memory_partitions: int = 1,
+        segment_path: str | None = None,
     ) -> None:
         if not bootstrap_servers:
             raise ValueError("bootstrap_servers is required")
+        if backend not in _BACKENDS:
+            raise ValueError(f"Unsupported Kafka backend '{backend}', must be one of {_BACKENDS}")
         self._bootstrap_servers = bootstrap_servers
+        self._backend = backend
+        self._memory_partitions = memory_partitions
+        self._segment_path = segment_path
         self._scenario_id = scenario_id or str(uuid.uuid4())
         self._group_id = f"{group_prefix}-{self._scenario_id}"
         self._security_config = dict(security_config or {})
+        self._correlation_header = correlation_header
+        self._correlation_index: OrderedDict[str, list[KafkaMessage]] = OrderedDict()
 
         self._producer = None
         self._consumer = None
+        self._topic_partition_cls: Any = None
+        self._subscription: tuple[str, ...] = ()
         self._init_backend()
 
     def _init_backend(self) -> None:
+        if self._backend == "memory":
+            self._init_memory_backend()
+            return
         try:
-            from confluent_kafka import Consumer, Producer
+            from confluent_kafka import Consumer, Producer, TopicPartition
 
             producer_config = {"bootstrap.servers": self._bootstrap_servers}
             producer_config.update(self._security_config)
@@ -59,10 +87,27 @@ class KafkaClient:
             consumer_config.update(self._security_config)
             self._producer = Producer(producer_config)
             self._consumer = Consumer(consumer_config)
+            self._topic_partition_cls = TopicPartition
             return
         except Exception as exc:  # noqa: BLE001
             raise KafkaClientError("confluent-kafka is required for KafkaClient") from exc
 
+    def _init_memory_backend(self) -> None:
+        from .memory_broker import MemoryBroker, TopicPartition
+
+        broker = MemoryBroker.get(
+            self._bootstrap_servers,
+            num_partitions=self._memory_partitions,
+            segment_path=self._segment_path,
+        )
+        self._producer = broker.producer()
+        self._consumer = broker.consumer(self._group_id)
+        self._topic_partition_cls = TopicPartition
+
+    @property
+    def correlation_header(self) -> str | None:
+        return self._correlation_header
+
     def close(self) -> None:
         if self._producer:
             self._producer.flush(10)
@@ -106,8 +151,18 @@ class KafkaClient:
             raise KafkaClientError(f"Kafka produce failed: {errors[0]}")
 
     def subscribe(self, topics: Iterable[str]) -> None:
+        """Subscribe to ``topics``; a no-op when already subscribed to exactly these topics.
+
+        Repeated ``wait`` calls on the same topic therefore do not trigger a rebalance. With the
+        confluent backend the group join only happens on the next poll, so subscribing does not
+        by itself position the consumer before traffic that is triggered afterwards.
+        """
         assert self._consumer is not None
-        self._consumer.subscribe(list(topics))
+        topic_list = tuple(topics)
+        if topic_list == self._subscription:
+            return
+        self._consumer.subscribe(list(topic_list))
+        self._subscription = topic_list
 
     def consume(self, timeout: float = 1.0) -> KafkaMessage | None:
         assert self._consumer is not None
@@ -116,13 +171,7 @@ class KafkaClient:
             return None
         if msg.error():
             raise KafkaClientError(f"Kafka consume error: {msg.error()}")
-        return KafkaMessage(
-            topic=msg.topic(),
-            key=msg.key(),
-            value=msg.value(),
-            headers=dict(msg.headers() or {}),
-            timestamp_ms=msg.timestamp()[1] if msg.timestamp() else None,
-        )
+        return self._to_message(msg)
 
     def wait(
         self,
@@ -147,14 +196,70 @@ class KafkaClient:
                 raise KafkaClientError(f"Predicate failed: {exc}") from exc
         raise KafkaClientError(f"Timeout waiting for message on {topic} after {timeout}s")
 
-    def get_end_offset(self, topic: str, partition: int = 0, timeout: float = 5.0) -> int:
+    def wait_all(
+        self,
+        expectations: Iterable[KafkaExpectation],
+        timeout: float = 10.0,
+        *,
+        poll_interval: float = 0.5,
+    ) -> dict[str, KafkaMessage]:
+        """Wait for several expected events in one consumption pass.
+
+        Every message is offered to each expectation on its topic. A message matching a
+        forbidden expectation, or a required one whose ``after`` dependencies have not
+        matched yet, fails immediately. Returns the first match per required expectation.
+        """
+        expected = list(expectations)
+        names = [exp.name for exp in expected]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate expectation names: {duplicates}")
+        required = {exp.name for exp in expected if not exp.forbidden}
+        for exp in expected:
+            unknown = [dep for dep in exp.after if dep not in required]
+            if unknown:
+                raise ValueError(f"Expectation '{exp.name}' depends on unknown expectations {unknown}")
+        if not required:
+            raise ValueError("wait_all requires at least one non-forbidden expectation")
+
+        # forbidden expectations are checked first so a message can never satisfy both
+        ordered = [exp for exp in expected if exp.forbidden] + [exp for exp in expected if not exp.forbidden]
+        self.subscribe(dict.fromkeys(exp.topic for exp in expected))
+        matched: dict[str, KafkaMessage] = {}
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            msg = self.consume(timeout=poll_interval)
+            if msg is None:
+                continue
+            for exp in ordered:
+                if exp.topic != msg.topic or exp.name in matched:
+                    continue
+                if not self._matches(exp.predicate, msg):
+                    continue
+                if exp.forbidden:
+                    raise KafkaClientError(f"Forbidden event '{exp.name}' received on {msg.topic}")
+                pending = [dep for dep in exp.after if dep not in matched]
+                if pending:
+                    raise KafkaClientError(f"Event '{exp.name}' arrived before {pending} on {msg.topic}")
+                matched[exp.name] = msg
+                break
+            if required.issubset(matched):
+                return matched
+        missing = sorted(required.difference(matched))
+        raise KafkaClientError(f"Timeout waiting for events {missing} after {timeout}s")
+
+    @staticmethod
+    def _matches(predicate: Callable[[KafkaMessage], bool] | None, msg: KafkaMessage) -> bool:
+        if predicate is None:
+            return True
         try:
-            from confluent_kafka import TopicPartition
+            return bool(predicate(msg))
         except Exception as exc:  # noqa: BLE001
-            raise KafkaClientError("confluent-kafka is required for KafkaClient") from exc
+            raise KafkaClientError(f"Predicate failed: {exc}") from exc
 
+    def get_end_offset(self, topic: str, partition: int = 0, timeout: float = 5.0) -> int:
         assert self._consumer is not None
-        tp = TopicPartition(topic, partition)
+        tp = self._topic_partition_cls(topic, partition)
         _, high = self._consumer.get_watermark_offsets(tp, timeout=timeout)
         return int(high)
 
@@ -168,14 +273,10 @@ class KafkaClient:
         timeout: float = 5.0,
         poll_interval: float = 0.5,
     ) -> list[KafkaMessage]:
-        try:
-            from confluent_kafka import TopicPartition
-        except Exception as exc:  # noqa: BLE001
-            raise KafkaClientError("confluent-kafka is required for KafkaClient") from exc
-
         assert self._consumer is not None
-        tp = TopicPartition(topic, partition, offset)
+        tp = self._topic_partition_cls(topic, partition, offset)
         self._consumer.assign([tp])
+        self._subscription = ()
 
         messages: list[KafkaMessage] = []
         deadline = time.time() + timeout
@@ -185,17 +286,73 @@ class KafkaClient:
                 continue
             if msg.error():
                 raise KafkaClientError(f"Kafka consume error: {msg.error()}")
-            messages.append(
-                KafkaMessage(
-                    topic=msg.topic(),
-                    key=msg.key(),
-                    value=msg.value(),
-                    headers=dict(msg.headers() or {}),
-                    timestamp_ms=msg.timestamp()[1] if msg.timestamp() else None,
-                )
-            )
+            messages.append(self._to_message(msg))
         return messages
 
+    def find_by_correlation(self, correlation_id: str, topic: str | None = None) -> list[KafkaMessage]:
+        """Return already consumed messages stamped with ``correlation_id``."""
+        messages = self._correlation_index.get(correlation_id, [])
+        return [msg for msg in messages if topic is None or msg.topic == topic]
+
+    def wait_for_correlation(
+        self,
+        topic: str,
+        correlation_id: str,
+        predicate: Callable[[KafkaMessage], bool] | None = None,
+        *,
+        timeout: float = 10.0,
+        poll_interval: float = 0.5,
+    ) -> KafkaMessage:
+        """Wait for the event caused by the request stamped with ``correlation_id``.
+
+        Messages are matched by header lookup in the correlation index, so unrelated traffic on
+        the topic never needs to be decoded; ``predicate`` only runs on correlated messages.
+        """
+        if not self._correlation_header:
+            raise KafkaClientError("wait_for_correlation requires KafkaClient(correlation_header=...)")
+        for msg in self.find_by_correlation(correlation_id, topic):
+            if self._matches(predicate, msg):
+                return msg
+        self.subscribe([topic])
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            msg = self.consume(timeout=poll_interval)
+            if msg is None or msg.topic != topic:
+                continue
+            if self._correlation_id_of(msg) == correlation_id and self._matches(predicate, msg):
+                return msg
+        raise KafkaClientError(
+            f"Timeout waiting for message with correlation id {correlation_id} on {topic} after {timeout}s"
+        )
+
+    def _to_message(self, msg: Any) -> KafkaMessage:
+        message = KafkaMessage(
+            topic=msg.topic(),
+            key=msg.key(),
+            value=msg.value(),
+            headers=dict(msg.headers() or {}),
+            timestamp_ms=msg.timestamp()[1] if msg.timestamp() else None,
+        )
+        self._index_correlation(message)
+        return message
+
+    def _index_correlation(self, message: KafkaMessage) -> None:
+        correlation_id = self._correlation_id_of(message)
+        if correlation_id is None:
+            return
+        self._correlation_index.setdefault(correlation_id, []).append(message)
+        self._correlation_index.move_to_end(correlation_id)
+        while len(self._correlation_index) > _CORRELATION_INDEX_LIMIT:
+            self._correlation_index.popitem(last=False)
+
+    def _correlation_id_of(self, message: KafkaMessage) -> str | None:
+        if not self._correlation_header or not message.headers:
+            return None
+        raw = message.headers.get(self._correlation_header)
+        if raw is None:
+            return None
+        return raw.decode("utf-8", errors="replace") if isinstance(raw, bytes) else str(raw)
+
     @staticmethod
     def _encode_value(value: Any) -> bytes | None:
         if value is None:
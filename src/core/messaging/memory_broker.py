@@ -0,0 +1,342 @@
+from __future__ import annotations
+
+import base64
+import json
+import logging
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_CREATE_TIME = 1
+
+
+class TopicPartition:
+    """Mirror of ``confluent_kafka.TopicPartition`` for the in-memory backend."""
+
+    __slots__ = ("topic", "partition", "offset")
+
+    def __init__(self, topic: str, partition: int = 0, offset: int = 0) -> None:
+        self.topic = topic
+        self.partition = partition
+        self.offset = offset
+
+
+class MemoryRecord:
+    """Stored record exposing the accessor surface of ``confluent_kafka.Message``."""
+
+    __slots__ = ("_topic", "_partition", "_offset", "_key", "_value", "_headers", "_timestamp_ms")
+
+    def __init__(
+        self,
+        topic: str,
+        partition: int,
+        offset: int,
+        key: bytes | None,
+        value: bytes | None,
+        headers: list[tuple[str, bytes]] | None,
+        timestamp_ms: int,
+    ) -> None:
+        self._topic = topic
+        self._partition = partition
+        self._offset = offset
+        self._key = key
+        self._value = value
+        self._headers = headers
+        self._timestamp_ms = timestamp_ms
+
+    def topic(self) -> str:
+        return self._topic
+
+    def partition(self) -> int:
+        return self._partition
+
+    def offset(self) -> int:
+        return self._offset
+
+    def key(self) -> bytes | None:
+        return self._key
+
+    def value(self) -> bytes | None:
+        return self._value
+
+    def headers(self) -> list[tuple[str, bytes]] | None:
+        return self._headers
+
+    def timestamp(self) -> tuple[int, int]:
+        return TIMESTAMP_CREATE_TIME, self._timestamp_ms
+
+    def error(self) -> None:
+        return None
+
+
+class MemoryBroker:
+    """Process-local, partitioned and offset-accurate topic log.
+
+    Brokers are shared per name so every ``KafkaClient`` pointing at the same
+    ``bootstrap_servers`` value sees the same topics. When ``segment_path`` is set,
+    records are appended to a JSON-lines segment file and replayed on startup.
+    """
+
+    _instances: dict[str, "MemoryBroker"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, name: str, *, num_partitions: int = 1, segment_path: str | Path | None = None) -> None:
+        if num_partitions < 1:
+            raise ValueError("num_partitions must be >= 1")
+        self.name = name
+        self._num_partitions = num_partitions
+        self._logs: dict[str, list[list[MemoryRecord]]] = {}
+        self._round_robin: dict[str, int] = {}
+        self._cond = threading.Condition(threading.RLock())
+        self._segment_path = Path(segment_path) if segment_path else None
+        if self._segment_path is not None:
+            self._replay_segment()
+
+    @classmethod
+    def get(
+        cls,
+        name: str,
+        *,
+        num_partitions: int = 1,
+        segment_path: str | Path | None = None,
+    ) -> "MemoryBroker":
+        with cls._instances_lock:
+            broker = cls._instances.get(name)
+            if broker is None:
+                broker = cls(name, num_partitions=num_partitions, segment_path=segment_path)
+                cls._instances[name] = broker
+            return broker
+
+    @classmethod
+    def reset(cls, name: str | None = None) -> None:
+        with cls._instances_lock:
+            if name is None:
+                cls._instances.clear()
+            else:
+                cls._instances.pop(name, None)
+
+    # ---------- log ----------
+    def append(
+        self,
+        topic: str,
+        value: bytes | None,
+        *,
+        key: bytes | None = None,
+        headers: list[tuple[str, bytes]] | None = None,
+        partition: int | None = None,
+        timestamp_ms: int | None = None,
+    ) -> MemoryRecord:
+        with self._cond:
+            partitions = self._partitions(topic)
+            if partition is None:
+                partition = self._choose_partition(topic, key, len(partitions))
+            if not 0 <= partition < len(partitions):
+                raise ValueError(f"Unknown partition {partition} for topic {topic}")
+            log = partitions[partition]
+            record = MemoryRecord(
+                topic=topic,
+                partition=partition,
+                offset=len(log),
+                key=key,
+                value=value,
+                headers=list(headers) if headers else None,
+                timestamp_ms=timestamp_ms if timestamp_ms is not None else int(time.time() * 1000),
+            )
+            log.append(record)
+            if self._segment_path is not None:
+                self._write_segment(record)
+            self._cond.notify_all()
+            return record
+
+    def read(self, topic: str, partition: int, offset: int) -> MemoryRecord | None:
+        with self._cond:
+            log = self._partitions(topic)[partition]
+            return log[offset] if 0 <= offset < len(log) else None
+
+    def watermarks(self, topic: str, partition: int = 0) -> tuple[int, int]:
+        with self._cond:
+            return 0, len(self._partitions(topic)[partition])
+
+    def partition_count(self, topic: str) -> int:
+        with self._cond:
+            return len(self._partitions(topic))
+
+    def wait_for_append(self, predicate: Callable[[], bool], timeout: float) -> bool:
+        with self._cond:
+            return self._cond.wait_for(predicate, timeout=max(timeout, 0.0))
+
+    def producer(self) -> "MemoryProducer":
+        return MemoryProducer(self)
+
+    def consumer(self, group_id: str) -> "MemoryConsumer":
+        return MemoryConsumer(self, group_id)
+
+    def _partitions(self, topic: str) -> list[list[MemoryRecord]]:
+        partitions = self._logs.get(topic)
+        if partitions is None:
+            partitions = [[] for _ in range(self._num_partitions)]
+            self._logs[topic] = partitions
+        return partitions
+
+    def _choose_partition(self, topic: str, key: bytes | None, count: int) -> int:
+        if key is not None:
+            return zlib.crc32(key) % count
+        current = self._round_robin.get(topic, 0)
+        self._round_robin[topic] = current + 1
+        return current % count
+
+    # ---------- segment file ----------
+    def _write_segment(self, record: MemoryRecord) -> None:
+        assert self._segment_path is not None
+        entry = {
+            "topic": record.topic(),
+            "partition": record.partition(),
+            "offset": record.offset(),
+            "timestamp_ms": record.timestamp()[1],
+            "key": _b64(record.key()),
+            "value": _b64(record.value()),
+            "headers": [[k, _b64(v)] for k, v in record.headers() or []],
+        }
+        with self._segment_path.open("a", encoding="utf-8") as fh:
+            fh.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def _replay_segment(self) -> None:
+        assert self._segment_path is not None
+        if not self._segment_path.exists():
+            self._segment_path.parent.mkdir(parents=True, exist_ok=True)
+            return
+        with self._segment_path.open("r", encoding="utf-8") as fh:
+            for line_no, line in enumerate(fh, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("Skipping corrupt segment line %s in %s", line_no, self._segment_path)
+                    continue
+                partitions = self._partitions(entry["topic"])
+                partition = int(entry["partition"])
+                while partition >= len(partitions):
+                    partitions.append([])
+                log = partitions[partition]
+                log.append(
+                    MemoryRecord(
+                        topic=entry["topic"],
+                        partition=partition,
+                        offset=len(log),
+                        key=_unb64(entry.get("key")),
+                        value=_unb64(entry.get("value")),
+                        headers=[(k, _unb64(v) or b"") for k, v in entry.get("headers") or []] or None,
+                        timestamp_ms=int(entry["timestamp_ms"]),
+                    )
+                )
+
+
+class MemoryProducer:
+    """Producer shim matching the subset of ``confluent_kafka.Producer`` used by ``KafkaClient``."""
+
+    def __init__(self, broker: MemoryBroker) -> None:
+        self._broker = broker
+
+    def produce(
+        self,
+        topic: str,
+        value: bytes | None = None,
+        key: bytes | None = None,
+        headers: list[tuple[str, bytes]] | None = None,
+        callback: Callable[[Any, Any], None] | None = None,
+        partition: int | None = None,
+    ) -> None:
+        try:
+            record = self._broker.append(topic, value, key=key, headers=headers, partition=partition)
+        except Exception as exc:  # noqa: BLE001
+            if callback is None:
+                raise
+            callback(str(exc), None)
+            return
+        if callback is not None:
+            callback(None, record)
+
+    def flush(self, timeout: float | None = None) -> int:
+        return 0
+
+
+class MemoryConsumer:
+    """Consumer shim matching the subset of ``confluent_kafka.Consumer`` used by ``KafkaClient``.
+
+    Like a fresh consumer group with ``auto.offset.reset=earliest`` and no commits, newly
+    subscribed topics are read from offset 0; positions of topics kept across a
+    re-subscribe are preserved.
+    """
+
+    def __init__(self, broker: MemoryBroker, group_id: str) -> None:
+        self._broker = broker
+        self.group_id = group_id
+        self._topics: list[str] = []
+        self._assigned: dict[tuple[str, int], int] | None = None
+        self._positions: dict[tuple[str, int], int] = {}
+        self._closed = False
+
+    def subscribe(self, topics: Iterable[str]) -> None:
+        topics = list(topics)
+        self._positions = {tp: pos for tp, pos in self._positions.items() if tp[0] in topics}
+        self._topics = topics
+        self._assigned = None
+
+    def assign(self, partitions: Iterable[TopicPartition]) -> None:
+        self._topics = []
+        self._assigned = {(tp.topic, tp.partition): max(tp.offset, 0) for tp in partitions}
+
+    def poll(self, timeout: float | None = None) -> MemoryRecord | None:
+        if self._closed:
+            raise RuntimeError("Consumer closed")
+        deadline = time.time() + (timeout or 0.0)
+        while True:
+            record = self._next_record()
+            if record is not None:
+                return record
+            remaining = deadline - time.time()
+            if remaining <= 0 or not self._broker.wait_for_append(self._has_pending, remaining):
+                return self._next_record()
+
+    def get_watermark_offsets(self, partition: TopicPartition, timeout: float | None = None) -> tuple[int, int]:
+        return self._broker.watermarks(partition.topic, partition.partition)
+
+    def close(self) -> None:
+        self._closed = True
+
+    def _positions_map(self) -> dict[tuple[str, int], int]:
+        if self._assigned is not None:
+            return self._assigned
+        for topic in self._topics:
+            for partition in range(self._broker.partition_count(topic)):
+                self._positions.setdefault((topic, partition), 0)
+        return self._positions
+
+    def _has_pending(self) -> bool:
+        return any(
+            offset < self._broker.watermarks(topic, partition)[1]
+            for (topic, partition), offset in self._positions_map().items()
+        )
+
+    def _next_record(self) -> MemoryRecord | None:
+        positions = self._positions_map()
+        for (topic, partition), offset in positions.items():
+            record = self._broker.read(topic, partition, offset)
+            if record is not None:
+                positions[(topic, partition)] = offset + 1
+                return record
+        return None
+
+
+def _b64(value: bytes | None) -> str | None:
+    return base64.b64encode(value).decode("ascii") if value is not None else None
+
+
+def _unb64(value: str | None) -> bytes | None:
+    return base64.b64decode(value) if value is not None else None
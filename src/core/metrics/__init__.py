@@ -0,0 +1 @@
+"""Metrics infrastructure."""
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, Mapping
+
+
+logger = logging.getLogger(__name__)
+try:
+    import allure
+    from allure_commons.types import AttachmentType
+
+    _ALLURE_AVAILABLE = True
+except Exception:  # noqa: BLE001
+    allure = None
+    AttachmentType = None
+    _ALLURE_AVAILABLE = False
+
+
+# Canonical propagation stages, in causal order. Timestamps are wall-clock seconds so the
+# broker timestamp of an event can be compared with local probes.
+STAGES = ("request_sent", "response_received", "event_broker", "event_consumed", "db_visible")
+END_TO_END = "end_to_end"
+
+
+@dataclass(slots=True)
+class PropagationTrace:
+    name: str
+    stamps: dict[str, float] = field(default_factory=dict)
+
+    def mark(self, stage: str, at: float | None = None) -> float:
+        if stage not in STAGES:
+            raise ValueError(f"Unknown propagation stage '{stage}', must be one of {STAGES}")
+        value = time.time() if at is None else at
+        self.stamps[stage] = value
+        return value
+
+    def hops(self) -> dict[str, float]:
+        """Latency in milliseconds between consecutive recorded stages, plus end-to-end once complete.
+
+        End-to-end needs both the first and the final stage, so a trace abandoned part-way
+        (e.g. the row never became visible) does not report a truncated end-to-end sample.
+        """
+        recorded = [stage for stage in STAGES if stage in self.stamps]
+        result = {
+            f"{start}->{end}": (self.stamps[end] - self.stamps[start]) * 1000.0
+            for start, end in zip(recorded, recorded[1:])
+        }
+        if self.complete:
+            result[END_TO_END] = (self.stamps[STAGES[-1]] - self.stamps[STAGES[0]]) * 1000.0
+        return result
+
+    @property
+    def complete(self) -> bool:
+        return STAGES[0] in self.stamps and STAGES[-1] in self.stamps
+
+
+@dataclass(frozen=True, slots=True)
+class LatencyStats:
+    count: int
+    min_ms: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+    @classmethod
+    def from_samples(cls, samples: Iterable[float]) -> "LatencyStats":
+        ordered = sorted(samples)
+        if not ordered:
+            raise ValueError("LatencyStats requires at least one sample")
+        return cls(
+            count=len(ordered),
+            min_ms=ordered[0],
+            mean_ms=sum(ordered) / len(ordered),
+            p50_ms=percentile(ordered, 50),
+            p95_ms=percentile(ordered, 95),
+            p99_ms=percentile(ordered, 99),
+            max_ms=ordered[-1],
+        )
+
+
+def percentile(ordered: list[float], pct: float) -> float:
+    """Nearest-rank percentile over an already sorted list."""
+    if not ordered:
+        raise ValueError("percentile requires at least one sample")
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class LatencyRecorder:
+    """Run-wide, thread-safe collection of propagation traces."""
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._traces: list[PropagationTrace] = []
+
+    def start(self, name: str) -> PropagationTrace:
+        trace = PropagationTrace(name=name)
+        with self._lock:
+            self._traces.append(trace)
+        return trace
+
+    def traces(self, name: str | None = None) -> list[PropagationTrace]:
+        with self._lock:
+            return [trace for trace in self._traces if name is None or trace.name == name]
+
+    def summary(self, name: str | None = None) -> dict[str, LatencyStats]:
+        samples: dict[str, list[float]] = {}
+        for trace in self.traces(name):
+            for hop, value in trace.hops().items():
+                samples.setdefault(hop, []).append(value)
+        return {hop: LatencyStats.from_samples(values) for hop, values in samples.items()}
+
+    def report(self) -> str:
+        names = sorted({trace.name for trace in self.traces()})
+        lines: list[str] = []
+        for name in names:
+            lines.append(f"Propagation latency [{name}]")
+            lines.extend(_format_stats(self.summary(name)))
+        return "\n".join(lines)
+
+    def publish(self) -> None:
+        """Log the run summary and attach it to the Allure report when available."""
+        if not self.traces():
+            return
+        logger.info("%s", self.report())
+        if _ALLURE_AVAILABLE:
+            payload = {
+                name: {hop: _stats_dict(stats) for hop, stats in self.summary(name).items()}
+                for name in sorted({trace.name for trace in self.traces()})
+            }
+            allure.attach(
+                json.dumps(payload, ensure_ascii=False, indent=2),
+                name="Propagation Latency",
+                attachment_type=AttachmentType.JSON,
+            )
+
+
+def _stats_dict(stats: LatencyStats) -> dict[str, float]:
+    return {slot: getattr(stats, slot) for slot in LatencyStats.__slots__}
+
+
+def _format_stats(summary: Mapping[str, LatencyStats]) -> list[str]:
+    lines = []
+    for hop, stats in summary.items():
+        lines.append(
+            f"  {hop:<40} n={stats.count:<5} min={stats.min_ms:9.1f} mean={stats.mean_ms:9.1f} "
+            f"p50={stats.p50_ms:9.1f} p95={stats.p95_ms:9.1f} p99={stats.p99_ms:9.1f} max={stats.max_ms:9.1f} ms"
+        )
+    return lines
@@ -2,13 +2,20 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Any, Mapping
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Mapping, Sequence
 
 from src.clients.crds.user_client import CrdsUserClient
 from src.core.config.config import Config
 from src.core.db.db_client import DbClient
+from src.core.db.queries import QUERIES, QueryTemplate
+from src.core.db.waits import backoff_delays
 from src.core.http.http_client import HttpClient, HttpResponse
 from src.core.messaging.kafka_client import KafkaClient, KafkaMessage
+from src.core.metrics.latency import LatencyRecorder, PropagationTrace
 from src.payloads.crds.create_user import CreateUserRequest
 
 
@@ -22,6 +29,7 @@ class CRDSUser:
         self._http_client = http_client
         self._kafka_client = self._get_context_value("kafka_client", default=None)
         self._db_client = self._get_context_value("db_client", default=None)
+        self._latency_recorder: LatencyRecorder | None = self._get_context_value("latency_recorder", default=None)
 
         if self._http_client is None:
             raise ValueError("context.http_client is required")
@@ -35,6 +43,7 @@ class CRDSUser:
         timeout: float | None = None,
         schema: Any | None = None,
         validate_schema: bool | None = None,
+        correlation_id: str | None = None,
     ) -> HttpResponse:
         return self._client.create_user(
             payload,
@@ -42,6 +51,7 @@ class CRDSUser:
             timeout=timeout,
             schema=schema,
             validate_schema=validate_schema,
+            correlation_id=correlation_id,
         )
 
     def query_user(
@@ -87,64 +97,146 @@ class CRDSUser:
         db_table: str | None = None,
         db_id_column: str = "id",
         db_email_column: str = "email",
+        db_columns: Sequence[str] | None = None,
+        db_poll_interval: float = 0.2,
     ) -> dict[str, Any]:
+        """Create a user and verify the USER_CREATED event and the DB row.
+
+        The event cannot be missed however long the consumer group takes to join: the client's
+        per-scenario group has no committed offsets and starts from the earliest offset. The DB
+        visibility poll runs concurrently with the Kafka wait. Both share one deadline of ``kafka_timeout`` seconds
+        measured from the request, so verification takes as long as the slowest hop.
+
+        The DB row is fetched with ``db_columns`` (or config ``crds.db.user_columns``), defaulting
+        to the id and email columns only.
+        """
         if self._kafka_client is None:
             raise ValueError("context.kafka_client is required for create_user_and_verify")
         if self._db_client is None:
             raise ValueError("context.db_client is required for create_user_and_verify")
-
-        response = self.create_user(payload)
-        response_json = response.json
-        if not isinstance(response_json, Mapping):
-            raise RuntimeError("Create user response is not JSON object")
-
-        user_id = self._extract_user_id(response_json)
         topic = kafka_topic or self._config_value("crds.kafka.user_topic")
         if not topic:
             raise ValueError("Kafka topic is required via parameter or config crds.kafka.user_topic")
-
-        message = self._kafka_client.wait(
-            topic=topic,
-            predicate=lambda msg: self._match_user_created(msg, user_id, payload.email),
-            timeout=kafka_timeout,
-        )
-
         table = db_table or self._config_value("crds.db.user_table")
         if not table:
             raise ValueError("DB table is required via parameter or config crds.db.user_table")
-        record = self._fetch_user_record(
-            table=table,
-            user_id=user_id,
-            email=payload.email,
-            id_column=db_id_column,
-            email_column=db_email_column,
+        by_id, by_email = self._user_queries(table, db_id_column, db_email_column, db_columns)
+
+        trace = (
+            self._latency_recorder.start("crds_user.create")
+            if self._latency_recorder is not None
+            else PropagationTrace(name="crds_user.create")
         )
+        correlated = bool(getattr(self._kafka_client, "correlation_header", None))
+        deadline = time.time() + kafka_timeout
+        trace.mark("request_sent")
+        response = self.create_user(payload, correlation_id=uuid.uuid4().hex if correlated else None)
+        trace.mark("response_received")
+        response_json = response.json
+        if not isinstance(response_json, Mapping):
+            raise RuntimeError("Create user response is not JSON object")
+        user_id = self._extract_user_id(response_json)
+
+        def predicate(msg: KafkaMessage) -> bool:
+            return self._match_user_created(msg, user_id, payload.email)
+
+        stop = threading.Event()
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="crds-db-poll") as pool:
+            db_future = pool.submit(
+                self._poll_user_record,
+                by_id=by_id,
+                by_email=by_email,
+                user_id=user_id,
+                email=payload.email,
+                deadline=deadline,
+                poll_interval=db_poll_interval,
+                stop=stop,
+                trace=trace,
+            )
+            try:
+                remaining = max(deadline - time.time(), 0.0)
+                if correlated and response.correlation_id:
+                    message = self._kafka_client.wait_for_correlation(
+                        topic=topic,
+                        correlation_id=response.correlation_id,
+                        predicate=predicate,
+                        timeout=remaining,
+                    )
+                else:
+                    message = self._kafka_client.wait(topic=topic, predicate=predicate, timeout=remaining)
+            except BaseException:
+                stop.set()
+                raise
+            trace.mark("event_consumed")
+            if message.timestamp_ms:
+                trace.mark("event_broker", message.timestamp_ms / 1000.0)
+            record = db_future.result()
+
         if record is None:
-            raise RuntimeError(f"User record not found in DB table {table}")
+            raise RuntimeError(f"User record not found in DB table {table} within {kafka_timeout}s")
 
         return {
             "response": response,
             "event": message,
             "db_record": record,
+            "latency": trace,
         }
 
+    def _poll_user_record(
+        self,
+        *,
+        by_id: QueryTemplate,
+        by_email: QueryTemplate,
+        user_id: str | None,
+        email: str,
+        deadline: float,
+        poll_interval: float,
+        stop: threading.Event,
+        trace: PropagationTrace,
+    ) -> dict[str, Any] | None:
+        for delay in backoff_delays(maximum=poll_interval):
+            if stop.is_set():
+                return None
+            record = self._fetch_user_record(by_id=by_id, by_email=by_email, user_id=user_id, email=email)
+            if record is not None:
+                trace.mark("db_visible")
+                return record
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None
+            stop.wait(min(delay, remaining))
+        return None
+
     def _fetch_user_record(
         self,
         *,
-        table: str,
+        by_id: QueryTemplate,
+        by_email: QueryTemplate,
         user_id: str | None,
         email: str,
-        id_column: str,
-        email_column: str,
     ) -> dict[str, Any] | None:
         assert self._db_client is not None
         if user_id:
-            query = f"SELECT * FROM {table} WHERE {id_column} = ?"
-            record = self._db_client.select_one(query, params=[user_id])
+            record = self._db_client.select_one_prepared(by_id, {by_id.params[0]: user_id})
             if record is not None:
                 return record
-        query = f"SELECT * FROM {table} WHERE {email_column} = ?"
-        return self._db_client.select_one(query, params=[email])
+        return self._db_client.select_one_prepared(by_email, {by_email.params[0]: email})
+
+    def _user_queries(
+        self,
+        table: str,
+        id_column: str,
+        email_column: str,
+        columns: Sequence[str] | None,
+    ) -> tuple[QueryTemplate, QueryTemplate]:
+        if columns is None:
+            configured = self._config_value("crds.db.user_columns")
+            if isinstance(configured, str):
+                configured = [col.strip() for col in configured.split(",") if col.strip()]
+            columns = configured or (id_column, email_column)
+        by_id = QUERIES.select("crds_user.by_id", table=table, columns=columns, where=(id_column,))
+        by_email = QUERIES.select("crds_user.by_email", table=table, columns=columns, where=(email_column,))
+        return by_id, by_email
 
     def _match_user_created(
         self,
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import math
+from array import array
+
+import pytest
+
+from src.core.http import array_checks
+
+
+@pytest.fixture(params=["numpy", "fallback"])
+def backend(request, monkeypatch):
+    """Run each check with NumPy (when installed) and with the pure-Python fallback."""
+    if request.param == "numpy":
+        if array_checks.np is None:
+            pytest.skip("NumPy is not installed")
+    else:
+        monkeypatch.setattr(array_checks, "np", None)
+    return request.param
+
+
+def test_outside_compares_numbers_as_floats(backend):
+    assert array_checks.outside([5, 2.0, 7], ["5.0", "2"]) == [(2, 7)]
+
+
+def test_outside_compares_other_values_by_token(backend):
+    values = ["active", "blocked", True, None, 5]
+    assert array_checks.outside(values, ["active", "true", "5"]) == [(1, "blocked"), (3, None)]
+
+
+def test_outside_with_non_numeric_options_falls_back_to_tokens(backend):
+    assert array_checks.outside([1, 2], ["1", "two"]) == [(1, 2)]
+
+
+def test_outside_of_an_empty_array_is_empty(backend):
+    assert array_checks.outside([], ["a"]) == []
+
+
+def test_duplicates_of_numbers(backend):
+    assert sorted(array_checks.duplicates([3, 1, 3, 2, 1, 3])) == [1, 3]
+
+
+def test_duplicates_are_reported_once_in_first_seen_order(backend):
+    assert array_checks.duplicates(["b", "a", "b", {"k": 1}, "a", {"k": 1}, "b"]) == ["b", "a", {"k": 1}]
+
+
+def test_no_duplicates(backend):
+    assert array_checks.duplicates([1, 2, 3]) == []
+    assert array_checks.duplicates([]) == []
+
+
+def test_true_and_one_are_not_duplicates(backend):
+    assert array_checks.duplicates([True, 1]) == []
+
+
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [("count", 4.0), ("sum", 10.0), ("min", 1.0), ("max", 4.0), ("mean", 2.5)],
+)
+def test_aggregate(backend, name, expected):
+    assert array_checks.aggregate([4, 1, 3, 2], name) == expected
+
+
+def test_aggregate_sum_is_exact_without_numpy(monkeypatch):
+    monkeypatch.setattr(array_checks, "np", None)
+    assert array_checks.aggregate([0.1] * 10, "sum") == math.fsum([0.1] * 10)
+
+
+def test_aggregate_rejects_unknown_names_empty_arrays_and_non_numbers(backend):
+    with pytest.raises(ValueError, match="Unknown aggregate"):
+        array_checks.aggregate([1], "median")
+    with pytest.raises(ValueError, match="empty array"):
+        array_checks.aggregate([], "max")
+    assert array_checks.aggregate([], "count") == 0.0
+    with pytest.raises(TypeError, match="element 1 is not a number"):
+        array_checks.aggregate([1, "2"], "sum")
+    with pytest.raises(TypeError, match="element 0 is not a number"):
+        array_checks.aggregate([True], "sum")
+
+
+def test_numeric_column_without_numpy_is_a_float_array(monkeypatch):
+    monkeypatch.setattr(array_checks, "np", None)
+    column = array_checks.numeric_column([1, 2.5])
+    assert isinstance(column, array) and column.typecode == "d"
+    assert list(column) == [1.0, 2.5]
+
+
+@pytest.mark.parametrize(
+    ("values", "descending", "expected"),
+    [
+        ([1, 2, 2, 5], False, None),
+        ([1, 3, 2, 5], False, 2),
+        ([5, 3, 3, 1], True, None),
+        ([5, 3, 4], True, 2),
+        (["a", "b", "a"], False, 2),
+        ([], False, None),
+        ([7], True, None),
+    ],
+)
+def test_first_unsorted(backend, values, descending, expected):
+    assert array_checks.first_unsorted(values, descending=descending) == expected
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import pytest
+
+from src.core.http.json_path import JsonPathError, compile_path, find, resolve, resolve_many
+
+
+DOCUMENT = {
+    "data": {
+        "items": [
+            {"id": 1, "status": "active", "tags": ["a"]},
+            {"id": 2, "status": "blocked", "tags": []},
+            {"id": 3, "status": "active"},
+        ],
+        "odd key": True,
+    },
+    "meta": {"total": 3},
+}
+
+
+@pytest.mark.parametrize(
+    ("expression", "expected"),
+    [
+        ("data.items[0].id", 1),
+        ("$.data.items[-1].id", 3),
+        ("meta.total", 3),
+        ("data['odd key']", True),
+        ('data["odd key"]', True),
+    ],
+)
+def test_definite_paths_resolve_to_the_value(expression, expected):
+    assert resolve(DOCUMENT, expression) == (expected, True)
+    assert compile_path(expression).definite
+
+
+@pytest.mark.parametrize("expression", ["data.missing", "data.items[3].id", "meta.total.value", "data.items.id"])
+def test_definite_paths_report_missing_values(expression):
+    assert resolve(DOCUMENT, expression) == (None, False)
+
+
+def test_null_value_is_found():
+    assert resolve({"value": None}, "value") == (None, True)
+
+
+@pytest.mark.parametrize(
+    ("expression", "expected"),
+    [
+        ("data.items[*].id", [1, 2, 3]),
+        ("data.items[0:2].id", [1, 2]),
+        ("data.items[::-1].id", [3, 2, 1]),
+        ("$..total", [3]),
+        ("data.items[?status == 'active'].id", [1, 3]),
+        ("data.items[?(@.id > 1)].id", [2, 3]),
+        ("data.items[?tags].id", [1, 2]),
+        ("data.items[?tags[0] == 'a'].id", [1]),
+    ],
+)
+def test_non_definite_paths_collect_matches(expression, expected):
+    assert find(DOCUMENT, expression) == expected
+    assert resolve(DOCUMENT, expression) == (expected, True)
+    assert not compile_path(expression).definite
+
+
+def test_non_definite_path_without_matches_is_not_found():
+    assert resolve(DOCUMENT, "data.items[?status == 'deleted'].id") == ([], False)
+    assert resolve(DOCUMENT, "data.missing[*]") == ([], False)
+
+
+def test_locate_returns_locations_from_the_root():
+    assert compile_path("data.items[*].status").locate(DOCUMENT) == [
+        (("data", "items", 0, "status"), "active"),
+        (("data", "items", 1, "status"), "blocked"),
+        (("data", "items", 2, "status"), "active"),
+    ]
+
+
+def test_resolve_many_matches_single_resolves():
+    expressions = ["data.items[0].id", "data.items[1].status", "data.missing", "data.items[*].id", "meta.total"]
+    assert resolve_many(DOCUMENT, expressions) == [resolve(DOCUMENT, expression) for expression in expressions]
+
+
+def test_compile_path_is_cached():
+    assert compile_path("data.items[0].id") is compile_path("data.items[0].id")
+
+
+@pytest.mark.parametrize(
+    ("expression", "message"),
+    [
+        ("", "Empty JSON path"),
+        ("data.items[0", "unclosed '['"),
+        ("data.items[x]", "unsupported selector [x]"),
+        ("data.items[1:2:0]", "unsupported selector"),
+        ("data..", "expected a field name"),
+        ("data.items[?id ~ 1]", "unsupported filter"),
+        ("data.items[?tags[*]]", "filter paths must be plain keys and indexes"),
+    ],
+)
+def test_invalid_paths_raise_json_path_error(expression, message):
+    with pytest.raises(JsonPathError, match=message.replace("[", r"\[").replace("]", r"\]")):
+        compile_path(expression)
+
+
+def test_json_path_error_is_a_value_error():
+    assert issubclass(JsonPathError, ValueError)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.behave.scenario_data import ResponseHistory, ScenarioBase, ScenarioData
+
+
+def test_response_history_keeps_pinned_aliases_and_bounded_history():
+    history = ResponseHistory(2)
+    for number in range(4):
+        history["last"] = number
+    history["created"] = "pinned"
+    assert history["last"] == 3
+    assert history["created"] == "pinned"
+    assert "#1" not in history and "#2" not in history
+    assert (history["#3"], history["#4"]) == (2, 3)
+    assert history.evicted == 2
+
+
+def test_response_history_defaults_to_no_history():
+    data = ScenarioData(None)
+    data.put_response("last", 1, overwrite=True)
+    data.put_response("last", 2, overwrite=True)
+    assert list(data.raw["api"]["responses"]) == ["last"]
+
+
+def test_history_aliases_are_reserved():
+    with pytest.raises(ValueError, match="reserved"):
+        ResponseHistory(1)["#1"] = "x"
+
+
+def test_scenario_writes_do_not_leak_into_the_base():
+    base = ScenarioBase.from_data({"api": {"entities": {"user": {"id": 1}}, "vars": {"token": "t"}}})
+    first, second = ScenarioData(None, base=base), ScenarioData(None, base=base)
+    first.put_var("token", "changed")
+    first.put_entity("other", 2)
+    assert first.get_var("token") == "changed"
+    assert second.get_var("token") == "t"
+    with pytest.raises(KeyError, match="other"):
+        second.get_entity("other")
+
+
+def test_freeze_carries_pinned_responses_and_state_to_later_scenarios():
+    data = ScenarioData(None)
+    data.put_response("created", "response")
+    data.put_var("id", 7)
+    later = ScenarioData(None, base=data.freeze())
+    assert later.get_response("created") == "response"
+    assert later.get_var("id") == "7"
+
+
+def test_fan_out_merges_overlays_in_item_order():
+    data = ScenarioData(None)
+    release = threading.Event()
+
+    def task(overlay, item):
+        if item == 0:
+            release.wait(1)  # finish last, still merged first
+        else:
+            release.set()
+        overlay.put_var("winner", item)
+        overlay.put_response(f"r{item}", item)
+        return item * 10
+
+    assert data.fan_out([0, 1, 2], task) == [0, 10, 20]
+    assert data.get_var("winner") == "2"
+    assert [data.get_response(f"r{item}") for item in range(3)] == [0, 1, 2]
+
+
+def test_fan_out_conflicting_creates_merge_nothing():
+    data = ScenarioData(None)
+
+    def task(overlay, item):
+        overlay.put_var(f"v{item}", item)
+        overlay.put_response("same", item)
+
+    with pytest.raises(ValueError, match="cannot create responses alias 'same'"):
+        data.fan_out([0, 1], task)
+    with pytest.raises(KeyError):
+        data.get_var("v0")
+
+
+def test_parsed_body_is_cached_per_stored_response():
+    data = ScenarioData(None)
+    parsed = []
+
+    def parse(response):
+        parsed.append(response)
+        return {"text": response.text}
+
+    first = SimpleNamespace(text="1")
+    data.put_response("last", first, overwrite=True)
+    assert data.parsed_body("last", first, parse) == {"text": "1"}
+    assert data.parsed_body("last", first, parse) == {"text": "1"}
+    second = SimpleNamespace(text="2")
+    data.put_response("last", second, overwrite=True)
+    assert data.parsed_body("last", second, parse) == {"text": "2"}
+    assert parsed == [first, second]
+    assert list(data._parsed_bodies.values()) == [(second, {"text": "2"})]
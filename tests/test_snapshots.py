@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from src.core.http.json_path import JsonPathError
+from src.core.http.snapshots import MASK, SnapshotStore, diff_trees, hash_tree, mask_volatile
+
+
+BODY = {
+    "items": [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}],
+    "meta": {"generated_at": "2026-01-01T00:00:00Z", "request_id": "r-1", "total": 2},
+}
+
+
+def _changed(**meta):
+    return {**BODY, "meta": {**BODY["meta"], **meta}}
+
+
+def _header(store, name):
+    with store.path_for(name).open(encoding="utf-8") as fh:
+        return json.loads(fh.readline())
+
+
+def test_first_check_creates_the_snapshot_then_matches(tmp_path):
+    store = SnapshotStore(tmp_path)
+    created = store.check("items", BODY)
+    assert (created.status, created.ok) == ("created", True)
+    assert created.path == tmp_path / "items.snapshot"
+    assert store.check("items", json.loads(json.dumps(BODY))).status == "matched"
+
+
+def test_key_order_does_not_matter(tmp_path):
+    store = SnapshotStore(tmp_path)
+    store.check("items", BODY)
+    reordered = {"meta": dict(reversed(list(BODY["meta"].items()))), "items": BODY["items"]}
+    assert store.check("items", reordered).status == "matched"
+
+
+def test_mismatch_lists_the_changed_leaves(tmp_path):
+    store = SnapshotStore(tmp_path)
+    store.check("items", BODY)
+    changed = {**_changed(total=3), "items": [{"id": 1, "name": "z"}, {"id": 2}], "extra": True}
+    result = store.check("items", changed)
+    assert (result.status, result.ok) == ("mismatch", False)
+    assert set(result.differences) == {
+        'items[0].name: expected "a", got "z"',
+        'items[1].name: missing (expected "b")',
+        "meta.total: expected 2, got 3",
+        "extra: unexpected true",
+    }
+
+
+def test_mismatch_does_not_rewrite_the_snapshot(tmp_path):
+    store = SnapshotStore(tmp_path)
+    store.check("items", BODY)
+    before = store.path_for("items").read_text(encoding="utf-8")
+    store.check("items", _changed(total=3))
+    assert store.path_for("items").read_text(encoding="utf-8") == before
+
+
+def test_volatile_paths_are_masked(tmp_path):
+    store = SnapshotStore(tmp_path)
+    store.check("items", BODY, ["meta.generated_at"])
+    assert store.check("items", _changed(generated_at="later"), ["meta.generated_at"]).status == "matched"
+    assert "meta.total" in store.check("items", _changed(total=9), ["meta.generated_at"]).differences[0]
+
+
+def test_narrowing_the_configured_volatile_paths_keeps_recorded_ones_masked(tmp_path):
+    store = SnapshotStore(tmp_path)
+    store.check("items", BODY, ["meta.generated_at", "meta.request_id"])
+    result = store.check("items", _changed(generated_at="later", request_id="r-2"), ["meta.generated_at"])
+    assert result.status == "matched"
+
+
+def test_newly_configured_volatile_paths_mask_both_sides(tmp_path):
+    store = SnapshotStore(tmp_path)
+    store.check("items", BODY)
+    assert store.check("items", _changed(request_id="r-2"), ["meta.request_id"]).status == "matched"
+    assert store.check("items", _changed(request_id="r-2")).status == "mismatch"
+
+
+def test_update_records_exactly_the_configured_volatile_paths(tmp_path):
+    SnapshotStore(tmp_path).check("items", BODY, ["meta.generated_at", "meta.request_id"])
+    updater = SnapshotStore(tmp_path, update=True)
+    assert updater.check("items", BODY, ["meta.generated_at"]).status == "updated"
+    assert _header(updater, "items")["volatile"] == ["meta.generated_at"]
+    assert updater.check("items", BODY, ["meta.generated_at"]).status == "matched"
+    assert SnapshotStore(tmp_path).check("items", _changed(request_id="r-2")).status == "mismatch"
+
+
+def test_snapshot_file_holds_the_masked_body(tmp_path):
+    store = SnapshotStore(tmp_path)
+    store.check("items", BODY, ["meta.generated_at"])
+    lines = store.path_for("items").read_text(encoding="utf-8").split("\n", 1)
+    assert json.loads(lines[1])["meta"]["generated_at"] == MASK
+
+
+def test_header_is_reread_after_the_file_changes(tmp_path):
+    first, second = SnapshotStore(tmp_path), SnapshotStore(tmp_path, update=True)
+    first.check("items", BODY)
+    second.check("items", _changed(total=3))
+    assert first.check("items", _changed(total=3)).status == "matched"
+
+
+def test_text_bodies_are_compared_as_strings(tmp_path):
+    store = SnapshotStore(tmp_path)
+    store.check("plain", "hello")
+    assert store.check("plain", "hello").status == "matched"
+    assert store.check("plain", "bye").differences == ('$: expected "hello", got "bye"',)
+
+
+@pytest.mark.parametrize("name", ["", "../escape", ".hidden", "a/b", "sp ace"])
+def test_invalid_names_are_rejected(tmp_path, name):
+    with pytest.raises(ValueError, match="Invalid snapshot name"):
+        SnapshotStore(tmp_path).path_for(name)
+
+
+def test_unsupported_format_is_rejected(tmp_path):
+    (tmp_path / "old.snapshot").write_text('{"format": 99, "root": "x"}\n{}\n', encoding="utf-8")
+    with pytest.raises(ValueError, match="Unsupported snapshot format"):
+        SnapshotStore(tmp_path).check("old", BODY)
+
+
+def test_invalid_volatile_path_raises(tmp_path):
+    with pytest.raises(JsonPathError):
+        SnapshotStore(tmp_path).check("items", BODY, ["meta["])
+
+
+def test_mask_volatile_copies_only_the_touched_containers():
+    masked = mask_volatile(BODY, ["items[*].id"])
+    assert [item["id"] for item in masked["items"]] == [MASK, MASK]
+    assert [item["id"] for item in BODY["items"]] == [1, 2]
+    assert masked["meta"] is BODY["meta"]
+
+
+def test_hash_tree_ignores_key_order_and_diff_skips_equal_subtrees():
+    left = {"a": {"x": 1, "y": [1, 2]}, "b": 1}
+    right = {"b": 1, "a": {"y": [1, 2], "x": 1}}
+    assert hash_tree(left).digest == hash_tree(right).digest
+    changed = {"a": {"x": 1, "y": [1, 3]}, "b": 1}
+    assert diff_trees(left, changed, hash_tree(left), hash_tree(changed)) == ["a.y[1]: expected 2, got 3"]
+
+
+def test_diff_is_limited():
+    left, right = list(range(100)), [value + 1 for value in range(100)]
+    assert len(diff_trees(left, right, hash_tree(left), hash_tree(right), limit=5)) == 5